@@ -0,0 +1,37 @@
+"""Add pre-rendered content_html to posts
+
+Revision ID: a2d9f6c3e8b4
+Revises: f1c8e4a7b2d6
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a2d9f6c3e8b4"
+down_revision: Union[str, Sequence[str], None] = "f1c8e4a7b2d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing rows are rendered by `python -m app.commands.rerender_posts`;
+    until then format=html renders them on read.
+    """
+    op.add_column("posts", sa.Column("content_html", sa.Text(), nullable=True))
+    op.add_column(
+        "posts", sa.Column("content_html_version", sa.Integer(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("posts", "content_html_version")
+    op.drop_column("posts", "content_html")
@@ -0,0 +1,70 @@
+"""Add reply threads (materialized path) to comments
+
+Revision ID: b5e1d7a3c9f4
+Revises: a2d9f6c3e8b4
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e1d7a3c9f4"
+down_revision: Union[str, Sequence[str], None] = "a2d9f6c3e8b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing comments become thread roots without replies.
+    """
+    op.add_column("comments", sa.Column("parent_id", sa.Integer(), nullable=True))
+    op.add_column("comments", sa.Column("thread_id", sa.Integer(), nullable=True))
+    op.add_column("comments", sa.Column("path", sa.Text(collation="C"), nullable=True))
+    op.add_column(
+        "comments",
+        sa.Column("depth", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+    op.add_column(
+        "comments",
+        sa.Column(
+            "reply_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.create_foreign_key(
+        "comments_parent_id_fkey", "comments", "comments", ["parent_id"], ["id"]
+    )
+    op.execute("UPDATE comments SET thread_id = id, path = lpad(id::text, 10, '0')")
+    op.alter_column("comments", "thread_id", nullable=False)
+    op.alter_column("comments", "path", nullable=False)
+    op.create_index(
+        "ix_comments_post_id_roots",
+        "comments",
+        ["post_id", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("parent_id IS NULL"),
+    )
+    op.create_index(
+        "ix_comments_thread_id_path",
+        "comments",
+        ["thread_id", "path"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_comments_thread_id_path", table_name="comments")
+    op.drop_index("ix_comments_post_id_roots", table_name="comments")
+    op.drop_constraint("comments_parent_id_fkey", "comments", type_="foreignkey")
+    op.drop_column("comments", "reply_count")
+    op.drop_column("comments", "depth")
+    op.drop_column("comments", "path")
+    op.drop_column("comments", "thread_id")
+    op.drop_column("comments", "parent_id")
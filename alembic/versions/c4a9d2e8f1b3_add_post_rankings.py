@@ -0,0 +1,59 @@
+"""Add post_rankings table for the trending feed
+
+Revision ID: c4a9d2e8f1b3
+Revises: b7e3c1f0a2d4
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9d2e8f1b3"
+down_revision: Union[str, Sequence[str], None] = "b7e3c1f0a2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "post_rankings",
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("likes", sa.Integer(), nullable=False),
+        sa.Column("comments", sa.Integer(), nullable=False),
+        sa.Column("views", sa.Integer(), nullable=False),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column(
+            "refreshed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("post_id"),
+    )
+    op.create_index(
+        "ix_post_rankings_score_post_id",
+        "post_rankings",
+        ["score", "post_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_post_rankings_published_at",
+        "post_rankings",
+        ["published_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_post_rankings_published_at", table_name="post_rankings")
+    op.drop_index("ix_post_rankings_score_post_id", table_name="post_rankings")
+    op.drop_table("post_rankings")
@@ -0,0 +1,84 @@
+"""Add follows, feed_entries and users.follower_count for the home feed
+
+Revision ID: d8f2a6b4c9e1
+Revises: c4a9d2e8f1b3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8f2a6b4c9e1"
+down_revision: Union[str, Sequence[str], None] = "c4a9d2e8f1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+followtarget_enum = sa.Enum("TAG", "CATEGORY", "AUTHOR", name="followtarget")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "follower_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.create_index(
+        "ix_posts_author_id_created_at",
+        "posts",
+        ["author_id", "created_at"],
+        unique=False,
+    )
+    op.create_table(
+        "follows",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("target_type", followtarget_enum, nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "target_type", "target_id"),
+    )
+    op.create_index(
+        "ix_follows_target",
+        "follows",
+        ["target_type", "target_id", "user_id"],
+        unique=False,
+    )
+    op.create_table(
+        "feed_entries",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "post_id"),
+    )
+    op.create_index(
+        "ix_feed_entries_user_published",
+        "feed_entries",
+        ["user_id", "published_at", "post_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_feed_entries_user_published", table_name="feed_entries")
+    op.drop_table("feed_entries")
+    op.drop_index("ix_follows_target", table_name="follows")
+    op.drop_table("follows")
+    followtarget_enum.drop(op.get_bind(), checkfirst=True)
+    op.drop_index("ix_posts_author_id_created_at", table_name="posts")
+    op.drop_column("users", "follower_count")
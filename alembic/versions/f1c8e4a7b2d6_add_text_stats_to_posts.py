@@ -0,0 +1,52 @@
+"""Add word_count, excerpt and content_hash to posts
+
+Revision ID: f1c8e4a7b2d6
+Revises: e3b7c5a1d9f2
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c8e4a7b2d6"
+down_revision: Union[str, Sequence[str], None] = "e3b7c5a1d9f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing rows keep content_hash NULL; fill them with
+    `python -m app.commands.backfill_text_stats`.
+    """
+    op.add_column(
+        "posts",
+        sa.Column(
+            "word_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.add_column(
+        "posts",
+        sa.Column(
+            "excerpt",
+            sa.String(length=300),
+            server_default=sa.text("''"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "posts", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("posts", "content_hash")
+    op.drop_column("posts", "excerpt")
+    op.drop_column("posts", "word_count")
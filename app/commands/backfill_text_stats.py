@@ -0,0 +1,107 @@
+"""Compute reading_time, word_count and excerpt for existing posts.
+
+Walks posts in id order, one batch per transaction, and only touches rows
+whose content changed since their stats were computed (or that never had
+any). Safe to interrupt and rerun.
+
+    uv run python -m app.commands.backfill_text_stats [--batch-size 500] [--force]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import Integer, String, column, or_, select, update, values
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.post import Post
+from app.services.text_stats import analyze, content_hash, content_hash_sql
+
+
+def _stale_condition():
+    current = content_hash_sql(Post.content)
+    return or_(Post.content_hash.is_(None), Post.content_hash != current)
+
+
+def backfill(batch_size: int, force: bool = False) -> tuple[int, int]:
+    """Returns (posts scanned, posts updated)."""
+    table = Post.__table__
+    scanned = updated = 0
+    last_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            query = (
+                select(Post.id, Post.content)
+                .where(Post.id > last_id)
+                .order_by(Post.id)
+                .limit(batch_size)
+            )
+            if not force:
+                query = query.where(_stale_condition())
+            rows = db.execute(query).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            scanned += len(rows)
+
+            data = []
+            for row in rows:
+                stats = analyze(row.content)
+                data.append(
+                    (
+                        row.id,
+                        stats.word_count,
+                        stats.reading_time,
+                        stats.excerpt,
+                        content_hash(row.content),
+                    )
+                )
+            stats_values = values(
+                column("id", Integer),
+                column("word_count", Integer),
+                column("reading_time", Integer),
+                column("excerpt", String),
+                column("content_hash", String),
+                name="text_stats",
+            ).data(data)
+            updated += db.execute(
+                update(table)
+                .where(table.c.id == stats_values.c.id)
+                # Derived columns: not an edit of the post
+                .values(
+                    word_count=stats_values.c.word_count,
+                    reading_time=stats_values.c.reading_time,
+                    excerpt=stats_values.c.excerpt,
+                    content_hash=stats_values.c.content_hash,
+                    updated_at=table.c.updated_at,
+                )
+            ).rowcount
+            db.commit()
+    finally:
+        db.close()
+    return scanned, updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.TEXT_STATS_BACKFILL_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="recompute every post (e.g. after changing READING_WORDS_PER_MINUTE)",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scanned, updated = backfill(args.batch_size, args.force)
+    print(
+        f"{updated} of {scanned} scanned posts updated "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Render the stored HTML of posts rendered by an older renderer (or never).
+
+Run after bumping RENDERER_VERSION in app/services/markdown.py. Walks posts
+in id order, one batch per transaction; rendering can be spread over
+several processes. Safe to interrupt and rerun.
+
+    uv run python -m app.commands.rerender_posts [--batch-size 200] [--processes 4] [--force]
+"""
+
+import argparse
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+from sqlalchemy import Integer, Text, column, select, update, values
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.post import Post
+from app.services.markdown import RENDERER_VERSION, render_markdown
+
+
+def rerender(
+    batch_size: int, force: bool = False, executor: Optional[Executor] = None
+) -> tuple[int, float]:
+    """Returns (posts rendered, seconds spent rendering)."""
+    table = Post.__table__
+    rendered = 0
+    render_seconds = 0.0
+    last_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            query = (
+                select(Post.id, Post.content)
+                .where(Post.id > last_id)
+                .order_by(Post.id)
+                .limit(batch_size)
+            )
+            if not force:
+                query = query.where(
+                    Post.content_html_version.is_distinct_from(RENDERER_VERSION)
+                )
+            rows = db.execute(query).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            start = time.perf_counter()
+            contents = [row.content for row in rows]
+            if executor is not None:
+                html = list(executor.map(render_markdown, contents, chunksize=8))
+            else:
+                html = [render_markdown(content) for content in contents]
+            render_seconds += time.perf_counter() - start
+
+            rendered_values = values(
+                column("id", Integer),
+                column("html", Text),
+                name="rendered",
+            ).data([(row.id, body) for row, body in zip(rows, html)])
+            db.execute(
+                update(table)
+                .where(table.c.id == rendered_values.c.id)
+                # Derived column: not an edit of the post
+                .values(
+                    content_html=rendered_values.c.html,
+                    content_html_version=RENDERER_VERSION,
+                    updated_at=table.c.updated_at,
+                )
+            )
+            db.commit()
+            rendered += len(rows)
+    finally:
+        db.close()
+    return rendered, render_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.POST_RENDER_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--processes", type=int, default=1, help="render in N worker processes"
+    )
+    parser.add_argument("--force", action="store_true", help="re-render every post")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.processes > 1:
+        with ProcessPoolExecutor(args.processes) as executor:
+            rendered, render_seconds = rerender(args.batch_size, args.force, executor)
+    else:
+        rendered, render_seconds = rerender(args.batch_size, args.force)
+    print(
+        f"{rendered} posts rendered with renderer v{RENDERER_VERSION} "
+        f"in {time.perf_counter() - start:.2f}s ({render_seconds:.2f}s rendering)"
+    )
+
+
+if __name__ == "__main__":
+    main()
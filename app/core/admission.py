@@ -0,0 +1,236 @@
+import asyncio
+import re
+import time
+from collections import Counter, deque
+from typing import Any, Optional
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+# Never queued nor turned away: operators need metrics most during an
+# overload, and live streams have their own connection limit
+_EXEMPT_PATH_PREFIXES = (
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/api/metrics",
+    "/api/live",
+)
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# GETs answered from a per-process cache or by primary key: they get slots of
+# their own so they keep working while listings and searches queue up
+_CHEAP_READS = re.compile(
+    r"/api/("
+    r"posts/trending"
+    r"|posts/\d+"
+    r"|(users|tags|categories|comments)/\d+"
+    r"|likes/(check/\d+|post/\d+/stats)"
+    r")/?"
+)
+
+
+class RouteClass:
+    """Admission for one class of routes: at most `limit` requests in flight
+    per worker, the rest wait for a slot in a FIFO queue.
+
+    Overload is told apart from a burst the way CoDel does it: a burst
+    drains, so some request gets in without waiting; when even the shortest
+    wait of an ADMISSION_INTERVAL_MS was over ADMISSION_TARGET_WAIT_MS the
+    queue is standing and the class is overloaded. Until an interval says
+    otherwise, requests only wait up to the target instead of
+    ADMISSION_QUEUE_TIMEOUT_MS, so the ones that are served are still fresh
+    and the rest are turned away early.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._interval_start = time.monotonic()
+        self._min_wait: Optional[float] = None
+        self.overloaded = False
+        self.admitted = 0
+        self.rejected: Counter[str] = Counter()
+        self.max_wait = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _observe(self, wait: float) -> None:
+        now = time.monotonic()
+        interval = settings.ADMISSION_INTERVAL_MS / 1000
+        if now - self._interval_start >= interval:
+            target = settings.ADMISSION_TARGET_WAIT_MS / 1000
+            # After an idle stretch the last interval says nothing about now
+            self.overloaded = (
+                self._min_wait is not None
+                and self._min_wait > target
+                and now - self._interval_start < 2 * interval
+            )
+            self._interval_start = now
+            self._min_wait = None
+        if self._min_wait is None or wait < self._min_wait:
+            self._min_wait = wait
+        self.max_wait = max(self.max_wait, wait)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting for one if need be; False when turned away."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            self._observe(0.0)
+            return True
+        if len(self._waiters) >= settings.ADMISSION_QUEUE_SIZE:
+            self.rejected["queue_full"] += 1
+            return False
+
+        timeout = (
+            settings.ADMISSION_TARGET_WAIT_MS
+            if self.overloaded
+            else settings.ADMISSION_QUEUE_TIMEOUT_MS
+        )
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.monotonic()
+        try:
+            # Shielded: the waiter must outlive the timeout to tell a slot
+            # handed over at the last moment from a timed out wait
+            await asyncio.wait_for(asyncio.shield(waiter), timeout / 1000)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # The client went away while waiting
+            if waiter.done():
+                self.release()
+            else:
+                self._drop(waiter)
+            raise
+        if not waiter.done():
+            self._drop(waiter)
+        self._observe(time.monotonic() - start)
+        if waiter.cancelled():
+            self.rejected["overloaded" if self.overloaded else "timeout"] += 1
+            return False
+        # release() handed its slot over: in_flight is already counted
+        self.admitted += 1
+        return True
+
+    def _drop(self, waiter: asyncio.Future[None]) -> None:
+        waiter.cancel()
+        self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        # Hand the slot to the oldest waiter rather than freeing it, so a
+        # newcomer cannot jump the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "overloaded": self.overloaded,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+class AdmissionController:
+    """Route classes by name: auth (bcrypt and Discord), write, read (listings,
+    feeds, searches), export and cached (cheap reads, see _CHEAP_READS)."""
+
+    def __init__(self):
+        self.classes = {
+            "auth": RouteClass("auth", settings.ADMISSION_AUTH_CONCURRENCY),
+            "write": RouteClass("write", settings.ADMISSION_WRITE_CONCURRENCY),
+            "read": RouteClass("read", settings.ADMISSION_READ_CONCURRENCY),
+            "export": RouteClass("export", settings.ADMISSION_EXPORT_CONCURRENCY),
+            "cached": RouteClass("cached", settings.ADMISSION_CACHED_CONCURRENCY),
+        }
+
+    def classify(self, method: str, path: str) -> Optional[RouteClass]:
+        """The class a request counts against; None for exempt requests."""
+        if not path.startswith("/api/") or path.startswith(_EXEMPT_PATH_PREFIXES):
+            return None
+        if path.startswith("/api/auth/"):
+            return self.classes["auth"]
+        if method not in _SAFE_METHODS:
+            return self.classes["write"]
+        if path.startswith("/api/export/"):
+            return self.classes["export"]
+        if _CHEAP_READS.fullmatch(path):
+            return self.classes["cached"]
+        return self.classes["read"]
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": settings.ADMISSION_ENABLED,
+            "classes": {name: rc.status() for name, rc in self.classes.items()},
+        }
+
+
+admission_controller = AdmissionController()
+
+
+class _ReleaseWhenSent:
+    """A streamed response that gives its slot back once the whole body was
+    sent or the client went away, not when its headers were."""
+
+    def __init__(self, response: Response, route_class: RouteClass):
+        self.response = response
+        self.route_class = route_class
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            self.route_class.release()
+
+
+class AdmissionMiddleware(BaseHTTPMiddleware):
+    """Holds a slot of the request's route class while the route runs and
+    answers 503 with Retry-After when none comes up in time.
+
+    Requests wait here, on the event loop, instead of piling up in the
+    threadpool and the connection pool where nothing can turn them away.
+    A response with a Content-Length is complete when it starts, so its
+    slot is given back then; a streamed one (exports) keeps reading the
+    database until its last chunk and holds the slot until it is sent.
+    """
+
+    async def dispatch(
+        self, request: Request, call_next
+    ) -> Response | _ReleaseWhenSent:
+        route_class = admission_controller.classify(request.method, request.url.path)
+        if route_class is None:
+            return await call_next(request)
+        if not await route_class.acquire():
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "ok": False,
+                    "msg": "Servidor saturado, inténtalo más tarde",
+                },
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+        try:
+            response = await call_next(request)
+        except BaseException:
+            route_class.release()
+            raise
+        if "content-length" in response.headers:
+            route_class.release()
+            return response
+        return _ReleaseWhenSent(response, route_class)
@@ -0,0 +1,42 @@
+import threading
+from typing import Callable, Optional
+
+
+class PeriodicTask:
+    """Calls `fn` every `interval` seconds on a daemon thread until stopped."""
+
+    def __init__(self, name: str, fn: Callable[[], object]):
+        self.name = name
+        self._fn = fn
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def _run(self, interval: float, immediate: bool) -> None:
+        if immediate:
+            self._fn()
+        while not self._stop.wait(interval):
+            self._fn()
+
+    def start(self, interval: float, immediate: bool = False) -> None:
+        """Start the thread; with `immediate` the first call does not wait."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval, immediate),
+            name=self.name,
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,160 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+
+import brotli
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from app.core.config import settings
+
+
+_COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse `Accept-Encoding` into {coding: q}: 'gzip;q=0.5, br' -> {'gzip': 0.5, 'br': 1.0}."""
+    accepted: dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def _choose_encoding(header: str) -> str | None:
+    """Pick the best supported encoding the client accepts (br preferred over gzip)."""
+    if not header:
+        return None
+    accepted = _parse_accept_encoding(header)
+    candidates = ("br", "gzip")
+
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps the output deterministic for identical bodies
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _is_compressible_type(content_type: str) -> bool:
+    return content_type.startswith(_COMPRESSIBLE_CONTENT_TYPES)
+
+
+def _append_vary(response: Response) -> None:
+    vary = response.headers.get("vary")
+    if not vary:
+        response.headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        response.headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressedVariantCache:
+    """Bounded LRU of compressed bodies keyed by the digest of the raw body.
+
+    Each entry keeps every encoding produced for that body side by side, so a
+    hot payload (same post page served again and again) is compressed once per
+    encoding instead of on every hit.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, dict[str, bytes]] = OrderedDict()
+
+    def get(self, digest: bytes, encoding: str) -> bytes | None:
+        variants = self._entries.get(digest)
+        if variants is None:
+            return None
+        self._entries.move_to_end(digest)
+        return variants.get(encoding)
+
+    def put(self, digest: bytes, encoding: str, body: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        variants = self._entries.setdefault(digest, {})
+        variants[encoding] = body
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Negotiate gzip/brotli via `Accept-Encoding` for fully buffered responses.
+
+    Streaming responses (no Content-Length) and bodies under
+    COMPRESSION_MINIMUM_SIZE are passed through untouched.
+    """
+
+    def __init__(self, app, cache: CompressedVariantCache | None = None):
+        super().__init__(app)
+        self.cache = cache or CompressedVariantCache(
+            settings.COMPRESSION_CACHE_MAX_ENTRIES
+        )
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        response = await call_next(request)
+
+        content_type = response.headers.get("content-type", "")
+        if not _is_compressible_type(content_type):
+            return response
+        _append_vary(response)
+
+        encoding = _choose_encoding(request.headers.get("accept-encoding", ""))
+        content_length = response.headers.get("content-length")
+        if (
+            encoding is None
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "content-encoding" in response.headers
+            or content_length is None
+            or int(content_length) < settings.COMPRESSION_MINIMUM_SIZE
+        ):
+            return response
+
+        body = b""
+        async for chunk in response.body_iterator:  # type: ignore[attr-defined]
+            body += chunk
+
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        compressed = self.cache.get(digest, encoding)
+        if compressed is None:
+            compressed = _compress(body, encoding)
+            self.cache.put(digest, encoding, compressed)
+
+        headers = {
+            k: v for k, v in response.headers.items() if k.lower() != "content-length"
+        }
+        if len(compressed) >= len(body):
+            return Response(
+                content=body, status_code=response.status_code, headers=headers
+            )
+
+        headers["Content-Encoding"] = encoding
+        return Response(
+            content=compressed, status_code=response.status_code, headers=headers
+        )
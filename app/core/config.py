@@ -1,17 +1,78 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+CountStrategyName = Literal["exact", "cached", "estimated", "none"]
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     DATABASE_URL: str
 
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 300
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the timeout
+    # Transaction pooling behind PgBouncer: no app-side pool, no prepared
+    # statements, statement timeout applied per transaction
+    DB_PGBOUNCER_MODE: bool = False
+
+    # Read replicas for GET routes (empty: everything goes to DATABASE_URL)
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_HEALTH_CHECK_INTERVAL: int = 10
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_CONNECT_TIMEOUT_SECONDS: int = 3  # 0 leaves libpq's default
+    # After a write, the same client reads from the primary for this long
+    REPLICA_READ_YOUR_WRITES_SECONDS: int = 5
+
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
     DEBUG: bool = False
+    # Log the stack of anything blocking the event loop longer than the
+    # threshold (app.core.loop_monitor); always on with DEBUG
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_THRESHOLD_MS: int = 100
+    # Startup warmup (app.core.warmup): open pool connections, compile the hot
+    # queries and load the bcrypt backend before serving the first request
+    WARMUP_ENABLED: bool = True
+    WARMUP_POOL_CONNECTIONS: int = 5
+    # Rate limiting (app.core.rate_limit): a token bucket per client and
+    # policy, keyed by user id (JWT sub) or IP. Rates read "<requests>/<period>",
+    # e.g. "10/minute" or "5/30s"; an empty rate turns that policy off.
+    # "memory" counts per worker; "postgres" shares buckets across workers at
+    # the cost of one query per check
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    RATE_LIMIT_DEFAULT: str = "600/minute"  # every /api route
+    RATE_LIMIT_AUTH: str = "10/minute"  # login, register, Discord (by IP)
+    RATE_LIMIT_LIKES: str = "120/minute"
+    RATE_LIMIT_COMMENTS: str = "20/minute"  # creating and editing comments
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100_000
+    RATE_LIMIT_PRUNE_INTERVAL_SECONDS: int = 60
+    # Admission control (app.core.admission): requests in flight per route
+    # class and worker. Past the limit they wait on the event loop, up to
+    # ADMISSION_QUEUE_SIZE of them for ADMISSION_QUEUE_TIMEOUT_MS, and get a
+    # 503 after that; once waits stay over ADMISSION_TARGET_WAIT_MS for a
+    # whole ADMISSION_INTERVAL_MS they only wait up to the target. Keep the
+    # auth, write, read and export limits near DB_POOL_SIZE + DB_MAX_OVERFLOW
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_AUTH_CONCURRENCY: int = 4  # bcrypt runs in the threadpool
+    ADMISSION_WRITE_CONCURRENCY: int = 6
+    ADMISSION_READ_CONCURRENCY: int = 8  # listings, feeds, searches
+    ADMISSION_EXPORT_CONCURRENCY: int = 2  # each holds a connection while streaming
+    ADMISSION_CACHED_CONCURRENCY: int = 16  # cached and by-id reads
+    ADMISSION_QUEUE_SIZE: int = 50  # per class
+    ADMISSION_QUEUE_TIMEOUT_MS: int = 2000
+    ADMISSION_TARGET_WAIT_MS: int = 100
+    ADMISSION_INTERVAL_MS: int = 500
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
     HOST: str = "0.0.0.0"
     PORT: int = 8000
 
@@ -21,9 +82,115 @@ class Settings(BaseSettings):
     DISCORD_CLIENT_ID: str
     DISCORD_CLIENT_SECRET: str
     DISCORD_REDIRECT_URI: str
+    # Shared HTTP client for Discord (app.services.discord_client), HTTP/2 over
+    # TLS; a plain http:// base URL (a local mock) is spoken to in HTTP/1.1
+    DISCORD_API_BASE_URL: str = "https://discord.com/api"
+    DISCORD_HTTP_TIMEOUT_SECONDS: float = 10.0
+    DISCORD_HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    DISCORD_HTTP_MAX_CONNECTIONS: int = 20
+    DISCORD_HTTP_MAX_RETRIES: int = 2
+    DISCORD_HTTP_RETRY_BACKOFF_SECONDS: float = 0.25
+    # A 429 asking to wait longer than this fails the login instead
+    DISCORD_HTTP_MAX_RETRY_AFTER_SECONDS: float = 5.0
 
     # Social auth behavior
     ALLOW_SOCIAL_LINK_BY_EMAIL: bool = False
 
+    # Response compression (brotli, falling back to gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CACHE_MAX_ENTRIES: int = 256
+
+    # Pagination totals per listing: exact | cached | estimated | none
+    POSTS_COUNT_STRATEGY: CountStrategyName = "exact"
+    COMMENTS_COUNT_STRATEGY: CountStrategyName = "exact"
+    TAGS_COUNT_STRATEGY: CountStrategyName = "cached"
+    CATEGORIES_COUNT_STRATEGY: CountStrategyName = "cached"
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    COUNT_CACHE_MAX_ENTRIES: int = 10_000
+    COUNT_ESTIMATE_THRESHOLD: int = 10000
+
+    # Comment threads: replies nest up to this depth (a reply to a comment at
+    # the limit goes next to it instead); thread pages preview this many replies
+    COMMENTS_MAX_DEPTH: int = 8
+    COMMENTS_THREAD_REPLIES: int = 3
+
+    # Write-behind likes: toggles are acknowledged from an in-process buffer
+    # and flushed in batches (see app/services/like_buffer.py for guarantees)
+    LIKES_WRITE_BEHIND: bool = False
+    LIKES_FLUSH_INTERVAL_MS: int = 200
+    LIKES_FLUSH_BATCH_SIZE: int = 1000
+
+    # Post views: counted in memory per worker, added to posts.views in bulk
+    VIEWS_ENABLED: bool = True
+    VIEWS_FLUSH_INTERVAL_MS: int = 5000
+    # Same user (or IP when anonymous) counts once per post per window; 0 disables
+    VIEWS_DEDUPE_WINDOW_SECONDS: int = 1800
+    VIEWS_DEDUPE_MAX_ENTRIES: int = 100_000
+
+    # Live updates (GET /api/live/posts, server-sent events): like counts are
+    # published at most once per interval per post. With LIVE_UPDATES_NOTIFY
+    # events fan out to every worker through Postgres LISTEN/NOTIFY, which
+    # needs session pooling (not PgBouncer transaction mode)
+    LIVE_UPDATES_ENABLED: bool = True
+    LIVE_UPDATES_NOTIFY: bool = False
+    LIVE_UPDATES_LIKES_INTERVAL_MS: int = 1000
+    LIVE_UPDATES_MAX_CONNECTIONS: int = 1000  # per worker
+    LIVE_UPDATES_MAX_POSTS: int = 50  # per stream
+    # Undelivered events per stream; a client further behind is disconnected
+    LIVE_UPDATES_QUEUE_SIZE: int = 100
+    LIVE_UPDATES_HEARTBEAT_SECONDS: float = 15.0
+    # Streams are closed after this long and clients reconnect on their own
+    LIVE_UPDATES_STREAM_SECONDS: int = 300
+    LIVE_UPDATES_RETRY_MS: int = 3000
+
+    # Trending feed: post_rankings is refreshed in the background and pages
+    # are cached; score = weighted engagement halved every half-life of age
+    TRENDING_REFRESH_INTERVAL_SECONDS: int = 60
+    TRENDING_HALF_LIFE_HOURS: float = 12.0
+    TRENDING_LIKE_WEIGHT: float = 3.0
+    TRENDING_COMMENT_WEIGHT: float = 5.0
+    TRENDING_VIEW_WEIGHT: float = 0.1
+    TRENDING_CACHE_TTL_SECONDS: int = 30
+    TRENDING_CACHE_MAX_ENTRIES: int = 512
+
+    # Home feed: posts are fanned out to followers' feeds on write, except for
+    # authors with more followers than this, whose posts are merged on read
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10_000
+    # Latest posts copied into the feed when following a new source
+    FEED_BACKFILL_POSTS: int = 50
+
+    # Post text statistics (reading_time, word_count, excerpt)
+    READING_WORDS_PER_MINUTE: int = 200
+    POST_EXCERPT_LENGTH: int = 200  # characters, at most 300 (column size)
+    TEXT_STATS_BACKFILL_BATCH_SIZE: int = 500
+
+    # Pre-rendered post HTML (GET /api/posts/{id}?format=html)
+    POST_HTML_CACHE_MAX_ENTRIES: int = 256
+    POST_RENDER_BATCH_SIZE: int = 200
+
+    # POST /api/posts/bulk: posts inserted and committed per chunk
+    POSTS_IMPORT_CHUNK_SIZE: int = 1000
+
+    # Admin exports (/api/export/*): rows fetched per server-side cursor round trip
+    EXPORT_YIELD_PER: int = 2000
+
+    # Job queue (jobs table, claimed with FOR UPDATE SKIP LOCKED). Workers run
+    # inside the API process unless JOBS_RUN_IN_PROCESS is off, in which case
+    # run `python -m app.jobs.worker` separately
+    JOBS_RUN_IN_PROCESS: bool = True
+    JOBS_CONCURRENCY: int = 2
+    JOBS_POLL_INTERVAL_MS: int = 1000
+    JOBS_MAX_ATTEMPTS: int = 5
+    # Retry n waits BACKOFF * 2^(n-1) seconds, capped at BACKOFF_MAX
+    JOBS_RETRY_BACKOFF_SECONDS: int = 5
+    JOBS_RETRY_BACKOFF_MAX_SECONDS: int = 3600
+    # A running job whose worker has not finished it after this is requeued
+    JOBS_LOCK_TIMEOUT_SECONDS: int = 600
+    JOBS_MAINTENANCE_INTERVAL_SECONDS: int = 60
+    JOBS_RETENTION_HOURS: int = 24
+
 
 settings = Settings()  # pyright: ignore[reportCallIssue]
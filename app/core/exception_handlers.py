@@ -19,6 +19,8 @@ _VALIDATION_CODE_TO_ES: Dict[str, str] = {
     "string_too_long": "La cadena es demasiado larga",
     "value_error.any_str.min_length": "La cadena es demasiado corta",
     "value_error.any_str.max_length": "La cadena es demasiado larga",
+    "too_short": "La lista tiene muy pocos elementos",
+    "too_long": "La lista tiene demasiados elementos",
     "value_error.number.not_gt": "El valor debe ser mayor",
     "value_error.number.not_ge": "El valor debe ser mayor o igual",
     "value_error.number.not_lt": "El valor debe ser menor",
@@ -56,6 +58,19 @@ _HTTP_MSG_EN_TO_ES: Dict[str, str] = {
     "Category not found": "Categoría no encontrada",
     "Like not found": "Like no encontrado",
     "Comment not found": "Comentario no encontrado",
+    "Parent comment not found": "Comentario a responder no encontrado",
+    "Invalid cursor": "Cursor inválido",
+    "Author not found": "Autor no encontrado",
+    "Already following": "Ya lo sigues",
+    "Cannot follow yourself": "No puedes seguirte a ti mismo",
+    "Date filters are not supported for this export": "Esta exportación no admite filtros de fecha",
+    "'since' must be earlier than 'until'": "'since' debe ser anterior a 'until'",
+    "Follow not found": "No lo sigues",
+    "Expected a JSON array or NDJSON": "Se esperaba un array JSON o NDJSON",
+    "Discord is unavailable, try again later": "Discord no está disponible, inténtalo más tarde",
+    "Live updates are disabled": "Las actualizaciones en vivo están desactivadas",
+    "Too many live connections, try again later": "Demasiadas conexiones en vivo, inténtalo más tarde",
+    "Too many requests, try again later": "Demasiadas peticiones, inténtalo más tarde",
 }
 
 
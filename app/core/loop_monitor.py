@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.background import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """Detects callbacks that hold the event loop longer than a threshold.
+
+    A task on the loop stamps a heartbeat several times per threshold. A
+    watchdog thread notices when the stamp goes stale and logs the loop
+    thread's stack at that moment, which points at the blocking call
+    (typically sync DB or file I/O inside an `async def` route or
+    middleware). Each stall is logged once; its length is recorded when the
+    loop comes back.
+    """
+
+    def __init__(self):
+        self._threshold = 0.1
+        self._interval = 0.025
+        self._beat = 0.0
+        self._reported_beat: Optional[float] = None
+        self._loop_thread: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog = PeriodicTask("event-loop-monitor", self._check)
+        self._lock = threading.Lock()
+        self.stalls = 0
+        self.longest_stall_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None
+
+    def start(self, threshold_ms: float) -> None:
+        """Start monitoring the running loop; call from the loop itself."""
+        if self._heartbeat is not None:
+            return
+        self._threshold = threshold_ms / 1000
+        self._interval = self._threshold / 4
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat_forever())
+        self._watchdog.start(self._interval)
+
+    def stop(self) -> None:
+        if self._heartbeat is None:
+            return
+        self._watchdog.stop()
+        self._heartbeat.cancel()
+        self._heartbeat = None
+
+    async def _beat_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            # Time the loop could not run us past the sleep we asked for
+            late = now - self._beat - self._interval
+            if late > self._threshold:
+                with self._lock:
+                    self.stalls += 1
+                    self.longest_stall_ms = max(self.longest_stall_ms, late * 1000)
+                logger.warning("Event loop was blocked for %.0fms", late * 1000)
+            self._beat = now
+
+    def _check(self) -> None:
+        beat = self._beat
+        stale = time.monotonic() - beat
+        if stale < self._threshold + self._interval or beat == self._reported_beat:
+            return
+        self._reported_beat = beat
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame))
+        logger.warning(
+            "Event loop blocked for over %.0fms, loop thread is at:\n%s",
+            stale * 1000,
+            stack,
+        )
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.running,
+                "threshold_ms": self._threshold * 1000,
+                "stalls": self.stalls,
+                "longest_stall_ms": round(self.longest_stall_ms, 1),
+            }
+
+
+# Started by the app lifespan when DEBUG or LOOP_MONITOR_ENABLED is set
+loop_monitor = EventLoopMonitor()
@@ -0,0 +1,113 @@
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import NullPool, QueuePool
+
+
+class PoolMetrics:
+    """Counters for connection checkouts, shared by every worker thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_wait_total = 0.0
+            self.checkout_wait_max = 0.0
+            self.exhausted = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+
+    def record_checkout(self, wait: float, exhausted: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_total += wait
+            self.checkout_wait_max = max(self.checkout_wait_max, wait)
+            if exhausted:
+                self.exhausted += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.exhausted += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            avg = self.checkout_wait_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "checkout_wait_avg_ms": round(avg * 1000, 3),
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+                "exhausted": self.exhausted,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout and counts the ones that found the pool full."""
+
+    def _is_exhausted(self) -> bool:
+        return False
+
+    def _do_get(self):
+        exhausted = self._is_exhausted()
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - start, exhausted)
+        return entry
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    def _is_exhausted(self) -> bool:
+        # No idle connection and no overflow slot left: the caller will wait
+        return (
+            self._pool.qsize() == 0
+            and self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+        )
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool):
+    pass
+
+
+def pool_status(engine) -> dict[str, Any]:
+    """Current pool occupancy plus the accumulated checkout metrics."""
+    pool = engine.pool
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    status.update(pool_metrics.snapshot())
+    return status
+
+
+def install_pool_listeners(engine) -> None:
+    event.listen(engine, "connect", lambda *_: pool_metrics.record_connect())
+    event.listen(engine, "invalidate", lambda *_: pool_metrics.record_invalidation())
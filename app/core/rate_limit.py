@@ -0,0 +1,302 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Literal, Optional, Protocol
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Float, bindparam, delete, func, select
+from sqlalchemy.dialects import postgresql
+
+from app.core.background import PeriodicTask
+from app.core.config import settings
+from app.db import engine
+from app.models.rate_limit import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# Who a policy counts requests of: the user of the bearer token (the client
+# IP when there is none) or always the client IP
+KeyKind = Literal["user", "ip"]
+
+# Float slack when adding up intervals (60 / 7 seven times is not quite 60)
+_SLACK = 1e-6
+
+_RATE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*([a-z]+?)s?\s*$")
+_UNITS = {
+    "s": 1,
+    "sec": 1,
+    "second": 1,
+    "m": 60,
+    "min": 60,
+    "minute": 60,
+    "h": 3600,
+    "hour": 3600,
+    "d": 86400,
+    "day": 86400,
+}
+
+
+@dataclass(frozen=True)
+class Policy:
+    """At most `limit` requests per `period` seconds, all of them at once if
+    the bucket is full; a request's token comes back after `interval`."""
+
+    name: str
+    limit: int
+    period: float
+    key: KeyKind
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.limit
+
+    @property
+    def window(self) -> float:
+        # How far ahead of now a bucket may be pushed
+        return self.period + _SLACK
+
+    @classmethod
+    def parse(cls, name: str, rate: str, key: KeyKind) -> Optional["Policy"]:
+        """Build a policy from '10/minute', '100/hour', '5/30s'... None when
+        `rate` is empty or allows 0 requests, which turns the policy off."""
+        if not rate.strip():
+            return None
+        match = _RATE.match(rate.lower())
+        if match is None or match.group(3) not in _UNITS:
+            raise ValueError(f"Invalid rate limit for {name!r}: {rate!r}")
+        limit = int(match.group(1))
+        if limit == 0:
+            return None
+        period = int(match.group(2) or 1) * _UNITS[match.group(3)]
+        return cls(name=name, limit=limit, period=period, key=key)
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the bucket is full again
+    reset_after: float
+    # Seconds until a rejected request would be let through
+    retry_after: float = 0.0
+
+
+def _decide(policy: Policy, tat: float, now: float, allowed: bool) -> Decision:
+    """Decision for a bucket whose theoretical arrival time is `tat` after
+    the request was counted (allowed) or turned away (not allowed).
+
+    GCRA: the bucket is a single timestamp. Every request pushes it one
+    interval further; a request that would push it more than a period past
+    now is over the limit.
+    """
+    backlog = max(tat - now, 0.0)
+    remaining = int((policy.window - backlog) // policy.interval)
+    retry_after = 0.0
+    if not allowed:
+        retry_after = tat + policy.interval - policy.period - now
+    return Decision(
+        allowed=allowed,
+        limit=policy.limit,
+        remaining=max(remaining, 0),
+        reset_after=backlog,
+        retry_after=max(retry_after, 0.0),
+    )
+
+
+class Backend(Protocol):
+    # Whether hit() does I/O and has to run off the event loop
+    blocking: bool
+
+    def hit(self, policy: Policy, key: str) -> Decision: ...
+
+    def prune(self) -> int: ...
+
+    def size(self) -> Optional[int]: ...
+
+
+class MemoryBackend:
+    """Buckets in this worker's memory: no I/O, but each worker counts on
+    its own, so N workers let through up to N times the limit.
+
+    Buckets are kept least recently used first. Full buckets (timestamp in
+    the past) are the same as no bucket and are dropped from the front as
+    requests come in; past RATE_LIMIT_MEMORY_MAX_KEYS the oldest buckets are
+    dropped even if not full, which forgives those clients.
+    """
+
+    blocking = False
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, policy: Policy, key: str) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            tat = max(self._tats.pop(key, now), now)
+            allowed = tat + policy.interval - now <= policy.window
+            if allowed:
+                tat += policy.interval
+            self._tats[key] = tat
+            self._evict(now)
+        return _decide(policy, tat, now, allowed)
+
+    def _evict(self, now: float) -> None:
+        while self._tats:
+            key, tat = next(iter(self._tats.items()))
+            if tat > now and len(self._tats) <= self.max_keys:
+                return
+            del self._tats[key]
+
+    def prune(self) -> int:
+        # Only the front can be full buckets worth dropping: whatever comes
+        # after it was used more recently
+        with self._lock:
+            before = len(self._tats)
+            self._evict(time.monotonic())
+            return before - len(self._tats)
+
+    def size(self) -> Optional[int]:
+        return len(self._tats)
+
+
+_buckets = RateLimitBucket.__table__
+_NOW = bindparam("now", type_=Float)
+_INTERVAL = bindparam("interval", type_=Float)
+_NEXT_TAT = func.greatest(_buckets.c.tat, _NOW) + _INTERVAL
+# Count the request unless it would push the bucket past the period; no row
+# comes back when it is turned away
+_HIT = (
+    postgresql.insert(_buckets)
+    .values(key=bindparam("key"), tat=_NOW + _INTERVAL)
+    .on_conflict_do_update(
+        index_elements=[_buckets.c.key],
+        set_={"tat": _NEXT_TAT},
+        where=_NEXT_TAT - _NOW <= bindparam("window", type_=Float),
+    )
+    .returning(_buckets.c.tat)
+)
+_TAT = select(_buckets.c.tat).where(_buckets.c.key == bindparam("key"))
+_PRUNE = delete(_buckets).where(_buckets.c.tat <= bindparam("now", type_=Float))
+
+
+class PostgresBackend:
+    """Buckets in the UNLOGGED rate_limit_buckets table, shared by every
+    worker: one upsert in autocommit per check, plus a read of the bucket
+    when the request is turned away. Timestamps are the workers' wall clocks.
+    """
+
+    blocking = True
+
+    def __init__(self):
+        self._engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+    def hit(self, policy: Policy, key: str) -> Decision:
+        now = time.time()
+        params = {
+            "key": key,
+            "now": now,
+            "interval": policy.interval,
+            "window": policy.window,
+        }
+        with self._engine.connect() as conn:
+            tat = conn.execute(_HIT, params).scalar()
+            if tat is not None:
+                return _decide(policy, tat, now, allowed=True)
+            tat = conn.execute(_TAT, {"key": key}).scalar() or now
+        return _decide(policy, tat, now, allowed=False)
+
+    def prune(self) -> int:
+        with self._engine.connect() as conn:
+            return conn.execute(_PRUNE, {"now": time.time()}).rowcount
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class RateLimiter:
+    """Named policies (see `policies()`) over the configured backend.
+
+    A backend that cannot be reached lets requests through: rate limiting
+    is a protection, not something worth failing requests for.
+    """
+
+    def __init__(self):
+        self.policies = policies()
+        self.backend: Backend = (
+            PostgresBackend()
+            if settings.RATE_LIMIT_BACKEND == "postgres"
+            else MemoryBackend(settings.RATE_LIMIT_MEMORY_MAX_KEYS)
+        )
+        self._task = PeriodicTask("rate-limit-pruner", self._prune)
+        self._last_error_log = 0.0
+        self.allowed: Counter[str] = Counter()
+        self.limited: Counter[str] = Counter()
+        self.failures = 0
+
+    async def check(self, policy: Policy, key: str) -> Optional[Decision]:
+        """Count a request of `key` under `policy`; None if the backend failed."""
+        scoped = f"{policy.name}:{key}"
+        try:
+            if self.backend.blocking:
+                decision = await run_in_threadpool(self.backend.hit, policy, scoped)
+            else:
+                decision = self.backend.hit(policy, scoped)
+        except Exception:
+            self.failures += 1
+            # Once a minute at most: a database outage would log every request
+            if time.monotonic() - self._last_error_log > 60:
+                self._last_error_log = time.monotonic()
+                logger.exception("Rate limit backend failed, letting requests in")
+            return None
+        (self.allowed if decision.allowed else self.limited)[policy.name] += 1
+        return decision
+
+    def _prune(self) -> None:
+        try:
+            self.backend.prune()
+        except Exception:
+            logger.exception("Pruning rate limit buckets failed")
+
+    def start(self) -> None:
+        self._task.start(settings.RATE_LIMIT_PRUNE_INTERVAL_SECONDS)
+
+    def stop(self) -> None:
+        self._task.stop()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": settings.RATE_LIMIT_ENABLED,
+            "backend": settings.RATE_LIMIT_BACKEND,
+            "buckets": self.backend.size(),
+            "policies": {
+                name: {
+                    "limit": policy.limit,
+                    "period": policy.period,
+                    "key": policy.key,
+                    "allowed": self.allowed[name],
+                    "limited": self.limited[name],
+                }
+                for name, policy in self.policies.items()
+            },
+            "failures": self.failures,
+        }
+
+
+def policies() -> dict[str, Policy]:
+    """The configured policies by name; turned off ones are left out."""
+    configured = (
+        Policy.parse("default", settings.RATE_LIMIT_DEFAULT, "user"),
+        Policy.parse("auth", settings.RATE_LIMIT_AUTH, "ip"),
+        Policy.parse("likes", settings.RATE_LIMIT_LIKES, "user"),
+        Policy.parse("comments", settings.RATE_LIMIT_COMMENTS, "user"),
+    )
+    return {policy.name: policy for policy in configured if policy is not None}
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,137 @@
+import itertools
+import time
+from typing import Any, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from app.core.background import PeriodicTask
+from app.core.config import settings
+
+
+PRIMARY_COOKIE = "db_primary_until"
+_UNSAFE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# 0 on a primary or a caught-up standby, otherwise seconds since last replay
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class _Replica:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+        self.error: Optional[str] = None
+
+
+class ReplicaSet:
+    """Round-robin over read replicas, skipping unreachable or lagging ones.
+
+    Health is checked off the request path: a background task re-checks
+    every replica each REPLICA_HEALTH_CHECK_INTERVAL and `pick` only reads
+    the last known state, so a replica that stopped answering never holds up
+    a request (connects give up after REPLICA_CONNECT_TIMEOUT_SECONDS).
+    """
+
+    def __init__(self, engines: list[Engine]):
+        self._replicas = [_Replica(engine) for engine in engines]
+        self._cursor = itertools.count()
+        self._checker = PeriodicTask("replica-health-checker", self.check_all)
+
+    def __len__(self) -> int:
+        return len(self._replicas)
+
+    def engines(self) -> list[Engine]:
+        return [replica.engine for replica in self._replicas]
+
+    def _check(self, replica: _Replica) -> None:
+        try:
+            with replica.engine.connect() as conn:
+                lag = float(conn.execute(_LAG_QUERY).scalar() or 0)
+            replica.lag = lag
+            replica.healthy = lag <= settings.REPLICA_MAX_LAG_SECONDS
+            replica.error = None if replica.healthy else "replication lag"
+        except Exception as e:
+            replica.healthy = False
+            replica.error = type(e).__name__
+        replica.checked_at = time.monotonic()
+
+    def check_all(self) -> None:
+        for replica in self._replicas:
+            self._check(replica)
+
+    def start(self) -> None:
+        """Check every replica now, then every REPLICA_HEALTH_CHECK_INTERVAL."""
+        if self._replicas:
+            self._checker.start(settings.REPLICA_HEALTH_CHECK_INTERVAL, immediate=True)
+
+    def stop(self) -> None:
+        self._checker.stop()
+
+    def pick(self) -> Optional[Engine]:
+        """Next healthy replica engine, or None to fall back to the primary."""
+        count = len(self._replicas)
+        if not count:
+            return None
+        start = next(self._cursor)
+        for offset in range(count):
+            replica = self._replicas[(start + offset) % count]
+            if replica.healthy:
+                return replica.engine
+        return None
+
+    def status(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag,
+                "error": replica.error,
+            }
+            for replica in self._replicas
+        ]
+
+
+def prefers_primary(request: Request) -> bool:
+    """Reads that must see this client's own recent writes stay on the primary."""
+    if request.headers.get("x-consistency", "").lower() == "strong":
+        return True
+    until = request.cookies.get(PRIMARY_COOKIE)
+    if not until:
+        return False
+    try:
+        return float(until) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """After a successful write, pin the client's reads to the primary for a while.
+
+    The pin travels in a cookie so it holds across workers without shared state.
+    """
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        response = await call_next(request)
+        if request.method in _UNSAFE_METHODS and response.status_code < 400:
+            window = settings.REPLICA_READ_YOUR_WRITES_SECONDS
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                f"{time.time() + window:.3f}",
+                max_age=window,
+                httponly=True,
+                samesite="lax",
+            )
+        return response
@@ -0,0 +1,112 @@
+import logging
+import time
+from contextlib import ExitStack
+from typing import Callable
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db import SessionLocal, engine, replicas
+from app.models.post import Post
+from app.models.user import User, pwd_context
+from app.schemas.category import CategoryPublic
+from app.schemas.comment import CommentPublic
+from app.schemas.post import PostPublic
+from app.schemas.tag import TagPublic
+from app.services.category import CategoryService
+from app.services.comment import CommentService
+from app.services.feed import FeedService
+from app.services.post import PostService
+from app.services.tag import TagService
+from app.services.trending import TrendingService
+from app.services.user import UserService
+
+logger = logging.getLogger(__name__)
+
+
+def warm_pool(target: Engine, connections: int) -> None:
+    """Open `connections` pooled connections at once and hand them back idle."""
+    with ExitStack() as stack:
+        for _ in range(connections):
+            conn = stack.enter_context(target.connect())
+            conn.execute(text("SELECT 1"))
+
+
+def warm_password_hashing() -> None:
+    # passlib picks the bcrypt backend and self-tests it on first use
+    pwd_context.dummy_verify()
+
+
+def warm_queries() -> None:
+    """Run the hot read paths once, so SQLAlchemy has their statements
+    compiled and cached and every loader option has been set up."""
+    db = SessionLocal()
+    try:
+        # An author, so loading them also runs every relationship loader
+        email = db.execute(
+            select(User.email)
+            .join(Post, Post.author_id == User.id)
+            .where(User.deleted_at.is_(None))
+            .limit(1)
+        ).scalar()
+        if email is not None:
+            UserService(db).get_user_by_email(email)
+
+        posts = PostService(db)
+        for post in posts.get_posts_page(limit=10).items:
+            PostPublic.model_validate(post)
+        post_id = db.execute(
+            select(Post.id).where(Post.deleted_at.is_(None)).limit(1)
+        ).scalar()
+        if post_id is not None:
+            post = posts.get_post_by_id(post_id, with_html=True)
+            if post is not None:
+                PostPublic.model_validate(post)
+            for comment in CommentService(db).get_comments_page(post_id).items:
+                CommentPublic.model_validate(comment)
+
+        for tag in TagService(db).get_tags_page().items:
+            TagPublic.model_validate(tag)
+        for category in CategoryService(db).get_categories_page().items:
+            CategoryPublic.model_validate(category)
+        TrendingService(db).get_trending_page("24h", 20)
+        FeedService(db).get_feed_page(0, 20)
+    finally:
+        db.rollback()
+        db.close()
+
+
+def warm_up() -> None:
+    """Pay the first-request costs of a fresh worker before it takes traffic.
+
+    Each step is best effort: a failure is logged and startup goes on.
+    """
+    connections = 0
+    if not settings.DB_PGBOUNCER_MODE:
+        connections = min(
+            settings.WARMUP_POOL_CONNECTIONS,
+            settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        )
+    steps: list[tuple[str, Callable[[], None]]] = []
+    if connections:
+        steps.append(("pool", lambda: warm_pool(engine, connections)))
+        for index, replica in enumerate(replicas.engines()):
+            steps.append(
+                (f"replica {index}", lambda r=replica: warm_pool(r, connections))
+            )
+    steps += [
+        ("password hashing", warm_password_hashing),
+        ("queries", warm_queries),
+    ]
+
+    timings = []
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warmup step %r failed", name)
+            continue
+        timings.append(f"{name} {(time.perf_counter() - start) * 1000:.0f}ms")
+    logger.info("Warmup done: %s", ", ".join(timings))
@@ -1,6 +1,13 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.core.config import settings
+from app.core.pool import (
+    InstrumentedNullPool,
+    InstrumentedQueuePool,
+    install_pool_listeners,
+)
+from app.core.replicas import ReplicaSet, prefers_primary
 
 DATABASE_URL = settings.DATABASE_URL
 
@@ -9,11 +16,64 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.DEBUG,
+def _connect_args(replica: bool = False) -> dict:
+    args: dict = {}
+    if replica and settings.REPLICA_CONNECT_TIMEOUT_SECONDS:
+        # A replica that went away must fail fast so reads fall back to the
+        # primary instead of waiting out the TCP timeout
+        args["connect_timeout"] = settings.REPLICA_CONNECT_TIMEOUT_SECONDS
+    if settings.DB_PGBOUNCER_MODE:
+        # Transaction pooling hands each transaction a different server
+        # connection, so server-side prepared statements must be disabled
+        driver = make_url(DATABASE_URL).get_driver_name()
+        if driver == "psycopg":
+            args["prepare_threshold"] = None
+        elif driver == "asyncpg":
+            args["statement_cache_size"] = 0
+    elif settings.DB_STATEMENT_TIMEOUT_MS:
+        args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return args
+
+
+def _pool_args() -> dict:
+    if settings.DB_PGBOUNCER_MODE:
+        # PgBouncer already pools server connections; keeping our own pool
+        # on top only pins bouncer slots to idle workers
+        return {"poolclass": InstrumentedNullPool}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def _set_local_statement_timeout(conn):
+    conn.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}"
+    )
+
+
+def _build_engine(url: str, replica: bool = False):
+    new_engine = create_engine(
+        url,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        echo=settings.DEBUG,
+        connect_args=_connect_args(replica),
+        **_pool_args(),
+    )
+    install_pool_listeners(new_engine)
+    if settings.DB_PGBOUNCER_MODE and settings.DB_STATEMENT_TIMEOUT_MS:
+        # Startup options are rejected by PgBouncer, and a session-level SET
+        # would leak to other clients; scope the timeout to each transaction
+        event.listen(new_engine, "begin", _set_local_statement_timeout)
+    return new_engine
+
+
+engine = _build_engine(DATABASE_URL)
+replicas = ReplicaSet(
+    [_build_engine(url, replica=True) for url in settings.DATABASE_REPLICA_URLS]
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -25,3 +85,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request):
+    """Session for read-only routes: a healthy replica when one is configured.
+
+    Falls back to the primary when there are no replicas, none is healthy,
+    or the client has to read its own recent writes.
+    """
+    read_engine = None if prefers_primary(request) else replicas.pick()
+    db = SessionLocal(bind=read_engine or engine)
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -9,6 +11,7 @@ from app.services.user import UserService
 from app.utils.jwt import decode_access_token
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def get_current_user(
@@ -65,3 +68,15 @@ def get_token_data(
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+def get_optional_token_data(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> Optional[TokenData]:
+    """Token data on public routes: None for anonymous callers or bad tokens."""
+    if credentials is None:
+        return None
+    try:
+        return TokenData.model_validate(decode_access_token(credentials.credentials))
+    except Exception:
+        return None
@@ -0,0 +1,60 @@
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.schemas.fieldset import Fieldset
+
+
+def _split(value: Optional[str]) -> Optional[frozenset[str]]:
+    if value is None:
+        return None
+    return frozenset(part.strip() for part in value.split(",") if part.strip())
+
+
+def fieldset_params(
+    allowed_fields: frozenset[str], allowed_includes: frozenset[str]
+) -> Callable[..., Fieldset]:
+    """Build a dependency parsing `fields=` and `include=` for one resource."""
+
+    def get_fieldset(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma separated fields to return: {', '.join(sorted(allowed_fields))}",
+        ),
+        include: Optional[str] = Query(
+            None,
+            description=f"Comma separated relations to embed: {', '.join(sorted(allowed_includes))}",
+        ),
+    ) -> Fieldset:
+        requested_fields = _split(fields)
+        requested_includes = _split(include)
+
+        if fields is None and include is None:
+            return Fieldset(include=allowed_includes)
+
+        unknown = (requested_fields or frozenset()) - allowed_fields
+        unknown |= (requested_includes or frozenset()) - allowed_includes
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+
+        return Fieldset(
+            fields=requested_fields,
+            include=requested_includes or frozenset(),
+            sparse=True,
+        )
+
+    return get_fieldset
+
+
+def sparse_response(content: BaseModel | list[Any]) -> Response:
+    """Serialize a sparse payload keeping only the fields that were set."""
+    if isinstance(content, BaseModel):
+        body = content.model_dump_json(exclude_unset=True)
+    else:
+        body = TypeAdapter(list[Any]).dump_json(content, exclude_unset=True)
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,108 @@
+import math
+from typing import Callable, Coroutine, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.rate_limit import Decision, Policy, rate_limiter
+from app.utils.jwt import decode_access_token
+
+
+def _client_key(policy: Policy, request: Request) -> str:
+    # The header is read directly rather than through HTTPBearer, which would
+    # mark every route as secured in the OpenAPI docs
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if policy.key == "user" and scheme.lower() == "bearer" and token:
+        try:
+            return f"user:{decode_access_token(token)['sub']}"
+        except (ValueError, KeyError):
+            pass
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the client
+    return f"ip:{request.client.host if request.client else ''}"
+
+
+def rate_limit_headers(policy: Policy, decision: Decision) -> dict[str, str]:
+    return {
+        "RateLimit-Limit": str(decision.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(math.ceil(decision.reset_after)),
+        "RateLimit-Policy": f"{policy.limit};w={math.ceil(policy.period)}",
+    }
+
+
+async def _check(policy_name: str, request: Request) -> Optional[tuple[bool, dict]]:
+    """Count the request against a policy: (allowed, headers to send), or None
+    when the policy is off or the backend failed."""
+    policy = rate_limiter.policies.get(policy_name)
+    if not settings.RATE_LIMIT_ENABLED or policy is None:
+        return None
+    decision = await rate_limiter.check(policy, _client_key(policy, request))
+    if decision is None:
+        return None
+    headers = rate_limit_headers(policy, decision)
+    if not decision.allowed:
+        headers["Retry-After"] = str(math.ceil(decision.retry_after))
+    return decision.allowed, headers
+
+
+def rate_limit(policy_name: str) -> Callable[..., Coroutine]:
+    """Dependency counting the request against a policy of app.core.rate_limit.
+
+    Over the limit it answers 429 with Retry-After; otherwise it adds the
+    RateLimit-* headers of the policy to the response. Routes use it for
+    their own policy on top of the default one (see RateLimitMiddleware),
+    whose headers it replaces.
+    """
+
+    async def check_rate_limit(request: Request, response: Response) -> None:
+        checked = await _check(policy_name, request)
+        if checked is None:
+            return
+        allowed, headers = checked
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, try again later",
+                headers=headers,
+            )
+        response.headers.update(headers)
+
+    return check_rate_limit
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Counts every request under `path_prefix` against the default policy.
+
+    A middleware rather than a dependency so it runs before admission
+    control: a client over its limit gets its 429 without taking a place in
+    the admission queues, where a flood would otherwise turn everyone else
+    away with 503s.
+    """
+
+    def __init__(self, app, path_prefix: str):
+        super().__init__(app)
+        self.path_prefix = path_prefix.rstrip("/") + "/"
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if not request.url.path.startswith(self.path_prefix):
+            return await call_next(request)
+        checked = await _check("default", request)
+        if checked is None:
+            return await call_next(request)
+        allowed, headers = checked
+        if not allowed:
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={
+                    "ok": False,
+                    "msg": "Demasiadas peticiones, inténtalo más tarde",
+                },
+                headers=headers,
+            )
+        response = await call_next(request)
+        for name, value in headers.items():
+            # The route's own policy, when it has one, already set them
+            response.headers.setdefault(name, value)
+        return response
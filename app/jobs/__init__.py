@@ -0,0 +1,4 @@
+from .queue import enqueue
+from .registry import task
+
+__all__ = ["enqueue", "task"]
@@ -0,0 +1,185 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.jobs.registry import get_task
+from app.models.job import Job, JobStatus
+
+# Set after a commit that enqueued jobs, so workers in this process do not
+# wait for their next poll
+job_wakeup = threading.Event()
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _wake_local_workers(session: Session) -> None:
+    if session.info.pop("jobs_enqueued", False):
+        job_wakeup.set()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_enqueued(session: Session) -> None:
+    session.info.pop("jobs_enqueued", None)
+
+
+def enqueue(
+    db: Session,
+    name: str,
+    payload: Optional[dict[str, Any]] = None,
+    *,
+    delay_seconds: float = 0,
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """Add a job to the caller's transaction; it becomes visible on commit.
+
+    Enqueueing in the same transaction as the write that caused it means the
+    job exists if and only if the write was committed.
+    """
+    spec = get_task(name)
+    if max_attempts is None:
+        max_attempts = (spec and spec.max_attempts) or settings.JOBS_MAX_ATTEMPTS
+    job = Job(
+        name=name,
+        payload=payload or {},
+        max_attempts=max_attempts,
+        status=JobStatus.QUEUED,
+        attempts=0,
+    )
+    if delay_seconds:
+        job.run_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+    db.add(job)
+    db.info["jobs_enqueued"] = True
+    return job
+
+
+def claim(db: Session, worker_id: str, exclude: Iterable[str] = ()) -> Optional[Job]:
+    """Lock the next due job for `worker_id` and mark it running.
+
+    SKIP LOCKED lets any number of workers poll the same table without
+    blocking on each other's candidate rows.
+    """
+    candidate = (
+        select(Job.id)
+        .where(Job.status == JobStatus.QUEUED, Job.run_at <= func.now())
+        .order_by(Job.run_at, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    exclude = list(exclude)
+    if exclude:
+        candidate = candidate.where(Job.name.not_in(exclude))
+    job = db.execute(
+        update(Job)
+        .where(Job.id == candidate.scalar_subquery())
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=Job.attempts + 1,
+            locked_at=func.now(),
+            locked_by=worker_id,
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if job is not None:
+        # The caller uses the claimed row after this session is gone
+        db.expunge(job)
+    db.commit()
+    return job
+
+
+def complete(db: Session, job_id: int) -> None:
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(
+            status=JobStatus.DONE,
+            finished_at=func.now(),
+            locked_at=None,
+            locked_by=None,
+            last_error=None,
+        )
+    )
+    db.commit()
+
+
+def fail(db: Session, job: Job, error: str) -> None:
+    """Retry with exponential backoff, or give up after max_attempts."""
+    values: dict[str, Any] = {
+        "locked_at": None,
+        "locked_by": None,
+        "last_error": error[:2000],
+    }
+    if job.attempts >= job.max_attempts:
+        values.update(status=JobStatus.FAILED, finished_at=func.now())
+    else:
+        delay = min(
+            settings.JOBS_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1),
+            settings.JOBS_RETRY_BACKOFF_MAX_SECONDS,
+        )
+        values.update(
+            status=JobStatus.QUEUED,
+            run_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+        )
+    db.execute(update(Job).where(Job.id == job.id).values(**values))
+    db.commit()
+
+
+def requeue_stale(db: Session) -> int:
+    """Handle jobs locked by a worker that died: a job that may be what
+    killed it is retried like any failure, with backoff, and given up on
+    after max_attempts instead of taking down workers forever."""
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS
+    )
+    stale = (Job.status == JobStatus.RUNNING, Job.locked_at < cutoff)
+    released = {"locked_at": None, "locked_by": None, "last_error": "lock expired"}
+    failed = db.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.FAILED, finished_at=func.now(), **released)
+    ).rowcount
+    delay = func.least(
+        settings.JOBS_RETRY_BACKOFF_SECONDS * func.power(2, Job.attempts - 1),
+        settings.JOBS_RETRY_BACKOFF_MAX_SECONDS,
+    )
+    requeued = db.execute(
+        update(Job)
+        .where(*stale)
+        .values(
+            status=JobStatus.QUEUED,
+            run_at=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, delay),
+            **released,
+        )
+    ).rowcount
+    db.commit()
+    return failed + requeued
+
+
+def purge_finished(db: Session) -> int:
+    """Delete done jobs older than JOBS_RETENTION_HOURS (failed ones are kept)."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.JOBS_RETENTION_HOURS)
+    count = db.execute(
+        delete(Job).where(Job.status == JobStatus.DONE, Job.finished_at < cutoff)
+    ).rowcount
+    db.commit()
+    return count
+
+
+def queue_stats(db: Session) -> dict[str, Any]:
+    rows = db.execute(
+        select(Job.name, Job.status, func.count()).group_by(Job.name, Job.status)
+    ).all()
+    by_task: dict[str, dict[str, int]] = {}
+    for name, status, count in rows:
+        by_task.setdefault(name, {})[status.value] = count
+    oldest = db.execute(
+        select(func.min(Job.run_at)).where(
+            Job.status == JobStatus.QUEUED, Job.run_at <= func.now()
+        )
+    ).scalar()
+    lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+    return {"tasks": by_task, "oldest_due_seconds": round(max(lag, 0.0), 3)}
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    name: str
+    fn: Callable[..., object]
+    max_attempts: Optional[int] = None  # None: JOBS_MAX_ATTEMPTS
+    concurrency: Optional[int] = None  # per worker process; None: no extra limit
+
+
+_tasks: dict[str, TaskSpec] = {}
+
+
+def task(
+    name: str,
+    *,
+    max_attempts: Optional[int] = None,
+    concurrency: Optional[int] = None,
+):
+    """Register `fn(db, **payload)` as the handler of jobs called `name`.
+
+    Handlers may run more than once for the same job (retries, or a worker
+    that died mid-job), so they must be idempotent.
+    """
+
+    def decorator(fn: Callable[..., object]) -> Callable[..., object]:
+        if name in _tasks:
+            raise ValueError(f"Task {name!r} is already registered")
+        _tasks[name] = TaskSpec(name, fn, max_attempts, concurrency)
+        return fn
+
+    return decorator
+
+
+def get_task(name: str) -> Optional[TaskSpec]:
+    return _tasks.get(name)
+
+
+def registered_tasks() -> dict[str, TaskSpec]:
+    return dict(_tasks)
+
+
+def run_task(spec: TaskSpec, db: Session, payload: dict) -> None:
+    spec.fn(db, **payload)
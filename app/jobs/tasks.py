@@ -0,0 +1,33 @@
+"""Handlers for deferred work. Each receives a session plus the job payload."""
+
+from sqlalchemy.orm import Session
+
+from app.jobs.registry import task
+from app.services.feed import backfill_author, fan_out_post, refan_post
+from app.services.post_render import render_post_html
+from app.services.text_stats import refresh_post_text_stats
+
+
+@task("feed.fan_out_post", concurrency=2)
+def fan_out_post_job(db: Session, post_id: int) -> None:
+    fan_out_post(db, post_id)
+
+
+@task("feed.refan_post", concurrency=2)
+def refan_post_job(db: Session, post_id: int) -> None:
+    refan_post(db, post_id)
+
+
+@task("feed.backfill_author", concurrency=1)
+def backfill_author_job(db: Session, author_id: int) -> None:
+    backfill_author(db, author_id)
+
+
+@task("post.text_stats", concurrency=2)
+def text_stats_job(db: Session, post_id: int) -> None:
+    refresh_post_text_stats(db, post_id)
+
+
+@task("post.render_html", concurrency=2)
+def render_html_job(db: Session, post_id: int) -> None:
+    render_post_html(db, post_id)
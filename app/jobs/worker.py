@@ -0,0 +1,188 @@
+"""Job worker: runs inside the API process (JOBS_RUN_IN_PROCESS) or standalone.
+
+uv run python -m app.jobs.worker --concurrency 4
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import traceback
+from collections import Counter
+from typing import Any, Optional
+
+from app.core.background import PeriodicTask
+from app.core.config import settings
+from app.db import SessionLocal, replicas
+from app.jobs import queue
+from app.jobs.registry import get_task, registered_tasks, run_task
+from app.models.job import Job
+
+import app.jobs.tasks  # noqa: F401  (registers the handlers)
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Pool of threads that claim and run jobs from the `jobs` table.
+
+    `concurrency` caps the jobs this process runs at once; a task registered
+    with its own `concurrency` is additionally capped per process by not
+    claiming it while that many are running. Claims are made one thread at a
+    time, so two threads cannot both take the last slot of a task.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self.concurrency = concurrency or settings.JOBS_CONCURRENCY
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._threads: list[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._claim_lock = threading.Lock()
+        self._running: Counter[str] = Counter()
+        self._maintenance = PeriodicTask("jobs-maintenance", self._maintain)
+        self.succeeded = 0
+        self.failed = 0
+
+    def _saturated(self) -> list[str]:
+        with self._lock:
+            return [
+                name
+                for name, spec in registered_tasks().items()
+                if spec.concurrency is not None
+                and self._running[name] >= spec.concurrency
+            ]
+
+    def _claim(self) -> Optional[Job]:
+        """Claim a job and count it as running before another thread looks
+        at which tasks are saturated."""
+        with self._claim_lock:
+            db = SessionLocal()
+            try:
+                job = queue.claim(db, self.worker_id, self._saturated())
+            finally:
+                db.close()
+            if job is not None:
+                with self._lock:
+                    self._running[job.name] += 1
+            return job
+
+    def _execute(self, job: Job) -> None:
+        """Run a claimed job; its slot in `_running` is given back at the end."""
+        spec = get_task(job.name)
+        db = SessionLocal()
+        try:
+            if spec is None:
+                raise LookupError(f"No handler registered for {job.name!r}")
+            run_task(spec, db, job.payload)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(
+                "Job %s (%s) attempt %s failed: %s", job.id, job.name, job.attempts, e
+            )
+            queue.fail(db, job, "".join(traceback.format_exception_only(e)).strip())
+            with self._lock:
+                self.failed += 1
+        else:
+            queue.complete(db, job.id)
+            with self._lock:
+                self.succeeded += 1
+        finally:
+            db.close()
+            with self._lock:
+                self._running[job.name] -= 1
+
+    def _loop(self) -> None:
+        poll = settings.JOBS_POLL_INTERVAL_MS / 1000
+        while not self._stopping.is_set():
+            try:
+                job = self._claim()
+            except Exception:
+                logger.exception("Claiming a job failed")
+                job = None
+
+            if job is None:
+                queue.job_wakeup.wait(poll)
+                queue.job_wakeup.clear()
+                continue
+            try:
+                self._execute(job)
+            except Exception:
+                # Bookkeeping failed: the lock timeout will requeue the job
+                logger.exception("Job %s could not be recorded", job.id)
+
+    def _maintain(self) -> None:
+        db = SessionLocal()
+        try:
+            queue.requeue_stale(db)
+            queue.purge_finished(db)
+        except Exception:
+            db.rollback()
+            logger.exception("Job maintenance failed")
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        for index in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._loop, name=f"job-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self._maintenance.start(settings.JOBS_MAINTENANCE_INTERVAL_SECONDS)
+
+    def stop(self) -> None:
+        """Stop claiming new jobs and wait for the running ones to finish."""
+        self._stopping.set()
+        queue.job_wakeup.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._maintenance.stop()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            running = {name: n for name, n in self._running.items() if n}
+            return {
+                "worker_id": self.worker_id,
+                "threads": len(self._threads),
+                "running": running,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+            }
+
+
+job_worker = Worker()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the background job worker.")
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    worker = Worker(args.concurrency)
+    done = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: done.set())
+    signal.signal(signal.SIGINT, lambda *_: done.set())
+
+    # Exports read from replicas; keep their health known here too
+    replicas.start()
+    worker.start()
+    logger.info("Worker %s running %s threads", worker.worker_id, worker.concurrency)
+    done.wait()
+    logger.info("Stopping, waiting for running jobs")
+    worker.stop()
+    replicas.stop()
+
+
+if __name__ == "__main__":
+    main()
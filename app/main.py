@@ -1,12 +1,72 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import api_router
+from app.routers import API_PREFIX, api_routers
 from app.core.config import settings
+from app.core.admission import AdmissionMiddleware
 from app.core.exception_handlers import setup_exception_handlers
 from app.core.response_envelope import SuccessEnvelopeMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.loop_monitor import loop_monitor
+from app.core.rate_limit import rate_limiter
+from app.core.warmup import warm_up
+from app.core.replicas import ReadYourWritesMiddleware
+from app.dependencies.rate_limit import RateLimitMiddleware
+from app.db import replicas
+from app.jobs.worker import job_worker
+from app.services.discord_client import discord_client
+from app.services.like_buffer import like_buffer
+from app.services.live_updates import live_updates
+from app.services.trending import trending_refresher
+from app.services.view_counter import view_counter
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    replicas.start()
+    if settings.RATE_LIMIT_ENABLED:
+        rate_limiter.start()
+    if settings.LIKES_WRITE_BEHIND:
+        like_buffer.start()
+    if settings.VIEWS_ENABLED:
+        view_counter.start()
+    if settings.LIVE_UPDATES_ENABLED:
+        live_updates.start()
+    trending_refresher.start(settings.TRENDING_REFRESH_INTERVAL_SECONDS, immediate=True)
+    if settings.JOBS_RUN_IN_PROCESS:
+        job_worker.start()
+    discord_client.open()
+    if settings.WARMUP_ENABLED:
+        await run_in_threadpool(warm_up)
+    # Watch only request handling, not the startup above
+    if settings.DEBUG or settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start(settings.LOOP_MONITOR_THRESHOLD_MS)
+    yield
+    loop_monitor.stop()
+    rate_limiter.stop()
+    await discord_client.aclose()
+    # Let running jobs finish; queued ones wait for the next worker
+    job_worker.stop()
+    trending_refresher.stop()
+    live_updates.stop()
+    # Flush buffered likes and views before the worker exits
+    like_buffer.stop()
+    view_counter.stop()
+    replicas.stop()
+
 
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+# Added first so it runs innermost: its 503s still get CORS headers, and
+# only the route itself holds a slot
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
+# Every API request counts against the default policy (routes add their own)
+# before it can wait for an admission slot
+app.add_middleware(RateLimitMiddleware, path_prefix=API_PREFIX)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +74,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients see how much of their rate limit is left
+    expose_headers=[
+        "Retry-After",
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+        "RateLimit-Policy",
+    ],
 )
 
 # Register global exception handlers
@@ -22,10 +90,19 @@ setup_exception_handlers(app)
 # Wrap successful responses
 app.add_middleware(SuccessEnvelopeMiddleware)
 
+# Keep clients that just wrote on the primary while replicas catch up
+if settings.DATABASE_REPLICA_URLS:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Compress the final (enveloped) body, so it must wrap every other middleware
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 
 @app.get("/")
 async def root():
     return {"message": "Server is running"}
 
 
-app.include_router(api_router)
+for router in api_routers:
+    app.include_router(router, prefix=API_PREFIX)
@@ -27,3 +27,8 @@ from .category import Category
 from .tag import Tag
 from .comment import Comment
 from .like import Like
+from .post_ranking import PostRanking
+from .follow import Follow
+from .feed_entry import FeedEntry
+from .job import Job
+from .rate_limit import RateLimitBucket
@@ -1,12 +1,37 @@
-from sqlalchemy import ForeignKey, Integer, Text
+from typing import List, Optional
+
+from sqlalchemy import ForeignKey, Index, Integer, Text, func, select, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
 from app.models import TimestampMixin
 
+# Each path segment is a comment id zero-padded to this width, so ordering by
+# path lists a thread depth-first with replies in the order they were written
+PATH_SEGMENT_WIDTH = 10
+
+# The path ends with the comment's own id, so it is taken before the INSERT
+NEXT_COMMENT_ID = select(func.nextval(func.pg_get_serial_sequence("comments", "id")))
+
+
+def path_segment(comment_id: int) -> str:
+    return str(comment_id).zfill(PATH_SEGMENT_WIDTH)
+
 
 class Comment(TimestampMixin, Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Thread pages: the top-level comments of a post, newest first
+        Index(
+            "ix_comments_post_id_roots",
+            "post_id",
+            "created_at",
+            "id",
+            postgresql_where=text("parent_id IS NULL"),
+        ),
+        # A thread, or any subtree of it (a path range), in reading order
+        Index("ix_comments_thread_id_path", "thread_id", "path"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
@@ -16,6 +41,44 @@ class Comment(TimestampMixin, Base):
     post_id: Mapped[int] = mapped_column(
         ForeignKey("posts.id"), nullable=False, index=True
     )
+    # Materialized path: ids from the thread root (thread_id) down to this
+    # comment, dot-separated; compared bytewise so ranges select subtrees
+    parent_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("comments.id"), nullable=True
+    )
+    thread_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    path: Mapped[str] = mapped_column(Text(collation="C"), nullable=False)
+    depth: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    # Live replies below this comment at any depth, kept up to date on write
+    reply_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
 
     author = relationship("User", back_populates="comments", lazy="joined")
     post = relationship("Post", back_populates="comments", lazy="joined")
+
+    def place(self, comment_id: int, parent: Optional["Comment"] = None) -> None:
+        """Give a new comment its id and position: a thread root, or a reply
+        to `parent`."""
+        self.id = comment_id
+        if parent is None:
+            self.parent_id = None
+            self.thread_id = comment_id
+            self.path = path_segment(comment_id)
+            self.depth = 0
+        else:
+            self.parent_id = parent.id
+            self.thread_id = parent.thread_id
+            self.path = f"{parent.path}.{path_segment(comment_id)}"
+            self.depth = parent.depth + 1
+
+    @property
+    def ancestor_ids(self) -> List[int]:
+        return [int(segment) for segment in self.path.split(".")[:-1]]
+
+    @property
+    def subtree_upper_bound(self) -> str:
+        """Smallest path after every descendant ('/' sorts right after '.')."""
+        return self.path + "/"
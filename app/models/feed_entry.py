@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class FeedEntry(Base):
+    """A post materialized into a user's home feed (see app.services.feed)."""
+
+    __tablename__ = "feed_entries"
+    __table_args__ = (
+        # A feed page is a backward range scan of this index
+        Index("ix_feed_entries_user_published", "user_id", "published_at", "post_id"),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    post_id: Mapped[int] = mapped_column(
+        ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    published_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
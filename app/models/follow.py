@@ -0,0 +1,34 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class FollowTarget(enum.Enum):
+    TAG = "tag"
+    CATEGORY = "category"
+    AUTHOR = "author"
+
+
+class Follow(Base):
+    """A user following a tag, a category or another user's posts."""
+
+    __tablename__ = "follows"
+    __table_args__ = (
+        # Fan-out: who follows this tag / category / author
+        Index("ix_follows_target", "target_type", "target_id", "user_id"),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    target_type: Mapped[FollowTarget] = mapped_column(
+        SQLEnum(FollowTarget), primary_key=True
+    )
+    target_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer, String, Text, JSON, text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, JSON, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
@@ -6,18 +6,50 @@ from app.db import Base
 from app.models import TimestampMixin
 
 
+POST_BODY_GROUP = "body"
+POST_HTML_GROUP = "html"
+
+
 class Post(TimestampMixin, Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Fan-in reads of an author's latest posts (app.services.feed)
+        Index("ix_posts_author_id_created_at", "author_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
-    description: Mapped[str] = mapped_column(Text, nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Unbounded text is deferred: only loaded where a full post is serialized
+    description: Mapped[str] = mapped_column(
+        Text, nullable=False, deferred=True, deferred_group=POST_BODY_GROUP
+    )
+    content: Mapped[str] = mapped_column(
+        Text, nullable=False, deferred=True, deferred_group=POST_BODY_GROUP
+    )
     images: Mapped[list[str]] = mapped_column(
         JSON, nullable=False, server_default=text("'[]'::json")
     )
     video: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Derived from content by app.services.text_stats; content_hash is the
+    # content they were computed from
     reading_time: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    word_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    excerpt: Mapped[str] = mapped_column(
+        String(300), nullable=False, default="", server_default=text("''")
+    )
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Sanitized HTML of content (app.services.post_render), only loaded for
+    # format=html; re-rendered when the renderer version changes
+    content_html: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_group=POST_HTML_GROUP
+    )
+    content_html_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Bumped in bulk by app.services.view_counter, never per request
+    views: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
     author_id: Mapped[int] = mapped_column(
         ForeignKey("users.id"), nullable=False, index=True
     )
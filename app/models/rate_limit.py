@@ -0,0 +1,17 @@
+from sqlalchemy import Float, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket of one client under one policy, for the shared rate limit
+    backend (see app.core.rate_limit)."""
+
+    __tablename__ = "rate_limit_buckets"
+    # Losing the buckets in a crash only forgives some requests: skip the WAL
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    # Theoretical arrival time (epoch seconds): the bucket is full from then on
+    tat: Mapped[float] = mapped_column(Float, nullable=False)
@@ -1,5 +1,5 @@
 from passlib.context import CryptContext
-from sqlalchemy import Integer, String, Enum as SQLEnum
+from sqlalchemy import Integer, String, Enum as SQLEnum, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -43,6 +43,10 @@ class User(TimestampMixin, Base):
     role: Mapped[UserRole] = mapped_column(
         SQLEnum(UserRole), default=UserRole.USER, nullable=False
     )
+    # Maintained by FeedService.follow/unfollow; decides fan-out vs fan-in
+    follower_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
 
     posts = relationship(
         "Post",
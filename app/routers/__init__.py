@@ -1,4 +1,3 @@
-from fastapi import APIRouter
 from .auth import auth_router
 from .user import user_router
 from .post import post_router
@@ -6,14 +5,27 @@ from .comment import comment_router
 from .like import like_router
 from .category import category_router
 from .tag import tag_router
+from .metrics import metrics_router
+from .feed import feed_router
+from .export import export_router
+from .live import live_router
 
-api_router = APIRouter(prefix="/api")
-api_router.include_router(auth_router)
-api_router.include_router(user_router)
-api_router.include_router(post_router)
-api_router.include_router(comment_router)
-api_router.include_router(like_router)
-api_router.include_router(category_router)
-api_router.include_router(tag_router)
+API_PREFIX = "/api"
 
-__all__ = ["api_router"]
+# Included one by one under API_PREFIX (see app.main): nesting them in an
+# /api router first would build every route one extra time at import
+api_routers = (
+    auth_router,
+    user_router,
+    post_router,
+    comment_router,
+    like_router,
+    category_router,
+    tag_router,
+    metrics_router,
+    feed_router,
+    export_router,
+    live_router,
+)
+
+__all__ = ["API_PREFIX", "api_routers"]
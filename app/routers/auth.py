@@ -3,6 +3,7 @@ from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 
 from app.db import get_db
+from app.dependencies.rate_limit import rate_limit
 from app.schemas.auth import (
     LoginRequest,
     LoginResponse,
@@ -14,6 +15,7 @@ from app.schemas.auth import (
 )
 from app.services.user import UserService
 from app.services.discord_auth import DiscordAuthService
+from app.services.discord_client import DiscordUnavailableError
 from app.models.auth_provider import ProviderType
 from app.utils.jwt import create_access_token
 
@@ -25,6 +27,7 @@ auth_router = APIRouter(prefix="/auth", tags=["Auth"])
     "/register",
     response_model=UserPublic,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("auth"))],
 )
 def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> UserPublic:
     user_service = UserService(db)
@@ -44,7 +47,9 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> UserPub
     return UserPublic.model_validate(user)
 
 
-@auth_router.post("/login", response_model=LoginResponse)
+@auth_router.post(
+    "/login", response_model=LoginResponse, dependencies=[Depends(rate_limit("auth"))]
+)
 def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
     user_service = UserService(db)
     user = user_service.authenticate_user(payload.email, payload.password)
@@ -71,7 +76,7 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse
 
 
 # Discord OAuth2 Endpoints
-@auth_router.get("/discord/login")
+@auth_router.get("/discord/login", dependencies=[Depends(rate_limit("auth"))])
 def discord_login(db: Session = Depends(get_db)):
     """Redirige al usuario a Discord para autenticación OAuth2"""
     discord_service = DiscordAuthService(db)
@@ -79,7 +84,11 @@ def discord_login(db: Session = Depends(get_db)):
     return RedirectResponse(url=authorization_url)
 
 
-@auth_router.get("/discord/callback", response_model=LoginResponse)
+@auth_router.get(
+    "/discord/callback",
+    response_model=LoginResponse,
+    dependencies=[Depends(rate_limit("auth"))],
+)
 async def discord_callback(
     code: str, state: str | None = None, db: Session = Depends(get_db)
 ) -> LoginResponse:
@@ -125,6 +134,11 @@ async def discord_callback(
     except HTTPException:
         # Propagar HTTPException generadas explícitamente (como 401)
         raise
+    except DiscordUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Discord is unavailable, try again later",
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception:
@@ -164,7 +178,11 @@ def get_user_auth_provider(
 
 
 # Endpoints personalizados para NextAuth Discord flow
-@auth_router.post("/discord/custom-login", response_model=LoginResponse)
+@auth_router.post(
+    "/discord/custom-login",
+    response_model=LoginResponse,
+    dependencies=[Depends(rate_limit("auth"))],
+)
 def discord_custom_login(
     request: DiscordCustomLoginRequest, db: Session = Depends(get_db)
 ) -> LoginResponse:
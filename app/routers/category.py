@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.dependencies.auth import get_current_admin_user
+from app.dependencies.fieldsets import fieldset_params, sparse_response
 from app.schemas.auth import UserPublic
+from app.schemas.fieldset import Fieldset
+from app.schemas.post import POST_FIELDS, POST_INCLUDES, PostPublic, PostSparse
 from app.schemas.category import (
     CategoryCreate,
     CategoryUpdate,
@@ -16,6 +19,8 @@ from app.services.category import CategoryService
 
 category_router = APIRouter(prefix="/categories", tags=["Categories"])
 
+get_post_fieldset = fieldset_params(POST_FIELDS, POST_INCLUDES)
+
 
 @category_router.post(
     "/", response_model=CategoryPublic, status_code=status.HTTP_201_CREATED
@@ -43,17 +48,17 @@ def create_category(
 def get_categories(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> CategoryList:
     """Get all categories with pagination. Public endpoint."""
     category_service = CategoryService(db)
 
-    categories = category_service.get_categories(skip=skip, limit=limit)
-    total = category_service.count_categories()
+    page = category_service.get_categories_page(skip=skip, limit=limit)
 
     return CategoryList(
-        categories=[CategoryPublic.model_validate(cat) for cat in categories],
-        total=total,
+        categories=[CategoryPublic.model_validate(cat) for cat in page.items],
+        total=page.total,
+        has_more=page.has_more,
     )
 
 
@@ -88,6 +93,34 @@ def get_category(
     return CategoryPublic.model_validate(category)
 
 
+@category_router.get("/{category_id}/posts", response_model=list[PostPublic])
+def get_category_posts(
+    category_id: int,
+    fieldset: Fieldset = Depends(get_post_fieldset),
+    db: Session = Depends(get_read_db),
+) -> list[PostPublic]:
+    """Get all posts in a category. Public endpoint."""
+    category_service = CategoryService(db)
+
+    if not category_service.get_category_by_id(category_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
+        )
+
+    posts = category_service.get_posts_by_category(category_id, fieldset=fieldset)
+    if fieldset.sparse:
+        return sparse_response(
+            [
+                PostSparse.model_validate(
+                    fieldset.pick(post, POST_FIELDS), from_attributes=True
+                )
+                for post in posts
+            ]
+        )
+
+    return [PostPublic.model_validate(post) for post in posts]
+
+
 @category_router.put("/{category_id}", response_model=CategoryPublic)
 def update_category(
     category_id: int,
@@ -1,24 +1,41 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.core.config import settings
+from app.db import get_db, get_read_db
 from app.dependencies.auth import get_current_user, get_token_data
+from app.dependencies.fieldsets import fieldset_params, sparse_response
+from app.dependencies.rate_limit import rate_limit
 from app.models.user import UserRole
 from app.schemas.auth import UserPublic, TokenData
 from app.schemas.comment import (
+    COMMENT_FIELDS,
+    COMMENT_INCLUDES,
     CommentCreate,
     CommentUpdate,
     CommentPublic,
     CommentList,
+    CommentReplyPage,
+    CommentSparse,
+    CommentSparseList,
+    CommentThreadPage,
 )
+from app.schemas.fieldset import Fieldset
 from app.services.comment import CommentService
 
 
 comment_router = APIRouter(prefix="/comments", tags=["Comments"])
 
+get_comment_fieldset = fieldset_params(COMMENT_FIELDS, COMMENT_INCLUDES)
+
 
 @comment_router.post(
-    "/", response_model=CommentPublic, status_code=status.HTTP_201_CREATED
+    "/",
+    response_model=CommentPublic,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("comments"))],
 )
 def create_comment(
     comment_data: CommentCreate,
@@ -32,6 +49,7 @@ def create_comment(
             post_id=comment_data.post_id,
             author_id=current_user.id,
             content=comment_data.content,
+            parent_id=comment_data.parent_id,
         )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -44,25 +62,88 @@ def get_comments_by_post(
     post_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    fieldset: Fieldset = Depends(get_comment_fieldset),
+    db: Session = Depends(get_read_db),
 ) -> CommentList:
     """Get comments for a specific post with pagination."""
     comment_service = CommentService(db)
 
-    comments = comment_service.get_comments_by_post(
-        post_id=post_id, skip=skip, limit=limit
+    page = comment_service.get_comments_page(
+        post_id=post_id, skip=skip, limit=limit, fieldset=fieldset
     )
-    total = comment_service.count_comments_by_post(post_id)
+    if fieldset.sparse:
+        return sparse_response(
+            CommentSparseList(
+                comments=[
+                    CommentSparse.model_validate(
+                        fieldset.pick(comment, COMMENT_FIELDS), from_attributes=True
+                    )
+                    for comment in page.items
+                ],
+                total=page.total,
+                skip=skip,
+                limit=limit,
+                has_more=page.has_more,
+            )
+        )
 
     return CommentList(
-        comments=[CommentPublic.model_validate(comment) for comment in comments],
-        total=total,
+        comments=[CommentPublic.model_validate(comment) for comment in page.items],
+        total=page.total,
         skip=skip,
         limit=limit,
+        has_more=page.has_more,
     )
 
 
-@comment_router.put("/{comment_id}", response_model=CommentPublic)
+@comment_router.get("/post/{post_id}/threads", response_model=CommentThreadPage)
+def get_comment_threads(
+    post_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+    replies: int = Query(settings.COMMENTS_THREAD_REPLIES, ge=0, le=20),
+    db: Session = Depends(get_read_db),
+) -> CommentThreadPage:
+    """Top-level comments of a post, newest first, with the first `replies`
+    replies of each thread.
+
+    Pass the returned `next_cursor` back as `cursor` for the next page, and a
+    thread's `next_replies_cursor` to /comments/{id}/replies for the rest of it.
+    """
+    comment_service = CommentService(db)
+
+    try:
+        return comment_service.get_threads_page(post_id, limit, cursor, replies)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@comment_router.get("/{comment_id}/replies", response_model=CommentReplyPage)
+def get_comment_replies(
+    comment_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+) -> CommentReplyPage:
+    """Replies below a comment at any depth, in reading order.
+
+    Pass the returned `next_cursor` back as `cursor` for the next page.
+    """
+    comment_service = CommentService(db)
+
+    try:
+        return comment_service.get_replies_page(comment_id, limit, cursor)
+    except ValueError as e:
+        if "not found" in str(e):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@comment_router.put(
+    "/{comment_id}",
+    response_model=CommentPublic,
+    dependencies=[Depends(rate_limit("comments"))],
+)
 def update_comment(
     comment_id: int,
     comment_data: CommentUpdate,
@@ -135,7 +216,7 @@ def get_my_comments(
 
 
 @comment_router.get("/{comment_id}", response_model=CommentPublic)
-def get_comment(comment_id: int, db: Session = Depends(get_db)) -> CommentPublic:
+def get_comment(comment_id: int, db: Session = Depends(get_read_db)) -> CommentPublic:
     """Get a specific comment by ID."""
     comment_service = CommentService(db)
 
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.dependencies.auth import get_current_admin_user
+from app.schemas.auth import UserPublic
+from app.services.export import EXPORT_MEDIA_TYPES, build_export_query, stream_export
+
+
+export_router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@export_router.get("/{resource}", response_class=StreamingResponse)
+def export_resource(
+    resource: Literal["posts", "comments", "likes", "users"],
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    since: Optional[datetime] = Query(None, description="created_at >= since"),
+    until: Optional[datetime] = Query(None, description="created_at < until"),
+    author_id: Optional[int] = Query(
+        None, description="Rows written by this user (likes: the liker)"
+    ),
+    include_deleted: bool = Query(False),
+    include_content: bool = Query(False, description="Posts only: full body"),
+    admin: UserPublic = Depends(get_current_admin_user),
+) -> StreamingResponse:
+    """Stream a whole table as NDJSON or CSV. Admin only.
+
+    Rows are read with a server-side cursor and written as they arrive, so
+    memory use does not grow with the table. Likes have no timestamp and
+    cannot be filtered by date.
+    """
+    try:
+        query = build_export_query(
+            resource,
+            since=since,
+            until=until,
+            author_id=author_id,
+            include_deleted=include_deleted,
+            include_content=include_content,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(
+        stream_export(query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{resource}-{stamp}.{format}"'
+        },
+    )
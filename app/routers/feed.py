@@ -0,0 +1,88 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+
+from app.db import get_db, get_read_db
+from app.dependencies.auth import get_token_data
+from app.models.follow import FollowTarget
+from app.schemas.auth import TokenData
+from app.schemas.feed import FeedPage, FollowCreate, FollowPublic
+from app.services.feed import FeedService
+
+
+feed_router = APIRouter(prefix="/feed", tags=["Feed"])
+
+
+@feed_router.get("/", response_model=FeedPage)
+def get_feed(
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+    token_data: TokenData = Depends(get_token_data),
+    db: Session = Depends(get_read_db),
+) -> FeedPage:
+    """Home feed: newest posts from followed tags, categories and authors.
+
+    Pass the returned `next_cursor` back as `cursor` for the next page.
+    """
+    feed_service = FeedService(db)
+
+    try:
+        return feed_service.get_feed_page(int(token_data.sub), limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@feed_router.get("/follows", response_model=list[FollowPublic])
+def get_my_follows(
+    token_data: TokenData = Depends(get_token_data),
+    db: Session = Depends(get_db),
+) -> list[FollowPublic]:
+    """Tags, categories and authors followed by the current user."""
+    feed_service = FeedService(db)
+
+    follows = feed_service.get_follows(int(token_data.sub))
+
+    return [FollowPublic.model_validate(follow) for follow in follows]
+
+
+@feed_router.post(
+    "/follows", response_model=FollowPublic, status_code=status.HTTP_201_CREATED
+)
+def follow(
+    follow_data: FollowCreate,
+    token_data: TokenData = Depends(get_token_data),
+    db: Session = Depends(get_db),
+) -> FollowPublic:
+    """Follow a tag, category or author. Requires authentication."""
+    feed_service = FeedService(db)
+
+    try:
+        follow = feed_service.follow(
+            int(token_data.sub), follow_data.target_type, follow_data.target_id
+        )
+    except ValueError as e:
+        if "not found" in str(e):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        if "Already" in str(e):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return FollowPublic.model_validate(follow)
+
+
+@feed_router.delete(
+    "/follows/{target_type}/{target_id}", status_code=status.HTTP_204_NO_CONTENT
+)
+def unfollow(
+    target_type: FollowTarget,
+    target_id: int,
+    token_data: TokenData = Depends(get_token_data),
+    db: Session = Depends(get_db),
+) -> None:
+    """Stop following a tag, category or author. Requires authentication."""
+    feed_service = FeedService(db)
+
+    if not feed_service.unfollow(int(token_data.sub), target_type, target_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Follow not found"
+        )
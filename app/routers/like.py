@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.dependencies.auth import get_current_user, get_token_data
+from app.dependencies.rate_limit import rate_limit
 from app.schemas.auth import UserPublic, TokenData
 from app.schemas.like import LikeCreate, LikePublic, LikeStats, PostLikesList
 from app.services.like import LikeService
@@ -11,7 +12,12 @@ from app.services.like import LikeService
 like_router = APIRouter(prefix="/likes", tags=["Likes"])
 
 
-@like_router.post("/", response_model=LikePublic, status_code=status.HTTP_201_CREATED)
+@like_router.post(
+    "/",
+    response_model=LikePublic,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("likes"))],
+)
 def create_like(
     like_data: LikeCreate,
     current_user: UserPublic = Depends(get_current_user),
@@ -33,7 +39,11 @@ def create_like(
     return LikePublic.model_validate(like)
 
 
-@like_router.delete("/post/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
+@like_router.delete(
+    "/post/{post_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit("likes"))],
+)
 def remove_like(
     post_id: int,
     current_user: UserPublic = Depends(get_current_user),
@@ -49,7 +59,9 @@ def remove_like(
         )
 
 
-@like_router.post("/toggle", response_model=dict)
+@like_router.post(
+    "/toggle", response_model=dict, dependencies=[Depends(rate_limit("likes"))]
+)
 def toggle_like(
     like_data: LikeCreate,
     current_user: UserPublic = Depends(get_current_user),
@@ -62,12 +74,21 @@ def toggle_like(
         is_liked, like_obj = like_service.toggle_like(
             current_user.id, like_data.post_id
         )
+        if like_obj is not None:
+            like = LikePublic.model_validate(like_obj)
+        elif is_liked:
+            # Write-behind: the row is not stored yet, build it from what we know
+            like = LikePublic(
+                user_id=current_user.id, post_id=like_data.post_id, user=current_user
+            )
+        else:
+            like = None
 
         return {
             "is_liked": is_liked,
             "post_id": like_data.post_id,
             "user_id": current_user.id,
-            "like": LikePublic.model_validate(like_obj) if like_obj else None,
+            "like": like,
         }
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -82,8 +103,9 @@ def get_post_like_stats(
     """Get like statistics for a post including current user's like status."""
     like_service = LikeService(db)
 
-    likes_count = like_service.get_post_likes_count(post_id)
-    user_has_liked = like_service.has_user_liked_post(int(token_data.sub), post_id)
+    user_id = int(token_data.sub)
+    likes_count = like_service.get_post_likes_count(post_id, user_id)
+    user_has_liked = like_service.has_user_liked_post(user_id, post_id)
 
     return LikeStats(
         post_id=post_id,
@@ -95,7 +117,7 @@ def get_post_like_stats(
 @like_router.get("/post/{post_id}", response_model=PostLikesList)
 def get_post_likes(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> PostLikesList:
     """Get all likes for a specific post."""
     like_service = LikeService(db)
@@ -0,0 +1,47 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.services.live_updates import live_updates
+
+
+live_router = APIRouter(prefix="/live", tags=["Live"])
+
+
+@live_router.get("/posts", response_class=StreamingResponse)
+async def stream_post_updates(
+    post_id: List[int] = Query(
+        ..., min_length=1, max_length=settings.LIVE_UPDATES_MAX_POSTS
+    ),
+) -> StreamingResponse:
+    """Server-sent events for the given posts (`?post_id=1&post_id=2`).
+
+    Starts with a `likes` event per post holding its current count, then
+    sends `likes` when the count changes (at most once per
+    LIVE_UPDATES_LIKES_INTERVAL_MS), `comment` with each new comment and
+    `comment_deleted` when a comment and its replies are removed. Streams
+    are closed after LIVE_UPDATES_STREAM_SECONDS; EventSource reconnects by
+    itself and receives the counts again.
+    """
+    if not live_updates.running:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live updates are disabled",
+        )
+    if live_updates.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live connections, try again later",
+        )
+
+    return StreamingResponse(
+        live_updates.stream(post_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stops nginx from buffering the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db import engine, get_db, replicas
+from app.dependencies.auth import get_current_admin_user
+from app.core.admission import admission_controller
+from app.core.loop_monitor import loop_monitor
+from app.core.pool import pool_status
+from app.core.rate_limit import rate_limiter
+from app.jobs.queue import queue_stats
+from app.jobs.worker import job_worker
+from app.schemas.auth import UserPublic
+from app.services.like_buffer import like_buffer
+from app.services.live_updates import live_updates
+from app.services.view_counter import view_counter
+
+
+metrics_router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@metrics_router.get("/pool", response_model=dict)
+def get_pool_metrics(admin: UserPublic = Depends(get_current_admin_user)) -> dict:
+    """Connection pool occupancy and checkout metrics of this worker. Admin only."""
+    return pool_status(engine)
+
+
+@metrics_router.get("/replicas", response_model=list[dict])
+def get_replica_status(
+    admin: UserPublic = Depends(get_current_admin_user),
+) -> list[dict]:
+    """Last known health and lag of each read replica. Admin only."""
+    return replicas.status()
+
+
+@metrics_router.get("/likes-buffer", response_model=dict)
+def get_like_buffer_status(
+    admin: UserPublic = Depends(get_current_admin_user),
+) -> dict:
+    """Pending intents and flush stats of this worker's like buffer. Admin only."""
+    return like_buffer.status()
+
+
+@metrics_router.get("/views", response_model=dict)
+def get_view_counter_status(
+    admin: UserPublic = Depends(get_current_admin_user),
+) -> dict:
+    """Pending views and flush stats of this worker's view counter. Admin only."""
+    return view_counter.status()
+
+
+@metrics_router.get("/live", response_model=dict)
+def get_live_updates_status(
+    admin: UserPublic = Depends(get_current_admin_user),
+) -> dict:
+    """Open streams and publish stats of this worker's live updates. Admin only."""
+    return live_updates.status()
+
+
+@metrics_router.get("/jobs", response_model=dict)
+def get_job_queue_status(
+    admin: UserPublic = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Job counts per task and status, queue lag and this worker's pool. Admin only."""
+    return {"queue": queue_stats(db), "worker": job_worker.status()}
+
+
+@metrics_router.get("/event-loop", response_model=dict)
+def get_event_loop_status(
+    admin: UserPublic = Depends(get_current_admin_user),
+) -> dict:
+    """Event loop stalls seen by this worker's loop monitor. Admin only."""
+    return loop_monitor.status()
+
+
+@metrics_router.get("/rate-limits", response_model=dict)
+def get_rate_limit_status(
+    admin: UserPublic = Depends(get_current_admin_user),
+) -> dict:
+    """Policies and allowed/limited counts of this worker's rate limiter. Admin only."""
+    return rate_limiter.status()
+
+
+@metrics_router.get("/admission", response_model=dict)
+def get_admission_status(
+    admin: UserPublic = Depends(get_current_admin_user),
+) -> dict:
+    """In-flight, queued and turned away requests per route class of this worker. Admin only."""
+    return admission_controller.status()
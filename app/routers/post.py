@@ -1,21 +1,55 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import json
+from typing import AsyncIterator, List, Literal, Optional, Tuple
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    status,
+    Query,
+)
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.core.config import settings
+from app.db import get_db, get_read_db
 from app.dependencies.auth import (
     get_current_user,
+    get_optional_token_data,
     get_token_data,
-    # get_current_admin_user,
+    get_current_admin_user,
 )
+from app.dependencies.fieldsets import fieldset_params, sparse_response
 from app.models.user import UserRole
 from app.schemas.auth import UserPublic, TokenData
-from app.schemas.post import PostCreate, PostUpdate, PostPublic, PostList
+from app.schemas.fieldset import Fieldset
+from app.schemas.post import (
+    POST_FIELDS,
+    POST_INCLUDES,
+    PostCreate,
+    PostImport,
+    PostImportError,
+    PostImportResult,
+    PostUpdate,
+    PostPublic,
+    PostList,
+    PostSparse,
+    PostSparseList,
+    TrendingPostList,
+)
 from app.services.post import PostService
+from app.services.post_import import PostImportService
+from app.services.post_render import post_content_html
+from app.services.trending import TrendingService
+from app.services.view_counter import view_counter
 
 
 post_router = APIRouter(prefix="/posts", tags=["Posts"])
 
+get_post_fieldset = fieldset_params(POST_FIELDS, POST_INCLUDES)
+
 
 @post_router.post("/", response_model=PostPublic, status_code=status.HTTP_201_CREATED)
 def create_post(
@@ -43,24 +77,142 @@ def create_post(
     return PostPublic.model_validate(post)
 
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _import_error(index: int, error: Exception) -> PostImportError:
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        location = ".".join(str(part) for part in first["loc"])
+        message = f"{location}: {first['msg']}" if location else first["msg"]
+    else:
+        message = "Invalid JSON"
+    return PostImportError(index=index, error=message)
+
+
+async def _ndjson_items(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """(index, raw line) for every non-empty line of the request body, read as
+    it arrives instead of buffering the whole upload."""
+    pending = bytearray()
+    index = 0
+    async for chunk in request.stream():
+        # Only the new chunk is searched for line ends: a long line spread over
+        # many chunks is appended to, never copied or scanned again
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            pending += chunk[start:end]
+            if pending.strip():
+                yield index, bytes(pending)
+                index += 1
+            pending.clear()
+            start = end + 1
+        pending += chunk[start:]
+    if pending.strip():
+        yield index, bytes(pending)
+
+
+async def _json_array_items(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    try:
+        # A large upload takes seconds to parse: keep it off the event loop
+        items = await run_in_threadpool(json.loads, await request.body())
+    except ValueError:
+        items = None
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array or NDJSON",
+        )
+    for index, item in enumerate(items):
+        yield index, item
+
+
+@post_router.post("/bulk", response_model=PostImportResult)
+async def import_posts(
+    request: Request,
+    admin: UserPublic = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> PostImportResult:
+    """Import many posts at once (admin only).
+
+    The body is either a JSON array of posts or NDJSON (one post per line,
+    `Content-Type: application/x-ndjson`). Each post takes the fields of
+    `POST /posts/` plus `author_id` or `author_email`, an optional category
+    name and `created_at`. Items that fail are reported by index and do not
+    stop the rest of the import.
+    """
+    service = PostImportService(db)
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip() == NDJSON_MEDIA_TYPE:
+        raw_items = _ndjson_items(request)
+    else:
+        raw_items = _json_array_items(request)
+
+    created = 0
+    errors: List[PostImportError] = []
+    chunk: List[Tuple[int, PostImport]] = []
+
+    async def flush() -> None:
+        nonlocal created
+        post_ids, chunk_errors = await run_in_threadpool(service.import_chunk, chunk)
+        created += len(post_ids)
+        errors.extend(chunk_errors)
+        chunk.clear()
+
+    async for index, raw in raw_items:
+        try:
+            if isinstance(raw, bytes):
+                raw = json.loads(raw)
+            chunk.append((index, PostImport.model_validate(raw)))
+        except (ValueError, ValidationError) as e:
+            errors.append(_import_error(index, e))
+            continue
+        if len(chunk) >= settings.POSTS_IMPORT_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+
+    errors.sort(key=lambda error: error.index)
+    return PostImportResult(created=created, failed=len(errors), errors=errors)
+
+
 @post_router.get("/", response_model=PostList)
 def get_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     author_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
+    fieldset: Fieldset = Depends(get_post_fieldset),
+    db: Session = Depends(get_read_db),
 ) -> PostList:
-    """Get posts with pagination and optional author filter. Public endpoint."""
-    post_service = PostService(db)
+    """Get posts with pagination and optional author filter. Public endpoint.
 
-    posts = post_service.get_posts(skip=skip, limit=limit, author_id=author_id)
+    `fields=` / `include=` narrow both the query and the response shape.
+    """
+    post_service = PostService(db)
 
-    total = post_service.count_posts(author_id=author_id)
+    page = post_service.get_posts_page(
+        skip=skip, limit=limit, author_id=author_id, fieldset=fieldset
+    )
+    if fieldset.sparse:
+        return sparse_response(
+            PostSparseList(
+                posts=[
+                    PostSparse.model_validate(
+                        fieldset.pick(post, POST_FIELDS), from_attributes=True
+                    )
+                    for post in page.items
+                ],
+                total=page.total,
+                skip=skip,
+                limit=limit,
+                has_more=page.has_more,
+            )
+        )
     return PostList(
-        posts=[PostPublic.model_validate(post) for post in posts],
-        total=total,
+        posts=[PostPublic.model_validate(post) for post in page.items],
+        total=page.total,
         skip=skip,
         limit=limit,
+        has_more=page.has_more,
     )
 
 
@@ -74,16 +226,14 @@ def update_post(
     """Update a post. Only author or admin can update."""
     post_service = PostService(db)
 
-    existing_post = post_service.get_post_by_id(post_id)
-    if not existing_post:
+    # Loaded once for the request: update_post gets it back from the loader
+    post = post_service.get_post_by_id(post_id)
+    if post is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
 
-    if (
-        existing_post.author_id != current_user.id
-        and current_user.role != UserRole.ADMIN
-    ):
+    if post.author_id != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this post",
@@ -115,16 +265,13 @@ def delete_post(
     """Delete a post. Only author or admin can delete."""
     post_service = PostService(db)
 
-    existing_post = post_service.get_post_by_id(post_id)
-    if not existing_post:
+    author_id = post_service.get_post_author_id(post_id)
+    if author_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
 
-    if (
-        existing_post.author_id != current_user.id
-        and current_user.role != UserRole.ADMIN
-    ):
+    if author_id != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to delete this post",
@@ -141,12 +288,22 @@ def delete_post(
 @post_router.get("/author/{author_id}", response_model=list[PostPublic])
 def get_posts_by_author(
     author_id: int,
-    db: Session = Depends(get_db),
+    fieldset: Fieldset = Depends(get_post_fieldset),
+    db: Session = Depends(get_read_db),
 ) -> list[PostPublic]:
     """Get all posts by a specific author."""
     post_service = PostService(db)
 
-    posts = post_service.get_posts_by_author(author_id)
+    posts = post_service.get_posts_by_author(author_id, fieldset=fieldset)
+    if fieldset.sparse:
+        return sparse_response(
+            [
+                PostSparse.model_validate(
+                    fieldset.pick(post, POST_FIELDS), from_attributes=True
+                )
+                for post in posts
+            ]
+        )
 
     return [PostPublic.model_validate(post) for post in posts]
 
@@ -164,15 +321,54 @@ def get_my_posts(
     return [PostPublic.model_validate(post) for post in posts]
 
 
+@post_router.get("/trending", response_model=TrendingPostList)
+def get_trending_posts(
+    window: Literal["24h", "7d"] = Query("24h"),
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+) -> TrendingPostList:
+    """Posts published in the window, ranked by time-decayed engagement.
+
+    Pass the returned `next_cursor` back as `cursor` for the next page.
+    """
+    trending_service = TrendingService(db)
+
+    try:
+        return trending_service.get_trending_page(window, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @post_router.get("/{post_id}", response_model=PostPublic)
-def get_post(post_id: int, db: Session = Depends(get_db)) -> PostPublic:
-    """Get a specific post by ID."""
+def get_post(
+    post_id: int,
+    request: Request,
+    format: Literal["markdown", "html"] = Query(
+        "markdown",
+        description="`html` returns `content` as sanitized, pre-rendered HTML",
+    ),
+    token_data: Optional[TokenData] = Depends(get_optional_token_data),
+    db: Session = Depends(get_read_db),
+) -> PostPublic:
+    """Get a specific post by ID. Counts a view."""
     post_service = PostService(db)
 
-    post = post_service.get_post_by_id(post_id)
+    post = post_service.get_post_by_id(post_id, with_html=format == "html")
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
 
-    return PostPublic.model_validate(post)
+    response = PostPublic.model_validate(post)
+    if format == "html":
+        response.content = post_content_html(post)
+        response.content_format = "html"
+    if settings.VIEWS_ENABLED:
+        if token_data is not None:
+            viewer = f"user:{token_data.sub}"
+        else:
+            viewer = f"ip:{request.client.host if request.client else ''}"
+        view_counter.record(post_id, viewer)
+        response.views += view_counter.pending(post_id)
+    return response
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.dependencies.auth import get_current_admin_user
 from app.schemas.auth import UserPublic
 from app.schemas.tag import (
@@ -39,24 +39,24 @@ def create_tag(
 def get_tags(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> TagList:
     """Get all tags with pagination. Public endpoint."""
     tag_service = TagService(db)
 
-    tags = tag_service.get_all_tags(skip=skip, limit=limit)
-    total = tag_service.count_tags()
+    page = tag_service.get_tags_page(skip=skip, limit=limit)
 
     return TagList(
-        tags=[TagPublic.model_validate(tag) for tag in tags],
-        total=total,
+        tags=[TagPublic.model_validate(tag) for tag in page.items],
+        total=page.total,
+        has_more=page.has_more,
     )
 
 
 @tag_router.get("/popular", response_model=list[PopularTag])
 def get_popular_tags(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> list[PopularTag]:
     """Get most popular tags by post count. Public endpoint."""
     tag_service = TagService(db)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_read_db
 from app.schemas.auth import UserPublic
 from app.services.user import UserService
 
@@ -9,7 +9,7 @@ user_router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @user_router.get("/{user_id}", response_model=UserPublic)
-def get_user_by_id(user_id: int, db: Session = Depends(get_db)) -> UserPublic:
+def get_user_by_id(user_id: int, db: Session = Depends(get_read_db)) -> UserPublic:
     """Obtener información pública de un usuario por su ID"""
     user_service = UserService(db)
     user = user_service.get_user_by_id(user_id)
@@ -24,6 +24,16 @@ class UserPublic(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class UserSummary(BaseModel):
+    """Autor reducido para listados (tarjetas de posts y comentarios)"""
+
+    id: int
+    name: str
+    lastname: str
+    image: Optional[str] = None
+    model_config = {"from_attributes": True}
+
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
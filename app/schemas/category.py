@@ -31,4 +31,5 @@ class CategoryWithStats(CategoryPublic):
 
 class CategoryList(BaseModel):
     categories: list[CategoryPublic]
-    total: int
+    total: Optional[int]
+    has_more: bool = False
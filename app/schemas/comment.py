@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
-from app.schemas.auth import UserPublic
+from app.schemas.auth import UserPublic, UserSummary
 
 
 class CommentBase(BaseModel):
@@ -11,6 +11,8 @@ class CommentBase(BaseModel):
 
 class CommentCreate(CommentBase):
     post_id: int
+    # Comment being answered; omitted for a new thread
+    parent_id: Optional[int] = None
 
 
 class CommentUpdate(BaseModel):
@@ -22,14 +24,76 @@ class CommentPublic(CommentBase):
     post_id: int
     author_id: int
     author: UserPublic
+    parent_id: Optional[int] = None
+    depth: int = 0
+    reply_count: int = 0
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class CommentThread(CommentPublic):
+    """A top-level comment with the first replies of its thread."""
+
+    replies: List[CommentPublic]
+    # Continues the thread through /comments/{id}/replies
+    next_replies_cursor: Optional[str] = None
+
+
+class CommentThreadPage(BaseModel):
+    threads: List[CommentThread]
+    next_cursor: Optional[str] = None
+
+
+class CommentReplyPage(BaseModel):
+    replies: List[CommentPublic]
+    next_cursor: Optional[str] = None
+
+
 class CommentList(BaseModel):
     comments: List[CommentPublic]
-    total: int
+    total: Optional[int]
+    skip: int
+    limit: int
+    has_more: bool = False
+
+
+COMMENT_FIELDS = frozenset(
+    {
+        "content",
+        "post_id",
+        "author_id",
+        "parent_id",
+        "depth",
+        "reply_count",
+        "created_at",
+        "updated_at",
+    }
+)
+COMMENT_INCLUDES = frozenset({"author"})
+
+
+class CommentSparse(BaseModel):
+    """Comment narrowed by `fields=` / `include=`; unset fields are omitted."""
+
+    id: int
+    content: Optional[str] = None
+    post_id: Optional[int] = None
+    author_id: Optional[int] = None
+    author: Optional[UserSummary] = None
+    parent_id: Optional[int] = None
+    depth: Optional[int] = None
+    reply_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class CommentSparseList(BaseModel):
+    comments: List[CommentSparse]
+    total: Optional[int]
     skip: int
     limit: int
+    has_more: bool = False
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.models.follow import FollowTarget
+from app.schemas.post import PostPublic
+
+
+class FollowCreate(BaseModel):
+    target_type: FollowTarget
+    target_id: int
+
+
+class FollowPublic(BaseModel):
+    target_type: FollowTarget
+    target_id: int
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class FeedPage(BaseModel):
+    posts: List[PostPublic]
+    next_cursor: Optional[str] = None
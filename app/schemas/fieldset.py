@@ -0,0 +1,28 @@
+from typing import Any, Optional
+from pydantic import BaseModel
+
+
+class Fieldset(BaseModel):
+    """Sparse fieldset requested through `fields=` / `include=` query params.
+
+    `fields=None` means every scalar field; `include` lists the relations to embed.
+    """
+
+    fields: Optional[frozenset[str]] = None
+    include: frozenset[str] = frozenset()
+    sparse: bool = False
+
+    def wants(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def embeds(self, relation: str) -> bool:
+        return relation in self.include
+
+    def pick(self, obj: Any, allowed_fields: frozenset[str]) -> dict[str, Any]:
+        """Collect `id` plus the requested fields and relations from an ORM object."""
+        data = {"id": obj.id}
+        for name in self.fields if self.fields is not None else allowed_fields:
+            data[name] = getattr(obj, name)
+        for relation in self.include:
+            data[relation] = getattr(obj, relation)
+        return data
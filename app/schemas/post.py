@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from pydantic import BaseModel, EmailStr, Field
 
-from app.schemas.auth import UserPublic
+from app.schemas.auth import UserPublic, UserSummary
 from app.schemas.tag import TagPublic
 from app.schemas.category import CategoryPublic
 
@@ -20,6 +20,29 @@ class PostCreate(PostBase):
     tags: Optional[List[str]] = Field(None, description="List of tag names")
 
 
+class PostImport(PostCreate):
+    """One post of POST /posts/bulk. The author is given by id or by email;
+    the category by id or by name."""
+
+    author_id: Optional[int] = None
+    author_email: Optional[EmailStr] = None
+    category: Optional[str] = Field(None, description="Category name")
+    created_at: Optional[datetime] = Field(
+        None, description="Original publication date (default: now)"
+    )
+
+
+class PostImportError(BaseModel):
+    index: int
+    error: str
+
+
+class PostImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: List[PostImportError] = Field(default_factory=list)
+
+
 class PostUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = Field(None, min_length=1)
@@ -36,6 +59,12 @@ class PostPublic(PostBase):
     author: UserPublic
     category: Optional[CategoryPublic] = None
     tags: List[TagPublic] = Field(default_factory=list)
+    views: int = 0
+    reading_time: int = 0
+    word_count: int = 0
+    excerpt: str = ""
+    # "html" only on GET /posts/{id}?format=html
+    content_format: Literal["markdown", "html"] = "markdown"
     created_at: datetime
     updated_at: datetime
 
@@ -44,6 +73,65 @@ class PostPublic(PostBase):
 
 class PostList(BaseModel):
     posts: List[PostPublic]
-    total: int
+    total: Optional[int]
+    skip: int
+    limit: int
+    has_more: bool = False
+
+
+class TrendingPostList(BaseModel):
+    posts: List[PostPublic]
+    window: str
+    next_cursor: Optional[str] = None
+
+
+POST_FIELDS = frozenset(
+    {
+        "title",
+        "description",
+        "content",
+        "images",
+        "video",
+        "category_id",
+        "author_id",
+        "views",
+        "reading_time",
+        "word_count",
+        "excerpt",
+        "created_at",
+        "updated_at",
+    }
+)
+POST_INCLUDES = frozenset({"author", "category", "tags"})
+
+
+class PostSparse(BaseModel):
+    """Post narrowed by `fields=` / `include=`; unset fields are omitted."""
+
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    content: Optional[str] = None
+    images: Optional[List[str]] = None
+    video: Optional[str] = None
+    category_id: Optional[int] = None
+    author_id: Optional[int] = None
+    author: Optional[UserSummary] = None
+    category: Optional[CategoryPublic] = None
+    tags: Optional[List[TagPublic]] = None
+    views: Optional[int] = None
+    reading_time: Optional[int] = None
+    word_count: Optional[int] = None
+    excerpt: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class PostSparseList(BaseModel):
+    posts: List[PostSparse]
+    total: Optional[int]
     skip: int
     limit: int
+    has_more: bool = False
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, Field
 
 
@@ -28,7 +29,8 @@ class TagWithStats(TagPublic):
 
 class TagList(BaseModel):
     tags: list[TagPublic]
-    total: int
+    total: Optional[int]
+    has_more: bool = False
 
 
 class PopularTag(BaseModel):
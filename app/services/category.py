@@ -1,10 +1,14 @@
 from datetime import datetime, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 from sqlalchemy import func
 
 from app.models.category import Category
 from app.models.post import Post
+from app.schemas.fieldset import Fieldset
+from app.core.config import settings
+from app.services.pagination import Page, count_cache, paginate
+from app.services.post import post_load_options
 
 
 class CategoryService:
@@ -21,6 +25,7 @@ class CategoryService:
         category = Category(name=name, description=description)
         self.db.add(category)
         self.db.commit()
+        count_cache.invalidate("categories")
         self.db.refresh(category)
         return category
 
@@ -51,6 +56,22 @@ class CategoryService:
             .all()
         )
 
+    def get_categories_page(self, skip: int = 0, limit: int = 100) -> Page:
+        """Get a page of categories and its total."""
+        query = (
+            self.db.query(Category)
+            .filter(Category.deleted_at.is_(None))
+            .order_by(Category.name)
+        )
+        return paginate(
+            query,
+            skip=skip,
+            limit=limit,
+            strategy=settings.CATEGORIES_COUNT_STRATEGY,
+            options=(lazyload(Category.posts),),
+            cache_key=("categories",),
+        )
+
     def count_categories(self) -> int:
         """Count total categories."""
         return self.db.query(Category).filter(Category.deleted_at.is_(None)).count()
@@ -98,6 +119,7 @@ class CategoryService:
 
         category.deleted_at = datetime.now(timezone.utc)
         self.db.commit()
+        count_cache.invalidate("categories")
         return True
 
     def get_categories_with_stats(self) -> List[dict]:
@@ -130,10 +152,13 @@ class CategoryService:
             for row in query.all()
         ]
 
-    def get_posts_by_category(self, category_id: int) -> List[Post]:
+    def get_posts_by_category(
+        self, category_id: int, fieldset: Optional[Fieldset] = None
+    ) -> List[Post]:
         """Get all posts in a specific category."""
         return (
             self.db.query(Post)
+            .options(*post_load_options(fieldset))
             .filter(
                 Post.category_id == category_id,
                 Post.deleted_at.is_(None),
@@ -1,47 +1,198 @@
 from datetime import datetime, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, aliased, joinedload, lazyload, load_only, noload
+from sqlalchemy import bindparam, desc, exists, select, true, tuple_, update
 
-from app.models.comment import Comment
+from app.models.comment import NEXT_COMMENT_ID, Comment
 from app.models.post import Post
+from app.models.user import User
+from app.core.config import settings
+from app.schemas.comment import (
+    COMMENT_FIELDS,
+    CommentPublic,
+    CommentReplyPage,
+    CommentThread,
+    CommentThreadPage,
+)
+from app.schemas.fieldset import Fieldset
+from app.services.live_updates import live_updates
+from app.services.pagination import (
+    Page,
+    count_cache,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+
+
+def comment_load_options(fieldset: Optional[Fieldset]) -> list:
+    """Loader options restricting a Comment query to a sparse fieldset."""
+    if fieldset is None or not fieldset.sparse:
+        return []
+
+    fields = fieldset.fields if fieldset.fields is not None else COMMENT_FIELDS
+    options = [
+        load_only(Comment.id, *(getattr(Comment, name) for name in fields)),
+        noload(Comment.post),
+    ]
+    if fieldset.embeds("author"):
+        options.append(
+            joinedload(Comment.author).options(
+                load_only(User.id, User.name, User.lastname, User.image),
+                lazyload("*"),
+            )
+        )
+    else:
+        options.append(noload(Comment.author))
+    return options
+
+
+# Built once; see the lookups in app/services/post.py
+_LIVE_COMMENT_ID = (Comment.id == bindparam("comment_id"), Comment.deleted_at.is_(None))
+# Where a comment sits in its thread and who wrote it (enough to reply to,
+# edit or delete it), without loading anything else
+_COMMENT_POSITION = (
+    select(Comment)
+    .options(
+        load_only(
+            Comment.post_id,
+            Comment.author_id,
+            Comment.parent_id,
+            Comment.thread_id,
+            Comment.path,
+            Comment.depth,
+        ),
+        lazyload("*"),
+    )
+    .where(*_LIVE_COMMENT_ID)
+    .limit(1)
+)
+
+# Thread pages serialize each comment with its author alone
+_THREAD_LOAD_OPTIONS = (
+    joinedload(Comment.author).options(lazyload("*")),
+    lazyload(Comment.post),
+)
+_COMMENT_BY_ID = (
+    select(Comment).options(*_THREAD_LOAD_OPTIONS).where(*_LIVE_COMMENT_ID).limit(1)
+)
+# A page of the subtree below a comment: the path range after `after` and
+# before the subtree's upper bound, on the (thread_id, path) index
+_SUBTREE_PAGE = (
+    select(Comment)
+    .options(*_THREAD_LOAD_OPTIONS)
+    .where(
+        Comment.thread_id == bindparam("thread_id"),
+        Comment.path > bindparam("after"),
+        Comment.path < bindparam("upper"),
+        Comment.deleted_at.is_(None),
+    )
+    .order_by(Comment.path)
+    .limit(bindparam("limit"))
+)
+# Reads a comment just written back with what serializing it needs, instead
+# of refresh() running every eager loader of its author
+_WRITTEN_COMMENT = (
+    select(Comment)
+    .options(*_THREAD_LOAD_OPTIONS)
+    .where(Comment.id == bindparam("comment_id"))
+    .execution_options(populate_existing=True)
+)
+
+
+def _first_replies(root_ids: List[int], per_thread: int):
+    """The first `per_thread` live replies of each thread, in reading order.
+
+    One LATERAL index range scan on (thread_id, path) per thread, so a long
+    thread costs no more than a short one.
+    """
+    roots = select(Comment.id).where(Comment.id.in_(root_ids)).subquery()
+    reply = aliased(Comment)
+    first = (
+        select(reply.id)
+        .where(
+            reply.thread_id == roots.c.id,
+            reply.depth > 0,
+            reply.deleted_at.is_(None),
+        )
+        .order_by(reply.path)
+        .limit(per_thread)
+        .lateral()
+    )
+    return (
+        select(Comment)
+        .options(*_THREAD_LOAD_OPTIONS)
+        .select_from(roots)
+        .join(first, true())
+        .join(Comment, Comment.id == first.c.id)
+        .order_by(Comment.thread_id, Comment.path)
+    )
 
 
 class CommentService:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_comment(self, post_id: int, author_id: int, content: str) -> Comment:
-        post = (
-            self.db.query(Post)
-            .filter(Post.id == post_id, Post.deleted_at.is_(None))
-            .first()
-        )
-        if not post:
+    def _position(self, comment_id: int) -> Optional[Comment]:
+        return self.db.scalars(_COMMENT_POSITION, {"comment_id": comment_id}).first()
+
+    def create_comment(
+        self,
+        post_id: int,
+        author_id: int,
+        content: str,
+        parent_id: Optional[int] = None,
+    ) -> Comment:
+        """Start a thread on a post, or reply to `parent_id` in one."""
+        post_exists = self.db.query(
+            exists().where(Post.id == post_id, Post.deleted_at.is_(None))
+        ).scalar()
+        if not post_exists:
             raise ValueError("Post not found or has been deleted")
 
+        parent = None
+        if parent_id is not None:
+            parent = self._position(parent_id)
+            if parent is None or parent.post_id != post_id:
+                raise ValueError("Parent comment not found")
+            if parent.depth >= settings.COMMENTS_MAX_DEPTH:
+                # Too deep to nest further: answer next to the parent
+                parent = self._position(parent.parent_id)
+
         comment = Comment(
             content=content,
             author_id=author_id,
             post_id=post_id,
         )
+        comment_id = self.db.scalar(NEXT_COMMENT_ID)
+        comment.place(comment_id, parent)
         self.db.add(comment)
+        if parent is not None:
+            self.db.execute(
+                update(Comment)
+                .where(Comment.id.in_(comment.ancestor_ids))
+                .values(reply_count=Comment.reply_count + 1)
+                .execution_options(synchronize_session=False)
+            )
         self.db.commit()
-        self.db.refresh(comment)
+        count_cache.invalidate("comments", post_id)
+        comment = self.db.scalars(_WRITTEN_COMMENT, {"comment_id": comment_id}).one()
+        live_updates.comment_created(comment)
         return comment
 
     def get_comment_by_id(self, comment_id: int) -> Optional[Comment]:
-        return (
-            self.db.query(Comment)
-            .filter(Comment.id == comment_id, Comment.deleted_at.is_(None))
-            .first()
-        )
+        return self.db.scalars(_COMMENT_BY_ID, {"comment_id": comment_id}).first()
 
     def get_comments_by_post(
-        self, post_id: int, skip: int = 0, limit: int = 10
+        self,
+        post_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        fieldset: Optional[Fieldset] = None,
     ) -> List[Comment]:
         return (
             self.db.query(Comment)
+            .options(*comment_load_options(fieldset))
             .filter(Comment.post_id == post_id, Comment.deleted_at.is_(None))
             .order_by(desc(Comment.created_at))
             .offset(skip)
@@ -49,6 +200,139 @@ class CommentService:
             .all()
         )
 
+    def get_comments_page(
+        self,
+        post_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        fieldset: Optional[Fieldset] = None,
+    ) -> Page:
+        """Get a page of a post's comments and its total."""
+        query = (
+            self.db.query(Comment)
+            .filter(Comment.post_id == post_id, Comment.deleted_at.is_(None))
+            .order_by(desc(Comment.created_at))
+        )
+        return paginate(
+            query,
+            skip=skip,
+            limit=limit,
+            strategy=settings.COMMENTS_COUNT_STRATEGY,
+            options=tuple(comment_load_options(fieldset)),
+            cache_key=("comments", post_id),
+        )
+
+    def get_threads_page(
+        self,
+        post_id: int,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        replies: int = 3,
+    ) -> CommentThreadPage:
+        """Top-level comments of a post, newest first, each with the first
+        `replies` replies of its thread; keyset-paginated.
+
+        Two queries whatever the size of the threads: one range scan of the
+        post's roots and one LATERAL scan per thread on (thread_id, path).
+        """
+        after = None
+        if cursor is not None:
+            try:
+                created_at, comment_id = decode_cursor(cursor, 2)
+                after = (datetime.fromisoformat(created_at), int(comment_id))
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+
+        query = (
+            select(Comment)
+            .options(*_THREAD_LOAD_OPTIONS)
+            .where(
+                Comment.post_id == post_id,
+                Comment.parent_id.is_(None),
+                Comment.deleted_at.is_(None),
+            )
+        )
+        if after is not None:
+            query = query.where(tuple_(Comment.created_at, Comment.id) < after)
+        roots = list(
+            self.db.scalars(
+                query.order_by(desc(Comment.created_at), desc(Comment.id)).limit(
+                    limit + 1
+                )
+            )
+        )
+        has_more = len(roots) > limit
+        roots = roots[:limit]
+
+        replies_by_thread = {root.id: [] for root in roots}
+        if roots and replies:
+            for reply in self.db.scalars(
+                _first_replies([root.id for root in roots], replies)
+            ):
+                replies_by_thread[reply.thread_id].append(reply)
+
+        threads = []
+        for root in roots:
+            shown = replies_by_thread[root.id]
+            next_replies_cursor = None
+            if root.reply_count > len(shown):
+                # /replies of the root picks up after the last reply shown
+                next_replies_cursor = encode_cursor((shown[-1] if shown else root).path)
+            threads.append(
+                CommentThread(
+                    **dict(CommentPublic.model_validate(root)),
+                    replies=[CommentPublic.model_validate(reply) for reply in shown],
+                    next_replies_cursor=next_replies_cursor,
+                )
+            )
+
+        return CommentThreadPage(
+            threads=threads,
+            next_cursor=(
+                encode_cursor(roots[-1].created_at.isoformat(), roots[-1].id)
+                if has_more
+                else None
+            ),
+        )
+
+    def get_replies_page(
+        self, comment_id: int, limit: int = 20, cursor: Optional[str] = None
+    ) -> CommentReplyPage:
+        """Replies below a comment at any depth, in reading order (each reply
+        followed by its own replies); keyset-paginated on the path."""
+        comment = self._position(comment_id)
+        if comment is None:
+            raise ValueError("Comment not found")
+
+        after = comment.path
+        if cursor is not None:
+            try:
+                (after,) = decode_cursor(cursor, 1)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+            if not isinstance(after, str):
+                raise ValueError("Invalid cursor")
+            # A cursor from elsewhere cannot reach outside this subtree
+            after = max(after, comment.path)
+
+        rows = list(
+            self.db.scalars(
+                _SUBTREE_PAGE,
+                {
+                    "thread_id": comment.thread_id,
+                    "after": after,
+                    "upper": comment.subtree_upper_bound,
+                    "limit": limit + 1,
+                },
+            )
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return CommentReplyPage(
+            replies=[CommentPublic.model_validate(row) for row in rows],
+            next_cursor=encode_cursor(rows[-1].path) if has_more else None,
+        )
+
     def count_comments_by_post(self, post_id: int) -> int:
         return (
             self.db.query(Comment)
@@ -71,7 +355,7 @@ class CommentService:
         is_admin: bool,
         content: str,
     ) -> Comment:
-        comment = self.get_comment_by_id(comment_id)
+        comment = self._position(comment_id)
         if not comment:
             raise ValueError("Comment not found")
 
@@ -80,20 +364,39 @@ class CommentService:
 
         comment.content = content
         self.db.commit()
-        self.db.refresh(comment)
-        return comment
+        return self.db.scalars(_WRITTEN_COMMENT, {"comment_id": comment_id}).one()
 
     def delete_comment(self, comment_id: int, user_id: int, is_admin: bool) -> bool:
-        """Soft delete a comment."""
-        comment = self.get_comment_by_id(comment_id)
+        """Soft delete a comment together with the replies below it."""
+        comment = self._position(comment_id)
         if not comment:
             raise ValueError("Comment not found")
 
         if not self.can_modify_comment(comment, user_id, is_admin):
             raise ValueError("Not authorized to delete this comment")
 
-        comment.deleted_at = datetime.now(timezone.utc)
+        post_id = comment.post_id
+        removed = self.db.execute(
+            update(Comment)
+            .where(
+                Comment.thread_id == comment.thread_id,
+                Comment.path >= comment.path,
+                Comment.path < comment.subtree_upper_bound,
+                Comment.deleted_at.is_(None),
+            )
+            .values(deleted_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if comment.parent_id is not None and removed:
+            self.db.execute(
+                update(Comment)
+                .where(Comment.id.in_(comment.ancestor_ids))
+                .values(reply_count=Comment.reply_count - removed)
+                .execution_options(synchronize_session=False)
+            )
         self.db.commit()
+        count_cache.invalidate("comments", post_id)
+        live_updates.comment_deleted(post_id, comment_id)
         return True
 
     def can_modify_comment(
@@ -1,19 +1,29 @@
 import httpx
 from typing import Optional, Dict, Any
 from urllib.parse import urlencode
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.user import User
 from app.models.auth_provider import AuthProvider, ProviderType
+from app.services.discord_client import DiscordUnavailableError, discord_client
 from app.services.user import UserService
 
 
+def _json_or_none(response: httpx.Response) -> Optional[Dict[str, Any]]:
+    """Body of a 200, None for a rejection; Discord failing is not a rejection."""
+    if response.status_code == 429 or response.status_code >= 500:
+        raise DiscordUnavailableError(f"Discord returned {response.status_code}")
+    if response.status_code != 200:
+        return None
+    return response.json()
+
+
 class DiscordAuthService:
     """Servicio para manejar autenticación con Discord OAuth2"""
 
-    DISCORD_API_BASE = "https://discord.com/api/v10"
-    DISCORD_OAUTH_BASE = "https://discord.com/api/oauth2"
+    DISCORD_API_VERSION = "v10"
 
     def __init__(self, db: Session):
         self.db = db
@@ -27,7 +37,7 @@ class DiscordAuthService:
             "response_type": "code",
             "scope": "identify email",
         }
-        return f"{self.DISCORD_OAUTH_BASE}/authorize?{urlencode(params)}"
+        return f"{settings.DISCORD_API_BASE_URL}/oauth2/authorize?{urlencode(params)}"
 
     async def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
         """Intercambia el código de autorización por tokens de acceso"""
@@ -41,29 +51,19 @@ class DiscordAuthService:
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.DISCORD_OAUTH_BASE}/token", data=data, headers=headers
-            )
-
-            if response.status_code != 200:
-                return None
-
-            return response.json()
+        response = await discord_client.request(
+            "POST", "/oauth2/token", data=data, headers=headers
+        )
+        return _json_or_none(response)
 
     async def get_discord_user(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Obtiene los datos del usuario de Discord"""
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.DISCORD_API_BASE}/users/@me", headers=headers
-            )
-
-            if response.status_code != 200:
-                return None
-
-            return response.json()
+        response = await discord_client.request(
+            "GET", f"/{self.DISCORD_API_VERSION}/users/@me", headers=headers
+        )
+        return _json_or_none(response)
 
     def find_user_by_discord_id(self, discord_id: str) -> Optional[User]:
         """Busca un usuario por su Discord ID"""
@@ -211,9 +211,11 @@ class DiscordAuthService:
         if avatar_hash:
             image_url = f"https://cdn.discordapp.com/avatars/{discord_user['id']}/{avatar_hash}.png"
 
-        # Usar el método unificado para crear/actualizar usuario
+        # Usar el método unificado para crear/actualizar usuario (fuera del
+        # event loop: la sesión es síncrona)
         try:
-            user, auth_provider = self.user_service.create_or_update_discord_user(
+            user, auth_provider = await run_in_threadpool(
+                self.user_service.create_or_update_discord_user,
                 name=display_name,
                 email=email,
                 image=image_url,
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import random
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth another attempt; 429 honours Retry-After instead of backoff
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Failures where the request never reached Discord, safe to retry for any method
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class DiscordUnavailableError(Exception):
+    """Discord could not be reached or kept failing after all retries."""
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds Discord asks us to wait before retrying a 429."""
+    header = response.headers.get("Retry-After")
+    if header is not None:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    try:
+        return float(response.json().get("retry_after", 1.0))
+    except (ValueError, AttributeError):
+        return 1.0
+
+
+class DiscordClient:
+    """One pooled AsyncClient shared by every Discord call of the worker.
+
+    Keep-alive connections (HTTP/2 where the server offers it) save a TCP and
+    TLS handshake per login. Every call has explicit timeouts; 429s are retried
+    after the Retry-After Discord sends, 5xx and connection failures with
+    jittered exponential backoff. Non-idempotent requests are only retried
+    when they never left the process or were rejected with a 429.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def open(self) -> None:
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=settings.DISCORD_API_BASE_URL,
+            http2=True,
+            timeout=httpx.Timeout(
+                settings.DISCORD_HTTP_TIMEOUT_SECONDS,
+                connect=settings.DISCORD_HTTP_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.DISCORD_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.DISCORD_HTTP_MAX_CONNECTIONS,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying what is safe to retry.
+
+        Returns the last response, whatever its status. Raises
+        DiscordUnavailableError when no response could be obtained.
+        """
+        self.open()
+        idempotent = method.upper() in ("GET", "HEAD", "OPTIONS")
+        attempt = 0
+        while True:
+            last = attempt >= settings.DISCORD_HTTP_MAX_RETRIES
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if last or not (idempotent or isinstance(e, _NOT_SENT)):
+                    raise DiscordUnavailableError(str(e) or type(e).__name__) from e
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "Discord %s %s failed (%r), retrying in %.2fs",
+                    method,
+                    url,
+                    e,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code not in _RETRY_STATUSES or last:
+                return response
+            if response.status_code == 429:
+                delay = _retry_after(response)
+                if delay > settings.DISCORD_HTTP_MAX_RETRY_AFTER_SECONDS:
+                    # Waiting that long would hold the login request hostage
+                    return response
+            elif idempotent:
+                delay = self._backoff(attempt)
+            else:
+                return response
+            logger.warning(
+                "Discord %s %s returned %d, retrying in %.2fs",
+                method,
+                url,
+                response.status_code,
+                delay,
+            )
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # Full jitter: spread out the retries of concurrent logins
+        base = settings.DISCORD_HTTP_RETRY_BACKOFF_SECONDS
+        return random.uniform(0, base * 2**attempt)
+
+
+# Opened and closed by the app lifespan; opened lazily elsewhere
+discord_client = DiscordClient()
@@ -0,0 +1,201 @@
+import csv
+import enum
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import ARRAY, DateTime, Enum as SQLEnum, Select, func, select
+
+from app.core.config import settings
+from app.db import engine, replicas
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.post import Post
+from app.models.tag import Tag, post_tags
+from app.models.user import User
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@dataclass(frozen=True)
+class _Resource:
+    columns: tuple
+    order_by: tuple
+    owner: Any  # column matched by the author_id filter
+    created_at: Any = None  # None: no date filters
+    deleted_at: Any = None
+
+
+def _post_columns(include_content: bool) -> tuple:
+    tags = (
+        select(func.array_agg(Tag.name))
+        .join(post_tags, post_tags.c.tag_id == Tag.id)
+        .where(post_tags.c.post_id == Post.id)
+        .scalar_subquery()
+    )
+    columns = (
+        Post.id,
+        Post.title,
+        Post.author_id,
+        Post.category_id,
+        tags.label("tags"),
+        Post.reading_time,
+        Post.word_count,
+        Post.views,
+        Post.excerpt,
+    )
+    if include_content:
+        columns += (Post.content,)
+    return columns + (Post.created_at, Post.updated_at, Post.deleted_at)
+
+
+def _resource(name: str, include_content: bool) -> _Resource:
+    if name == "posts":
+        return _Resource(
+            columns=_post_columns(include_content),
+            order_by=(Post.id,),
+            owner=Post.author_id,
+            created_at=Post.created_at,
+            deleted_at=Post.deleted_at,
+        )
+    if name == "comments":
+        return _Resource(
+            columns=(
+                Comment.id,
+                Comment.post_id,
+                Comment.author_id,
+                Comment.parent_id,
+                Comment.content,
+                Comment.created_at,
+                Comment.updated_at,
+                Comment.deleted_at,
+            ),
+            order_by=(Comment.id,),
+            owner=Comment.author_id,
+            created_at=Comment.created_at,
+            deleted_at=Comment.deleted_at,
+        )
+    if name == "likes":
+        return _Resource(
+            columns=(Like.user_id, Like.post_id),
+            order_by=(Like.user_id, Like.post_id),
+            owner=Like.user_id,
+        )
+    # Credentials never leave the database
+    return _Resource(
+        columns=(
+            User.id,
+            User.name,
+            User.lastname,
+            User.email,
+            User.role,
+            User.position,
+            User.stack,
+            User.follower_count,
+            User.created_at,
+            User.updated_at,
+            User.deleted_at,
+        ),
+        order_by=(User.id,),
+        owner=User.id,
+        created_at=User.created_at,
+        deleted_at=User.deleted_at,
+    )
+
+
+def build_export_query(
+    resource: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    author_id: Optional[int] = None,
+    include_deleted: bool = False,
+    include_content: bool = False,
+) -> Select:
+    """Validated query for one export. Raises ValueError for bad filters, so
+    errors surface before the response starts streaming."""
+    spec = _resource(resource, include_content)
+    query = select(*spec.columns).order_by(*spec.order_by)
+    if since is not None or until is not None:
+        if spec.created_at is None:
+            raise ValueError("Date filters are not supported for this export")
+        if since is not None and until is not None and since >= until:
+            raise ValueError("'since' must be earlier than 'until'")
+        if since is not None:
+            query = query.where(spec.created_at >= since)
+        if until is not None:
+            query = query.where(spec.created_at < until)
+    if author_id is not None:
+        query = query.where(spec.owner == author_id)
+    if spec.deleted_at is not None and not include_deleted:
+        query = query.where(spec.deleted_at.is_(None))
+    return query
+
+
+def _json_default(value: Any) -> Any:
+    # Only called for what json cannot encode natively
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, default=_json_default).encode
+
+
+def _csv_converter(column) -> Optional[Callable[[Any], Any]]:
+    """Per-column conversion for CSV cells, None when str() already fits."""
+    if isinstance(column.type, DateTime):
+        return datetime.isoformat
+    if isinstance(column.type, SQLEnum):
+        return attrgetter("value")
+    if isinstance(column.type, ARRAY):
+        return lambda items: "|".join(str(item) for item in items)
+    return None
+
+
+def stream_export(query: Select, fmt: str) -> Iterator[bytes]:
+    """Rows of `query` as NDJSON or CSV, read through a server-side cursor.
+
+    Opens its own connection (a replica when one is healthy) for as long as
+    the response streams, and keeps at most one `EXPORT_YIELD_PER` batch of
+    rows in memory.
+    """
+    bind = replicas.pick() or engine
+    with bind.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=settings.EXPORT_YIELD_PER
+        ).execute(query)
+        keys = list(result.keys())
+
+        if fmt == "ndjson":
+            for rows in result.partitions():
+                yield "".join(
+                    _encode_json(dict(zip(keys, row))) + "\n" for row in rows
+                ).encode()
+            return
+
+        converters = [
+            (index, convert)
+            for index, column in enumerate(query.selected_columns)
+            if (convert := _csv_converter(column)) is not None
+        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(keys)
+        for rows in result.partitions():
+            for row in rows:
+                if converters:
+                    row = list(row)
+                    for index, convert in converters:
+                        if row[index] is not None:
+                            row[index] = convert(row[index])
+                writer.writerow(row)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
@@ -0,0 +1,352 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    delete,
+    desc,
+    exists,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.jobs import enqueue
+from app.models.category import Category
+from app.models.feed_entry import FeedEntry
+from app.models.follow import Follow, FollowTarget
+from app.models.post import Post
+from app.models.tag import Tag, post_tags
+from app.models.user import User
+from app.schemas.feed import FeedPage
+from app.schemas.post import PostPublic
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.post import post_loader
+
+
+def _is_fan_in_author(follower_count) -> bool:
+    return follower_count > settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+def _post_matches_follow(post, follow):
+    """SQL condition: `post` belongs to the tag / category / author of `follow`."""
+    return or_(
+        and_(
+            follow.target_type == FollowTarget.AUTHOR,
+            follow.target_id == post.author_id,
+        ),
+        and_(
+            follow.target_type == FollowTarget.CATEGORY,
+            follow.target_id == post.category_id,
+        ),
+        and_(
+            follow.target_type == FollowTarget.TAG,
+            follow.target_id.in_(
+                select(post_tags.c.tag_id).where(post_tags.c.post_id == post.id)
+            ),
+        ),
+    )
+
+
+def _source_posts(target_type: FollowTarget, target_id: int):
+    """Live posts of one followed source."""
+    query = select(Post.id, Post.created_at).where(Post.deleted_at.is_(None))
+    if target_type is FollowTarget.AUTHOR:
+        return query.where(Post.author_id == target_id)
+    if target_type is FollowTarget.CATEGORY:
+        return query.where(Post.category_id == target_id)
+    return query.where(
+        Post.id.in_(select(post_tags.c.post_id).where(post_tags.c.tag_id == target_id))
+    )
+
+
+# What fan-out needs of a live post; loading the Post entity would run the
+# eager loaders behind its author, comments and likes
+_POST_SOURCES = select(
+    Post.id, Post.author_id, Post.category_id, Post.created_at
+).where(Post.id == bindparam("post_id"), Post.deleted_at.is_(None))
+
+
+def fan_out_post(db: Session, post_id: int) -> int:
+    """Write a new post into the feeds of everyone following its sources.
+
+    Followers of a fan-in author are skipped: they pull that author's posts
+    when reading. Returns the number of feed entries created.
+    """
+    post = db.execute(_POST_SOURCES, {"post_id": post_id}).first()
+    if post is None:
+        return 0
+
+    def followers(target_type: FollowTarget, target_ids):
+        return select(Follow.user_id).where(
+            Follow.target_type == target_type, Follow.target_id.in_(target_ids)
+        )
+
+    sources = [
+        followers(
+            FollowTarget.TAG,
+            select(post_tags.c.tag_id).where(post_tags.c.post_id == post_id),
+        )
+    ]
+    if post.category_id is not None:
+        sources.append(followers(FollowTarget.CATEGORY, [post.category_id]))
+    author_followers = db.execute(
+        select(User.follower_count).where(User.id == post.author_id)
+    ).scalar()
+    if not _is_fan_in_author(author_followers or 0):
+        sources.append(followers(FollowTarget.AUTHOR, [post.author_id]))
+
+    recipients = union(*sources).subquery()
+    stmt = (
+        insert(FeedEntry)
+        .from_select(
+            ["user_id", "post_id", "published_at"],
+            select(recipients.c.user_id, literal(post.id), literal(post.created_at)),
+        )
+        .on_conflict_do_nothing()
+    )
+    created = db.execute(stmt).rowcount
+    db.commit()
+    return created
+
+
+def refan_post(db: Session, post_id: int) -> int:
+    """Bring a post's feed entries in line with its current tags and category.
+
+    Drops the entries no follow of their owner explains any more, then fans
+    the post out again to followers of its new sources. Returns the number of
+    entries removed plus created.
+    """
+    if db.execute(_POST_SOURCES, {"post_id": post_id}).first() is None:
+        return 0
+    still_followed = exists().where(
+        Follow.user_id == FeedEntry.user_id,
+        Post.id == post_id,
+        _post_matches_follow(Post, Follow),
+    )
+    removed = db.execute(
+        delete(FeedEntry).where(FeedEntry.post_id == post_id, ~still_followed)
+    ).rowcount
+    return removed + fan_out_post(db, post_id)
+
+
+def backfill_author(db: Session, author_id: int) -> int:
+    """Write an author's latest posts into the feeds of all their followers.
+
+    For an author back under FEED_FANOUT_MAX_FOLLOWERS: what they published
+    as a fan-in author was pulled at read time and never stored, and would
+    otherwise drop out of those feeds. Like a new follow, only the latest
+    FEED_BACKFILL_POSTS are copied. Returns the number of entries created.
+    """
+    follower_count = db.execute(
+        select(User.follower_count).where(User.id == author_id)
+    ).scalar()
+    if follower_count is None or _is_fan_in_author(follower_count):
+        return 0
+    latest = (
+        _source_posts(FollowTarget.AUTHOR, author_id)
+        .order_by(desc(Post.created_at))
+        .limit(settings.FEED_BACKFILL_POSTS)
+        .subquery()
+    )
+    followers = (
+        select(Follow.user_id)
+        .where(Follow.target_type == FollowTarget.AUTHOR, Follow.target_id == author_id)
+        .subquery()
+    )
+    created = db.execute(
+        insert(FeedEntry)
+        .from_select(
+            ["user_id", "post_id", "published_at"],
+            select(followers.c.user_id, latest.c.id, latest.c.created_at).select_from(
+                followers.join(latest, true())
+            ),
+        )
+        .on_conflict_do_nothing()
+    ).rowcount
+    db.commit()
+    return created
+
+
+class FeedService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _target_exists(self, target_type: FollowTarget, target_id: int) -> bool:
+        model = {
+            FollowTarget.TAG: Tag,
+            FollowTarget.CATEGORY: Category,
+            FollowTarget.AUTHOR: User,
+        }[target_type]
+        return self.db.query(
+            exists().where(model.id == target_id, model.deleted_at.is_(None))
+        ).scalar()
+
+    def _bump_follower_count(self, author_id: int, delta: int) -> int:
+        """Add `delta` to an author's follower count; returns the new count."""
+        users = User.__table__
+        return self.db.execute(
+            update(users)
+            .where(users.c.id == author_id)
+            # A new follower is not a profile edit
+            .values(
+                follower_count=users.c.follower_count + delta,
+                updated_at=users.c.updated_at,
+            )
+            .returning(users.c.follower_count)
+        ).scalar_one()
+
+    def get_follows(self, user_id: int) -> List[Follow]:
+        return (
+            self.db.query(Follow)
+            .filter(Follow.user_id == user_id)
+            .order_by(desc(Follow.created_at))
+            .all()
+        )
+
+    def follow(self, user_id: int, target_type: FollowTarget, target_id: int) -> Follow:
+        """Follow a source and backfill its latest posts into the user's feed."""
+        if target_type is FollowTarget.AUTHOR and target_id == user_id:
+            raise ValueError("Cannot follow yourself")
+        if not self._target_exists(target_type, target_id):
+            raise ValueError(f"{target_type.value.capitalize()} not found")
+        if self.db.get(Follow, (user_id, target_type, target_id)) is not None:
+            raise ValueError("Already following")
+
+        follow = Follow(user_id=user_id, target_type=target_type, target_id=target_id)
+        self.db.add(follow)
+        fan_in = False
+        if target_type is FollowTarget.AUTHOR:
+            fan_in = _is_fan_in_author(self._bump_follower_count(target_id, 1))
+
+        if not fan_in and settings.FEED_BACKFILL_POSTS > 0:
+            latest = (
+                _source_posts(target_type, target_id)
+                .order_by(desc(Post.created_at))
+                .limit(settings.FEED_BACKFILL_POSTS)
+                .subquery()
+            )
+            self.db.execute(
+                insert(FeedEntry)
+                .from_select(
+                    ["user_id", "post_id", "published_at"],
+                    select(literal(user_id), latest.c.id, latest.c.created_at),
+                )
+                .on_conflict_do_nothing()
+            )
+        self.db.commit()
+        self.db.refresh(follow)
+        return follow
+
+    def unfollow(self, user_id: int, target_type: FollowTarget, target_id: int) -> bool:
+        """Stop following a source and drop the posts no other follow explains."""
+        follow = self.db.get(Follow, (user_id, target_type, target_id))
+        if follow is None:
+            return False
+
+        self.db.delete(follow)
+        self.db.flush()
+        if target_type is FollowTarget.AUTHOR:
+            follower_count = self._bump_follower_count(target_id, -1)
+            if follower_count == settings.FEED_FANOUT_MAX_FOLLOWERS:
+                # Just left fan-in: followers keep the posts they were pulling
+                enqueue(self.db, "feed.backfill_author", {"author_id": target_id})
+
+        source = _source_posts(target_type, target_id).subquery()
+        still_followed = exists().where(
+            Follow.user_id == user_id, _post_matches_follow(Post, Follow)
+        )
+        self.db.execute(
+            delete(FeedEntry).where(
+                FeedEntry.user_id == user_id,
+                FeedEntry.post_id.in_(select(source.c.id)),
+                ~select(Post.id)
+                .where(Post.id == FeedEntry.post_id, still_followed)
+                .exists(),
+            )
+        )
+        self.db.commit()
+        return True
+
+    def _fan_in_authors(self, user_id: int) -> List[int]:
+        return list(
+            self.db.execute(
+                select(Follow.target_id)
+                .join(User, User.id == Follow.target_id)
+                .where(
+                    Follow.user_id == user_id,
+                    Follow.target_type == FollowTarget.AUTHOR,
+                    User.follower_count > settings.FEED_FANOUT_MAX_FOLLOWERS,
+                )
+            ).scalars()
+        )
+
+    def get_feed_page(
+        self, user_id: int, limit: int, cursor: Optional[str] = None
+    ) -> FeedPage:
+        """Newest posts from the user's follows, keyset-paginated.
+
+        Materialized entries come from one index range scan; posts of fan-in
+        authors are read from `posts` and merged in.
+        """
+        after = None
+        if cursor is not None:
+            try:
+                published_at, post_id = decode_cursor(cursor, 2)
+                after = (datetime.fromisoformat(published_at), int(post_id))
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+
+        entries = select(FeedEntry.post_id, FeedEntry.published_at).where(
+            FeedEntry.user_id == user_id
+        )
+        if after is not None:
+            entries = entries.where(
+                tuple_(FeedEntry.published_at, FeedEntry.post_id) < after
+            )
+        rows = self.db.execute(
+            entries.order_by(
+                desc(FeedEntry.published_at), desc(FeedEntry.post_id)
+            ).limit(limit + 1)
+        ).all()
+
+        fan_in_authors = self._fan_in_authors(user_id)
+        if fan_in_authors:
+            pulled = select(Post.id, Post.created_at).where(
+                Post.author_id.in_(fan_in_authors), Post.deleted_at.is_(None)
+            )
+            if after is not None:
+                pulled = pulled.where(tuple_(Post.created_at, Post.id) < after)
+            rows += self.db.execute(
+                pulled.order_by(desc(Post.created_at), desc(Post.id)).limit(limit + 1)
+            ).all()
+
+        merged = sorted(
+            {post_id: published_at for post_id, published_at in rows}.items(),
+            key=lambda item: (item[1], item[0]),
+            reverse=True,
+        )
+        has_more = len(merged) > limit
+        merged = merged[:limit]
+
+        posts = post_loader(self.db).load_many(post_id for post_id, _ in merged)
+
+        last_id, last_published_at = merged[-1] if merged else (None, None)
+        return FeedPage(
+            posts=[
+                PostPublic.model_validate(post) for post in posts if post is not None
+            ],
+            next_cursor=(
+                encode_cursor(last_published_at.isoformat(), last_id)
+                if has_more
+                else None
+            ),
+        )
@@ -1,25 +1,76 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, Boolean
+from sqlalchemy.orm import Session, joinedload, lazyload
+from sqlalchemy import Boolean, bindparam, delete, exists, func, select, tuple_
+from sqlalchemy.dialects import postgresql
 
+from app.core.config import settings
 from app.models.like import Like
 from app.models.post import Post
+from app.services.like_buffer import like_buffer
+from app.services.live_updates import live_updates
+from app.services.loader import Loader, loader_for
+
+# Built once; see the lookups in app/services/post.py
+_LIVE_POST_EXISTS = select(
+    exists().where(Post.id == bindparam("post_id"), Post.deleted_at.is_(None))
+)
+_LIKE_MATCHES = (
+    Like.user_id == bindparam("user_id"),
+    Like.post_id == bindparam("post_id"),
+)
+_LIKE_EXISTS = select(exists().where(*_LIKE_MATCHES))
+# Toggles write without reading first and each statement reports whether it
+# changed anything, so two at once cannot both insert or both delete. Toggles
+# of one (user, post) also take a transaction-scoped advisory lock (the
+# two-key space, apart from trending's single key) so they flip in turn
+_LOCK_LIKE = select(
+    func.pg_advisory_xact_lock(bindparam("user_id"), bindparam("post_id"))
+)
+_DELETE_LIKE = (
+    delete(Like)
+    .where(*_LIKE_MATCHES)
+    .returning(Like.post_id)
+    .execution_options(synchronize_session=False)
+)
+_INSERT_LIKE = (
+    postgresql.insert(Like)
+    .values(user_id=bindparam("user_id"), post_id=bindparam("post_id"))
+    .on_conflict_do_nothing()
+    .returning(Like.post_id)
+)
+# LikePublic embeds the user alone: skip the selectin chains behind it
+_LIKES_BY_KEYS = (
+    select(Like)
+    .options(joinedload(Like.user).options(lazyload("*")), lazyload(Like.post))
+    .where(tuple_(Like.user_id, Like.post_id).in_(bindparam("keys", expanding=True)))
+)
+
+
+def _fetch_likes(db: Session, keys: List[tuple]) -> dict:
+    return {
+        (like.user_id, like.post_id): like
+        for like in db.scalars(_LIKES_BY_KEYS, {"keys": keys})
+    }
+
+
+def like_loader(db: Session) -> Loader[tuple, Like]:
+    """Likes by (user_id, post_id), shared by the request."""
+    return loader_for(db, _fetch_likes)
 
 
 class LikeService:
     def __init__(self, db: Session):
         self.db = db
 
+    def _ensure_post_exists(self, post_id: int) -> None:
+        if not self.db.scalar(_LIVE_POST_EXISTS, {"post_id": post_id}):
+            raise ValueError("Post not found or has been deleted")
+
     def create_like(self, user_id: int, post_id: int) -> Like:
         """Create a like for a post. Validates post exists and prevents duplicates."""
-        post = (
-            self.db.query(Post)
-            .filter(Post.id == post_id, Post.deleted_at.is_(None))
-            .first()
-        )
-        if not post:
-            raise ValueError("Post not found or has been deleted")
+        self._ensure_post_exists(post_id)
 
+        like_buffer.settle(user_id, post_id)
         existing_like = self.get_like(user_id, post_id)
         if existing_like:
             raise ValueError("User has already liked this post")
@@ -27,34 +78,55 @@ class LikeService:
         like = Like(user_id=user_id, post_id=post_id)
         self.db.add(like)
         self.db.commit()
-        self.db.refresh(like)
-        return like
+        live_updates.likes_changed((post_id,))
+        # The commit emptied the loader: this reads the row back with its user
+        # alone, where refresh() would run every eager loader behind it
+        return self.get_like(user_id, post_id)
 
     def remove_like(self, user_id: int, post_id: int) -> bool:
         """Remove a like. Returns True if like was removed, False if it didn't exist."""
+        like_buffer.settle(user_id, post_id)
         like = self.get_like(user_id, post_id)
         if not like:
             return False
 
         self.db.delete(like)
         self.db.commit()
+        live_updates.likes_changed((post_id,))
         return True
 
     def get_like(self, user_id: int, post_id: int) -> Optional[Like]:
         """Get a specific like by user_id and post_id."""
-        return (
-            self.db.query(Like)
-            .filter(and_(Like.user_id == user_id, Like.post_id == post_id))
-            .first()
-        )
+        return like_loader(self.db).load((user_id, post_id))
+
+    def _stored_like_exists(self, user_id: int, post_id: int) -> bool:
+        return self.db.scalar(_LIKE_EXISTS, {"user_id": user_id, "post_id": post_id})
 
     def has_user_liked_post(self, user_id: int, post_id: int) -> bool:
-        """Check if a user has liked a specific post."""
-        return self.get_like(user_id, post_id) is not None
+        """Check if a user has liked a specific post, including unflushed toggles."""
+        pending = like_buffer.pending_state(user_id, post_id)
+        if pending is not None:
+            return pending
+        return self._stored_like_exists(user_id, post_id)
+
+    def get_post_likes_count(self, post_id: int, user_id: Optional[int] = None) -> int:
+        """Get the total number of likes for a post.
 
-    def get_post_likes_count(self, post_id: int) -> int:
-        """Get the total number of likes for a post."""
-        return self.db.query(Like).filter(Like.post_id == post_id).count()
+        With `user_id`, that user's unflushed toggle is reflected in the count
+        so they read back their own like; other users' show up after a flush.
+        """
+        count = (
+            self.db.query(func.count())
+            .select_from(Like)
+            .filter(Like.post_id == post_id)
+            .scalar()
+        )
+        pending = like_buffer.pending_state(user_id, post_id) if user_id else None
+        if pending is not None and pending != self._stored_like_exists(
+            user_id, post_id
+        ):
+            count += 1 if pending else -1
+        return count
 
     def get_post_likes(self, post_id: int) -> List[Like]:
         """Get all likes for a specific post."""
@@ -70,19 +142,30 @@ class LikeService:
         Returns (is_liked, like_object) where:
         - is_liked: True if like was added, False if removed
         - like_object: Like instance if added, None if removed
-        """
-        existing_like = self.get_like(user_id, post_id)
 
-        if existing_like:
-            self.db.delete(existing_like)
-            self.db.commit()
-            return False, None
-        else:
-            try:
-                like = self.create_like(user_id, post_id)
-                return True, like
-            except ValueError:
-                raise
+        With LIKES_WRITE_BEHIND the new state is only recorded in the like
+        buffer, so like_object is always None.
+        """
+        if settings.LIKES_WRITE_BEHIND:
+            self._ensure_post_exists(post_id)
+            stored = self._stored_like_exists(user_id, post_id)
+            return like_buffer.toggle(user_id, post_id, stored), None
+
+        like_buffer.settle(user_id, post_id)
+        params = {"user_id": user_id, "post_id": post_id}
+        self.db.execute(_LOCK_LIKE, params)
+        if self.db.execute(_DELETE_LIKE, params).first() is None:
+            self._ensure_post_exists(post_id)
+            if self.db.execute(_INSERT_LIKE, params).first() is not None:
+                self.db.commit()
+                live_updates.likes_changed((post_id,))
+                return True, self.get_like(user_id, post_id)
+            # A concurrent POST /likes/ (which does not take the lock) liked
+            # the post after our DELETE ran: this toggle takes it back
+            self.db.execute(_DELETE_LIKE, params)
+        self.db.commit()
+        live_updates.likes_changed((post_id,))
+        return False, None
 
     def get_posts_with_like_stats(self, user_id: Optional[int] = None) -> List[dict]:
         """Get posts with like statistics and user's like status."""
@@ -0,0 +1,184 @@
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import delete, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.background import PeriodicTask
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.like import Like
+from app.services.live_updates import live_updates
+
+logger = logging.getLogger(__name__)
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class LikeBuffer:
+    """Write-behind buffer for like/unlike intents.
+
+    Intents are coalesced per (user_id, post_id): only the last one survives
+    until the next flush, which applies every pending intent in a single
+    transaction with multi-row INSERT ... ON CONFLICT DO NOTHING / DELETE
+    statements instead of one transaction per click.
+
+    If the batch fails, its intents are retried one at a time: an intent the
+    database rejects on its own (say, for a post or user deleted since) is
+    dropped and logged, so it cannot hold back every other like in the buffer.
+
+    Guarantees: the buffer lives in the worker process, so intents received
+    during the last flush interval are lost if the process dies without a
+    clean shutdown. Per key the final state is the last intent this process
+    saw; there is no ordering across keys, nor across workers.
+    """
+
+    def __init__(self):
+        self._pending: dict[tuple[int, int], bool] = {}
+        # Batch being written: still the answer for reads until it commits
+        self._inflight: dict[tuple[int, int], bool] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task = PeriodicTask("like-buffer-flusher", self.flush)
+        self.flushes = 0
+        self.flushed_intents = 0
+        self.failures = 0
+        self.dropped = 0
+        self.last_flush_ms = 0.0
+
+    def record(self, user_id: int, post_id: int, liked: bool) -> None:
+        with self._lock:
+            self._pending[(user_id, post_id)] = liked
+
+    def toggle(self, user_id: int, post_id: int, stored: bool) -> bool:
+        """Flip the pair's state and return the new one. The pending intent,
+        or `stored` (the database state) if there is none, is read and
+        flipped under the lock, so concurrent toggles never both see the same
+        state."""
+        key = (user_id, post_id)
+        with self._lock:
+            current = self._pending.get(key, self._inflight.get(key, stored))
+            self._pending[key] = not current
+            return not current
+
+    def pending_state(self, user_id: int, post_id: int) -> Optional[bool]:
+        """Unflushed intent for this pair, or None if the database is current."""
+        key = (user_id, post_id)
+        with self._lock:
+            return self._pending.get(key, self._inflight.get(key))
+
+    def settle(self, user_id: int, post_id: int) -> None:
+        """Flush now if this pair has an unflushed intent, so the database is current."""
+        if self.pending_state(user_id, post_id) is not None:
+            self.flush()
+
+    def _take(self) -> dict[tuple[int, int], bool]:
+        with self._lock:
+            self._inflight, self._pending = self._pending, {}
+            return dict(self._inflight)
+
+    def _requeue(self, batch: dict[tuple[int, int], bool]) -> None:
+        # Intents recorded while the failed flush ran are newer; keep those
+        with self._lock:
+            for key, liked in batch.items():
+                self._pending.setdefault(key, liked)
+
+    def _apply(self, db: Session, batch: dict[tuple[int, int], bool]) -> None:
+        insert = _INSERTS[db.get_bind().dialect.name]
+        likes = [{"user_id": u, "post_id": p} for (u, p), on in batch.items() if on]
+        unlikes = [key for key, on in batch.items() if not on]
+        size = settings.LIKES_FLUSH_BATCH_SIZE
+
+        for start in range(0, len(likes), size):
+            stmt = insert(Like).values(likes[start : start + size])
+            db.execute(stmt.on_conflict_do_nothing())
+        for start in range(0, len(unlikes), size):
+            pairs = unlikes[start : start + size]
+            db.execute(
+                delete(Like).where(tuple_(Like.user_id, Like.post_id).in_(pairs))
+            )
+        db.commit()
+
+    def _apply_each(
+        self, db: Session, batch: dict[tuple[int, int], bool]
+    ) -> dict[tuple[int, int], bool]:
+        """Apply a failed batch one intent per transaction. Returns the ones
+        written; the rest are dropped if the database rejects them, or
+        re-queued if it fails for any other reason (it is probably down)."""
+        applied = {}
+        items = list(batch.items())
+        for i, (key, liked) in enumerate(items):
+            try:
+                self._apply(db, {key: liked})
+            except (IntegrityError, DataError) as exc:
+                db.rollback()
+                self.dropped += 1
+                logger.warning(
+                    "Dropped %s intent for user %s on post %s: %s",
+                    "like" if liked else "unlike",
+                    *key,
+                    exc.orig,
+                )
+            except Exception:
+                db.rollback()
+                self._requeue(dict(items[i:]))
+                logger.exception("Like buffer flush failed, intents re-queued")
+                break
+            else:
+                applied[key] = liked
+        return applied
+
+    def flush(self) -> int:
+        """Write every pending intent to the database. Returns how many."""
+        with self._flush_lock:
+            batch = self._take()
+            if not batch:
+                return 0
+            start = time.perf_counter()
+            db = SessionLocal()
+            try:
+                self._apply(db, batch)
+            except Exception:
+                db.rollback()
+                self.failures += 1
+                logger.exception("Like buffer flush failed, retrying one by one")
+                batch = self._apply_each(db, batch)
+            finally:
+                db.close()
+                with self._lock:
+                    self._inflight = {}
+            if not batch:
+                return 0
+            live_updates.likes_changed({post_id for _, post_id in batch})
+            self.flushes += 1
+            self.flushed_intents += len(batch)
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 3)
+            return len(batch)
+
+    def start(self) -> None:
+        self._task.start(settings.LIKES_FLUSH_INTERVAL_MS / 1000)
+
+    def stop(self) -> None:
+        """Stop the flusher and write out whatever is still pending."""
+        self._task.stop()
+        self.flush()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "enabled": settings.LIKES_WRITE_BEHIND,
+            "pending": pending,
+            "flushes": self.flushes,
+            "flushed_intents": self.flushed_intents,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+like_buffer = LikeBuffer()
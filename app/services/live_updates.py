@@ -0,0 +1,363 @@
+import asyncio
+import json
+import logging
+import selectors
+import threading
+import time
+from typing import Any, AsyncIterator, Iterable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import joinedload, lazyload
+
+from app.core.background import PeriodicTask
+from app.core.config import settings
+from app.db import SessionLocal, engine
+from app.models.comment import Comment
+from app.models.like import Like
+from app.schemas.comment import CommentPublic
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel shared by every worker when LIVE_UPDATES_NOTIFY is on
+NOTIFY_CHANNEL = "live_updates"
+
+_LIKE_COUNTS = (
+    select(Like.post_id, func.count())
+    .where(Like.post_id.in_(bindparam("post_ids", expanding=True)))
+    .group_by(Like.post_id)
+)
+_NOTIFY = select(func.pg_notify(NOTIFY_CHANNEL, bindparam("payload")))
+# A comment as streams send it: CommentPublic embeds the author alone
+_LIVE_COMMENT = (
+    select(Comment)
+    .options(joinedload(Comment.author).options(lazyload("*")), lazyload(Comment.post))
+    .where(Comment.id == bindparam("comment_id"), Comment.deleted_at.is_(None))
+)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """One open stream: the posts it follows and the events not sent yet.
+
+    Lives on the event loop; a None in the queue ends the stream.
+    """
+
+    def __init__(self, post_ids: frozenset[int]):
+        self.post_ids = post_ids
+        self.queue: asyncio.Queue[Optional[str]] = asyncio.Queue(
+            settings.LIVE_UPDATES_QUEUE_SIZE
+        )
+        self.ended = False
+
+    def push(self, message: Optional[str]) -> bool:
+        """Queue a message; False when the client is too far behind, in which
+        case its backlog is dropped and the stream ends (it reconnects and
+        gets a fresh snapshot)."""
+        if self.ended:
+            return True
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            self.ended = True
+            return False
+        self.ended = message is None
+        return True
+
+
+class LiveUpdates:
+    """Pushes like counts and new comments to clients following those posts.
+
+    Writers call `likes_changed`, `comment_created` and `comment_deleted`
+    after committing, from any thread. Like changes are only marked: every
+    LIVE_UPDATES_LIKES_INTERVAL_MS one GROUP BY reads the counts of the posts
+    marked since, so a burst of likes becomes one update per post. Each
+    event is encoded once and handed to every stream of its post on the
+    event loop.
+
+    With LIVE_UPDATES_NOTIFY events go through Postgres NOTIFY instead and
+    every worker (this one included) delivers them from its LISTEN
+    connection, so a client sees writes made by any worker. Comments travel
+    by id there and each worker reads them once, keeping payloads well
+    under the 8000 byte NOTIFY limit.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._streams: dict[int, set[Subscription]] = {}
+        self._connections = 0
+        self._changed_likes: set[int] = set()
+        self._lock = threading.Lock()
+        self._likes_task = PeriodicTask("live-likes-publisher", self.publish_likes)
+        self._listener: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.listening = False
+        self.published = 0
+        self.delivered = 0
+        self.dropped_streams = 0
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    @property
+    def full(self) -> bool:
+        return self._connections >= settings.LIVE_UPDATES_MAX_CONNECTIONS
+
+    def start(self) -> None:
+        """Start publishing; call from the event loop the streams run on."""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stop.clear()
+        self._likes_task.start(settings.LIVE_UPDATES_LIKES_INTERVAL_MS / 1000)
+        if settings.LIVE_UPDATES_NOTIFY:
+            self._listener = threading.Thread(
+                target=self._listen, name="live-updates-listener", daemon=True
+            )
+            self._listener.start()
+
+    def stop(self) -> None:
+        """Stop publishing and end every open stream."""
+        if self._loop is None:
+            return
+        self._likes_task.stop()
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join()
+            self._listener = None
+        with self._lock:
+            streams = {sub for subs in self._streams.values() for sub in subs}
+        for sub in streams:
+            sub.push(None)
+        self._loop = None
+
+    # Streams (event loop)
+
+    def _subscribe(self, post_ids: frozenset[int]) -> Subscription:
+        sub = Subscription(post_ids)
+        with self._lock:
+            self._connections += 1
+            for post_id in post_ids:
+                self._streams.setdefault(post_id, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._connections -= 1
+            for post_id in sub.post_ids:
+                subs = self._streams.get(post_id)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._streams[post_id]
+
+    async def stream(self, post_ids: Iterable[int]) -> AsyncIterator[str]:
+        """Server-sent events for `post_ids`: the current like counts first,
+        then every update until the client leaves or the stream times out."""
+        sub = self._subscribe(frozenset(post_ids))
+        try:
+            yield f"retry: {settings.LIVE_UPDATES_RETRY_MS}\n\n"
+            # Subscribed before reading, so no update falls between the two
+            counts = await run_in_threadpool(self.like_counts, sub.post_ids)
+            for post_id in sorted(sub.post_ids):
+                yield _sse(
+                    "likes", {"post_id": post_id, "likes_count": counts[post_id]}
+                )
+
+            # Streams end after a while so clients spread over workers again
+            # and a shutting down worker is not held open by its streams
+            deadline = time.monotonic() + settings.LIVE_UPDATES_STREAM_SECONDS
+            while (remaining := deadline - time.monotonic()) > 0:
+                timeout = min(remaining, settings.LIVE_UPDATES_HEARTBEAT_SECONDS)
+                try:
+                    message = await asyncio.wait_for(sub.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self._unsubscribe(sub)
+
+    def _deliver(self, post_id: int, message: str) -> None:
+        with self._lock:
+            subs = list(self._streams.get(post_id, ()))
+        for sub in subs:
+            if sub.push(message):
+                self.delivered += 1
+            else:
+                self.dropped_streams += 1
+
+    def _dispatch(self, post_id: int, message: str) -> None:
+        loop = self._loop
+        if loop is None or post_id not in self._streams:
+            return
+        loop.call_soon_threadsafe(self._deliver, post_id, message)
+
+    # Publishing (any thread)
+
+    def _followed(self, post_id: int) -> bool:
+        # Through NOTIFY another worker may have followers of any post
+        return settings.LIVE_UPDATES_NOTIFY or post_id in self._streams
+
+    def like_counts(self, post_ids: Iterable[int]) -> dict[int, int]:
+        post_ids = list(post_ids)
+        db = SessionLocal()
+        try:
+            counts = dict(db.execute(_LIKE_COUNTS, {"post_ids": post_ids}).all())
+        finally:
+            db.close()
+        return {post_id: counts.get(post_id, 0) for post_id in post_ids}
+
+    def likes_changed(self, post_ids: Iterable[int]) -> None:
+        """Mark posts whose like count changed; published on the next tick."""
+        if not self.running:
+            return
+        with self._lock:
+            self._changed_likes.update(p for p in post_ids if self._followed(p))
+
+    def publish_likes(self) -> int:
+        """Publish the like counts of every post marked since the last call."""
+        with self._lock:
+            post_ids, self._changed_likes = self._changed_likes, set()
+        if not post_ids:
+            return 0
+        try:
+            counts = self.like_counts(post_ids)
+            self._publish(
+                [
+                    (post_id, "likes", {"post_id": post_id, "likes_count": count})
+                    for post_id, count in counts.items()
+                ]
+            )
+        except Exception:
+            self.failures += 1
+            logger.exception("Publishing like counts failed")
+            return 0
+        return len(post_ids)
+
+    def comment_created(self, comment: Comment) -> None:
+        if not self.running or not self._followed(comment.post_id):
+            return
+        data: dict[str, Any]
+        if settings.LIVE_UPDATES_NOTIFY:
+            data = {"id": comment.id}
+        else:
+            data = CommentPublic.model_validate(comment).model_dump(mode="json")
+        self._try_publish(comment.post_id, "comment", data)
+
+    def comment_deleted(self, post_id: int, comment_id: int) -> None:
+        """A comment and the replies below it were deleted."""
+        if not self.running or not self._followed(post_id):
+            return
+        self._try_publish(
+            post_id, "comment_deleted", {"post_id": post_id, "comment_id": comment_id}
+        )
+
+    def _try_publish(self, post_id: int, event: str, data: dict) -> None:
+        # The write this reports is committed already; losing the update
+        # must not fail the request
+        try:
+            self._publish([(post_id, event, data)])
+        except Exception:
+            self.failures += 1
+            logger.exception("Publishing %s for post %s failed", event, post_id)
+
+    def _publish(self, events: list[tuple[int, str, dict]]) -> None:
+        if settings.LIVE_UPDATES_NOTIFY:
+            with engine.begin() as conn:
+                for post_id, event, data in events:
+                    payload = json.dumps(
+                        {"post_id": post_id, "event": event, "data": data}
+                    )
+                    conn.execute(_NOTIFY, {"payload": payload})
+        else:
+            for post_id, event, data in events:
+                self._dispatch(post_id, _sse(event, data))
+        self.published += len(events)
+
+    # LISTEN (listener thread)
+
+    def _receive(self, payload: str) -> None:
+        notification = json.loads(payload)
+        post_id, event, data = (
+            notification["post_id"],
+            notification["event"],
+            notification["data"],
+        )
+        if post_id not in self._streams:
+            return
+        if event == "comment":
+            db = SessionLocal()
+            try:
+                comment = db.scalars(_LIVE_COMMENT, {"comment_id": data["id"]}).first()
+                if comment is None:
+                    return
+                data = CommentPublic.model_validate(comment).model_dump(mode="json")
+            finally:
+                db.close()
+        self._dispatch(post_id, _sse(event, data))
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                # A connection of its own: LISTEN lasts as long as the session
+                conn = engine.raw_connection()
+                dbapi_conn = conn.driver_connection
+                conn.detach()
+                dbapi_conn.autocommit = True
+                with dbapi_conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self.listening = True
+                with selectors.DefaultSelector() as selector:
+                    selector.register(dbapi_conn, selectors.EVENT_READ)
+                    while not self._stop.is_set():
+                        if not selector.select(timeout=1.0):
+                            continue
+                        dbapi_conn.poll()
+                        while dbapi_conn.notifies:
+                            notify = dbapi_conn.notifies.pop(0)
+                            try:
+                                self._receive(notify.payload)
+                            except Exception:
+                                self.failures += 1
+                                logger.exception("Bad live update %r", notify.payload)
+            except Exception:
+                self.failures += 1
+                logger.exception("Live updates listener failed, reconnecting")
+                self._stop.wait(settings.LIVE_UPDATES_RETRY_MS / 1000)
+            finally:
+                self.listening = False
+                if conn is not None:
+                    conn.close()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            posts = len(self._streams)
+            pending_likes = len(self._changed_likes)
+        return {
+            "enabled": settings.LIVE_UPDATES_ENABLED,
+            "notify": settings.LIVE_UPDATES_NOTIFY,
+            "listening": self.listening,
+            "connections": self._connections,
+            "followed_posts": posts,
+            "pending_like_updates": pending_likes,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_streams": self.dropped_streams,
+            "failures": self.failures,
+        }
+
+
+live_updates = LiveUpdates()
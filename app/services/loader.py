@@ -0,0 +1,60 @@
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Session.info key holding the session's loaders, by fetch function
+_LOADERS = "loaders"
+
+
+class Loader(Generic[K, V]):
+    """Rows by key, fetched in batches and remembered for one transaction.
+
+    `load_many` returns what earlier calls already fetched and gets every
+    other key with a single `IN` query; keys without a row are remembered as
+    None as well. A loader lives in its session (one per request), so the
+    router and every service sharing that session also share the loader.
+    """
+
+    def __init__(self, fetch: Callable[[List[K]], Dict[K, V]]):
+        self._fetch = fetch
+        self._rows: Dict[K, Optional[V]] = {}
+
+    def load(self, key: K) -> Optional[V]:
+        return self.load_many((key,))[0]
+
+    def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """Rows for `keys` in the same order, None where there is none."""
+        keys = list(keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in self._rows]
+        if missing:
+            found = self._fetch(missing)
+            for key in missing:
+                self._rows[key] = found.get(key)
+        return [self._rows[key] for key in keys]
+
+    def prime(self, key: K, value: Optional[V]) -> None:
+        """Record a row this request wrote, so reading it back is free."""
+        self._rows[key] = value
+
+
+def loader_for(
+    db: Session, fetch: Callable[[Session, List[K]], Dict[K, V]]
+) -> Loader[K, V]:
+    """The loader of `db` built on `fetch(db, keys) -> {key: row}`."""
+    loaders = db.info.setdefault(_LOADERS, {})
+    loader = loaders.get(fetch)
+    if loader is None:
+        loader = loaders[fetch] = Loader(lambda keys: fetch(db, keys))
+    return loader
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_loaded_rows(session: Session) -> None:
+    # Rows loaded before a commit or rollback may have changed (soft deletes
+    # included) or be gone; the next load fetches them again
+    session.info.pop(_LOADERS, None)
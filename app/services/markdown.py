@@ -0,0 +1,65 @@
+"""Markdown to HTML for post content.
+
+Parsed with markdown-it-py (CommonMark plus strikethrough) with raw HTML
+disabled, then passed through nh3 so only these tags survive: p, h1-h6,
+blockquote, ul, ol, li, pre, code, hr, br, strong, em, s, a (http, https,
+mailto or relative URLs) and img (http, https or relative). Attribute values
+are escaped by the parser and checked again by the sanitizer, so the output
+is safe to insert into a page whatever the source contains.
+"""
+
+import re
+
+import nh3
+from markdown_it import MarkdownIt
+
+# Bump whenever the output for the same input changes; stored HTML rendered
+# by an older version is re-rendered (see app.commands.rerender_posts)
+RENDERER_VERSION = 2
+
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_SCHEME = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*):")
+_IMAGE_SCHEMES = ("http", "https")
+
+# Parser and sanitizer are built once and reused for every post
+_parser = MarkdownIt("commonmark", {"html": False}).enable("strikethrough")
+
+
+def _filter_attribute(tag: str, attribute: str, value: str) -> str | None:
+    """Attributes nh3's per-tag allowlist cannot express on its own."""
+    if attribute == "class":
+        # Only the fenced code language, as the parser writes it
+        return value if value.startswith("language-") else None
+    if tag == "img" and attribute == "src":
+        match = _SCHEME.match(value)
+        if match is not None and match.group(1).lower() not in _IMAGE_SCHEMES:
+            return None
+    return value
+
+
+# fmt: off
+_TAGS = {
+    "p", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "ul", "ol", "li",
+    "pre", "code", "hr", "br", "strong", "em", "s", "a", "img",
+}
+# fmt: on
+
+_cleaner = nh3.Cleaner(
+    tags=_TAGS,
+    attributes={
+        "a": {"href", "title"},
+        "img": {"src", "alt", "title"},
+        "ol": {"start"},
+        "code": {"class"},
+    },
+    attribute_filter=_filter_attribute,
+    url_schemes={"http", "https", "mailto"},
+    link_rel="nofollow noopener",
+    set_tag_attribute_values={"img": {"loading": "lazy"}},
+)
+
+
+def render_markdown(content: str) -> str:
+    """Sanitized HTML for Markdown `content`."""
+    content = _CONTROL_CHARS.sub("", content.replace("\r\n", "\n").replace("\r", "\n"))
+    return _cleaner.clean(_parser.render(content)).rstrip("\n")
@@ -0,0 +1,165 @@
+import base64
+import binascii
+import enum
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+
+
+class CountStrategy(str, enum.Enum):
+    EXACT = "exact"  # count(*) OVER () computed by the page query itself
+    CACHED = "cached"  # exact count memoized per process, invalidated on writes
+    ESTIMATED = "estimated"  # planner row estimate, exact below a threshold
+    NONE = "none"  # no total, only has_more (fetches limit + 1 rows)
+
+
+@dataclass
+class Page:
+    items: list[Any]
+    total: Optional[int]
+    has_more: bool
+
+
+class CountCache:
+    """Per-process TTL cache of exact counts keyed by tuples like ('comments', post_id).
+
+    Keys carry filters (author, post), so the cache is bounded: past
+    COUNT_CACHE_MAX_ENTRIES the least recently used count is dropped.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, int]] = OrderedDict()
+        # Shared by the threadpool's request threads
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: tuple, value: int) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + settings.COUNT_CACHE_TTL_SECONDS,
+                value,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *prefix: Hashable) -> None:
+        """Drop every key starting with `prefix` (e.g. invalidate('posts'))."""
+        with self._lock:
+            for key in [k for k in self._entries if k[: len(prefix)] == prefix]:
+                del self._entries[key]
+
+
+count_cache = CountCache(settings.COUNT_CACHE_MAX_ENTRIES)
+
+
+def _exact_count(query: Query) -> int:
+    # count(*) over the filtered rows, without SQLAlchemy's subquery wrapping
+    return query.order_by(None).with_entities(func.count()).scalar() or 0
+
+
+def _estimated_count(query: Query) -> int:
+    """Planner estimate for the filtered query; exact when the estimate is small."""
+    bind = query.session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return _exact_count(query)
+
+    compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+    raw = (
+        query.session.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params)
+        .scalar()
+    )
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+    # Estimates are unreliable (and counting is cheap) on small result sets
+    if estimate < settings.COUNT_ESTIMATE_THRESHOLD:
+        return _exact_count(query)
+    return estimate
+
+
+def paginate(
+    query: Query,
+    skip: int,
+    limit: int,
+    strategy: CountStrategy | str = CountStrategy.EXACT,
+    options: tuple = (),
+    cache_key: Optional[tuple] = None,
+) -> Page:
+    """Fetch one page of an ordered query together with its total.
+
+    `query` must carry filters and ordering but no loader options; those go
+    in `options` so the count statements stay free of eager loads.
+    """
+    strategy = CountStrategy(strategy)
+    page_query = query.options(*options).offset(skip)
+
+    if strategy is CountStrategy.EXACT:
+        rows = (
+            page_query.add_columns(func.count().over().label("total"))
+            .limit(limit)
+            .all()
+        )
+        items = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page the window has nothing to report on
+            total = 0 if skip == 0 else _exact_count(query)
+        return Page(items=items, total=total, has_more=skip + len(items) < total)
+
+    if strategy is CountStrategy.NONE:
+        items = page_query.limit(limit + 1).all()
+        return Page(items=items[:limit], total=None, has_more=len(items) > limit)
+
+    items = page_query.limit(limit).all()
+    if strategy is CountStrategy.CACHED:
+        total = count_cache.get(cache_key) if cache_key is not None else None
+        if total is None:
+            total = _exact_count(query)
+            if cache_key is not None:
+                count_cache.set(cache_key, total)
+    else:
+        total = _estimated_count(query)
+    return Page(items=items, total=total, has_more=skip + len(items) < total)
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor for the last row of a page (JSON-serializable values)."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Values encoded by `encode_cursor`; ValueError if tampered with or malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
@@ -1,9 +1,108 @@
 from datetime import datetime, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import (
+    Session,
+    joinedload,
+    lazyload,
+    load_only,
+    noload,
+    selectinload,
+    undefer_group,
+)
+from sqlalchemy import bindparam, desc, exists, select
 
-from app.models.post import Post
+from app.models.category import Category
+from app.models.post import POST_BODY_GROUP, POST_HTML_GROUP, Post
+from app.models.tag import Tag
+from app.models.user import User
+from app.schemas.fieldset import Fieldset
+from app.core.config import settings
+from app.jobs import enqueue
+from app.schemas.post import POST_FIELDS
+from app.services.loader import Loader, loader_for
+from app.services.pagination import Page, count_cache, paginate
+
+
+def _author_option():
+    return joinedload(Post.author).options(lazyload("*"))
+
+
+def _category_option():
+    return joinedload(Post.category).options(lazyload(Category.posts))
+
+
+def _tags_option():
+    return selectinload(Post.tags).options(lazyload(Tag.posts))
+
+
+def post_load_options(fieldset: Optional[Fieldset] = None) -> list:
+    """Loader options for Post queries whose result is serialized.
+
+    Without a sparse fieldset the deferred body columns are undeferred for a
+    full PostPublic. With one, only the requested columns are selected (so
+    `content` stays in the table unless asked for). Either way only the
+    relations that end up in the response are loaded eagerly; the selectin
+    chains behind them (author -> posts -> comments -> ...) stay lazy.
+    """
+    if fieldset is None or not fieldset.sparse:
+        return [
+            undefer_group(POST_BODY_GROUP),
+            lazyload(Post.comments),
+            lazyload(Post.likes),
+            _author_option(),
+            _category_option(),
+            _tags_option(),
+        ]
+
+    fields = fieldset.fields if fieldset.fields is not None else POST_FIELDS
+    options = [
+        load_only(Post.id, *(getattr(Post, name) for name in fields)),
+        noload(Post.comments),
+        noload(Post.likes),
+    ]
+    if fieldset.embeds("author"):
+        options.append(
+            _author_option().options(
+                load_only(User.id, User.name, User.lastname, User.image)
+            )
+        )
+    else:
+        options.append(noload(Post.author))
+    options.append(
+        _category_option() if fieldset.embeds("category") else noload(Post.category)
+    )
+    options.append(_tags_option() if fieldset.embeds("tags") else noload(Post.tags))
+    return options
+
+
+# Lookups by id run on most post, comment and like requests. Their statements
+# are built once here: a reused statement keeps its cache key, so executing it
+# skips query construction and goes straight to the cached compiled SQL.
+_LIVE_POST_ID = (Post.id == bindparam("post_id"), Post.deleted_at.is_(None))
+_POST_WITH_HTML_BY_ID = (
+    select(Post)
+    .options(*post_load_options(), undefer_group(POST_HTML_GROUP))
+    .where(*_LIVE_POST_ID)
+    .limit(1)
+)
+_POST_EXISTS = select(exists().where(*_LIVE_POST_ID))
+_POST_AUTHOR_ID = select(Post.author_id).where(*_LIVE_POST_ID)
+_POSTS_BY_IDS = (
+    select(Post)
+    .options(*post_load_options())
+    .where(
+        Post.id.in_(bindparam("post_ids", expanding=True)), Post.deleted_at.is_(None)
+    )
+)
+
+
+def _fetch_posts(db: Session, post_ids: List[int]) -> dict:
+    return {post.id: post for post in db.scalars(_POSTS_BY_IDS, {"post_ids": post_ids})}
+
+
+def post_loader(db: Session) -> Loader[int, Post]:
+    """Live posts by id, loaded for a full PostPublic, shared by the request."""
+    return loader_for(db, _fetch_posts)
 
 
 class PostService:
@@ -22,14 +121,12 @@ class PostService:
         tags: Optional[List[str]] = None,
     ) -> Post:
         if category_id is not None:
-            from app.models.category import Category
-
-            category = (
-                self.db.query(Category)
-                .filter(Category.id == category_id, Category.deleted_at.is_(None))
-                .first()
-            )
-            if not category:
+            category_exists = self.db.query(
+                exists().where(
+                    Category.id == category_id, Category.deleted_at.is_(None)
+                )
+            ).scalar()
+            if not category_exists:
                 raise ValueError("Category not found")
 
         post = Post(
@@ -52,28 +149,73 @@ class PostService:
             post_tags = tag_service.get_or_create_tags(tags)
             post.tags = post_tags
 
+        # Copy the post into followers' home feeds once it is committed
+        enqueue(self.db, "feed.fan_out_post", {"post_id": post.id})
+        self._enqueue_derived(post.id)
         self.db.commit()
-        self.db.refresh(post)
-        return post
+        count_cache.invalidate("posts")
+        # Reload through get_post_by_id so the deferred body comes back in
+        # the same round trip instead of a lazy load during serialization
+        return self.get_post_by_id(post.id)
 
-    def get_post_by_id(self, post_id: int) -> Optional[Post]:
-        return (
-            self.db.query(Post)
-            .filter(Post.id == post_id, Post.deleted_at.is_(None))
-            .first()
-        )
+    def _enqueue_derived(self, post_id: int) -> None:
+        """Text stats and stored HTML are computed by jobs, off the write path."""
+        enqueue(self.db, "post.text_stats", {"post_id": post_id})
+        enqueue(self.db, "post.render_html", {"post_id": post_id})
+
+    def get_post_by_id(self, post_id: int, with_html: bool = False) -> Optional[Post]:
+        if with_html:
+            return self.db.scalars(_POST_WITH_HTML_BY_ID, {"post_id": post_id}).first()
+        return post_loader(self.db).load(post_id)
+
+    def post_exists(self, post_id: int) -> bool:
+        """EXISTS check for a live post, without loading the row."""
+        return self.db.scalar(_POST_EXISTS, {"post_id": post_id})
+
+    def get_post_author_id(self, post_id: int) -> Optional[int]:
+        """Author of a live post (for authorization checks), or None."""
+        return self.db.scalar(_POST_AUTHOR_ID, {"post_id": post_id})
 
     def get_posts(
-        self, skip: int = 0, limit: int = 10, author_id: Optional[int] = None
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        author_id: Optional[int] = None,
+        fieldset: Optional[Fieldset] = None,
     ) -> List[Post]:
         """Get posts with pagination and optional author filter."""
-        query = self.db.query(Post).filter(Post.deleted_at.is_(None))
+        query = (
+            self.db.query(Post)
+            .options(*post_load_options(fieldset))
+            .filter(Post.deleted_at.is_(None))
+        )
 
         if author_id is not None:
             query = query.filter(Post.author_id == author_id)
 
         return query.order_by(desc(Post.created_at)).offset(skip).limit(limit).all()
 
+    def get_posts_page(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        author_id: Optional[int] = None,
+        fieldset: Optional[Fieldset] = None,
+    ) -> Page:
+        """Get a page of posts and its total in the configured count strategy."""
+        query = self.db.query(Post).filter(Post.deleted_at.is_(None))
+        if author_id is not None:
+            query = query.filter(Post.author_id == author_id)
+
+        return paginate(
+            query.order_by(desc(Post.created_at)),
+            skip=skip,
+            limit=limit,
+            strategy=settings.POSTS_COUNT_STRATEGY,
+            options=tuple(post_load_options(fieldset)),
+            cache_key=("posts", author_id),
+        )
+
     def update_post(
         self,
         post_id: int,
@@ -86,32 +228,39 @@ class PostService:
         tags: Optional[List[str]] = None,
     ) -> Optional[Post]:
         """Update an existing post."""
-        post = self.get_post_by_id(post_id)
+        # Usually already loaded by the router's permission check
+        post = post_loader(self.db).load(post_id)
         if not post:
             return None
 
         if category_id is not None:
-            from app.models.category import Category
-
-            category = (
-                self.db.query(Category)
-                .filter(Category.id == category_id, Category.deleted_at.is_(None))
-                .first()
-            )
-            if not category:
+            category_exists = self.db.query(
+                exists().where(
+                    Category.id == category_id, Category.deleted_at.is_(None)
+                )
+            ).scalar()
+            if not category_exists:
                 raise ValueError("Category not found")
 
         if title is not None:
             post.title = title
         if description is not None:
             post.description = description
-        if content is not None:
+        if content is not None and content != post.content:
             post.content = content
+            # Until the jobs catch up, reads render the new content on the fly
+            # and the old stats are shown
+            post.content_hash = None
+            post.content_html_version = None
+            self._enqueue_derived(post_id)
         if images is not None:
             post.images = images
         if video is not None:
             post.video = video
+        # Feed entries follow the post's tags and category
+        sources_changed = False
         if category_id is not None:
+            sources_changed = category_id != post.category_id
             post.category_id = category_id
 
         # Handle tags update
@@ -120,26 +269,37 @@ class PostService:
 
             tag_service = TagService(self.db)
             post_tags = tag_service.get_or_create_tags(tags)
+            if {tag.id for tag in post_tags} != {tag.id for tag in post.tags}:
+                sources_changed = True
             post.tags = post_tags
 
+        if sources_changed:
+            enqueue(self.db, "feed.refan_post", {"post_id": post_id})
         self.db.commit()
-        self.db.refresh(post)
-        return post
+        return self.get_post_by_id(post_id)
 
     def delete_post(self, post_id: int) -> bool:
         """Soft delete a post."""
-        post = self.get_post_by_id(post_id)
-        if not post:
-            return False
-
-        post.deleted_at = datetime.now(timezone.utc)
+        deleted = (
+            self.db.query(Post)
+            .filter(Post.id == post_id, Post.deleted_at.is_(None))
+            .update(
+                {Post.deleted_at: datetime.now(timezone.utc)},
+                synchronize_session=False,
+            )
+        )
         self.db.commit()
-        return True
+        if deleted:
+            count_cache.invalidate("posts")
+        return deleted > 0
 
-    def get_posts_by_author(self, author_id: int) -> List[Post]:
+    def get_posts_by_author(
+        self, author_id: int, fieldset: Optional[Fieldset] = None
+    ) -> List[Post]:
         """Get all posts by a specific author."""
         return (
             self.db.query(Post)
+            .options(*post_load_options(fieldset))
             .filter(Post.author_id == author_id, Post.deleted_at.is_(None))
             .order_by(desc(Post.created_at))
             .all()
@@ -0,0 +1,203 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, List, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.post import Post
+from app.models.tag import post_tags
+from app.models.user import User
+from app.schemas.post import PostImport, PostImportError
+from app.services.markdown import RENDERER_VERSION, render_markdown
+from app.services.pagination import count_cache
+from app.services.tag import TagService
+from app.services.text_stats import analyze, content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def _db_error(error: DBAPIError) -> str:
+    return str(error.orig).strip().splitlines()[0]
+
+
+class PostImportService:
+    """Inserts posts in chunks with a handful of statements per chunk.
+
+    Authors, categories and tags of a whole chunk are resolved together, then
+    posts and post_tags go in as multi-row INSERTs. An item that cannot be
+    imported is reported by index and the rest of the chunk still goes in.
+
+    Imported posts are archive content: they are not fanned out to followers'
+    home feeds (following a source later backfills them).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _author_ids(self, items: List[PostImport]) -> Tuple[set, dict]:
+        ids = {item.author_id for item in items if item.author_id is not None}
+        emails = {
+            item.author_email.lower() for item in items if item.author_email is not None
+        }
+        known_ids = set()
+        if ids:
+            known_ids = set(
+                self.db.execute(
+                    select(User.id).where(User.id.in_(ids), User.deleted_at.is_(None))
+                ).scalars()
+            )
+        by_email = {}
+        if emails:
+            by_email = dict(
+                self.db.execute(
+                    select(func.lower(User.email), User.id).where(
+                        func.lower(User.email).in_(emails), User.deleted_at.is_(None)
+                    )
+                ).all()
+            )
+        return known_ids, by_email
+
+    def _category_ids(self, items: List[PostImport]) -> Tuple[set, dict]:
+        ids = {item.category_id for item in items if item.category_id is not None}
+        names = {item.category for item in items if item.category is not None}
+        live = Category.deleted_at.is_(None)
+        known_ids = set()
+        if ids:
+            known_ids = set(
+                self.db.execute(
+                    select(Category.id).where(Category.id.in_(ids), live)
+                ).scalars()
+            )
+        by_name = {}
+        if names:
+            by_name = dict(
+                self.db.execute(
+                    select(Category.name, Category.id).where(
+                        Category.name.in_(names), live
+                    )
+                ).all()
+            )
+        return known_ids, by_name
+
+    def _post_row(
+        self, item: PostImport, author_ids, category_ids, now: datetime
+    ) -> dict[str, Any]:
+        known_authors, authors_by_email = author_ids
+        if item.author_id is not None:
+            if item.author_id not in known_authors:
+                raise ValueError("Author not found")
+            author_id = item.author_id
+        elif item.author_email is not None:
+            author_id = authors_by_email.get(item.author_email.lower())
+            if author_id is None:
+                raise ValueError("Author not found")
+        else:
+            raise ValueError("author_id or author_email is required")
+
+        known_categories, categories_by_name = category_ids
+        category_id = None
+        if item.category_id is not None:
+            if item.category_id not in known_categories:
+                raise ValueError("Category not found")
+            category_id = item.category_id
+        elif item.category is not None:
+            category_id = categories_by_name.get(item.category)
+            if category_id is None:
+                raise ValueError("Category not found")
+
+        stats = analyze(item.content)
+        created_at = item.created_at or now
+        return {
+            "title": item.title,
+            "description": item.description,
+            "content": item.content,
+            "images": item.images or [],
+            "video": item.video,
+            "author_id": author_id,
+            "category_id": category_id,
+            "word_count": stats.word_count,
+            "reading_time": stats.reading_time,
+            "excerpt": stats.excerpt,
+            "content_hash": content_hash(item.content),
+            "content_html": render_markdown(item.content),
+            "content_html_version": RENDERER_VERSION,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+    def _insert(self, rows: List[dict], tag_lists: List[List[int]]) -> List[int]:
+        post_ids = list(
+            self.db.scalars(
+                insert(Post).returning(Post.id, sort_by_parameter_order=True), rows
+            )
+        )
+        links = [
+            {"post_id": post_id, "tag_id": tag_id}
+            for post_id, tag_ids in zip(post_ids, tag_lists)
+            for tag_id in tag_ids
+        ]
+        if links:
+            self.db.execute(pg_insert(post_tags).on_conflict_do_nothing(), links)
+        return post_ids
+
+    def import_chunk(
+        self, items: List[Tuple[int, PostImport]]
+    ) -> Tuple[List[int], List[PostImportError]]:
+        """Import one chunk of (index, item). Returns the new post ids and the
+        errors of the items left out."""
+        errors: List[PostImportError] = []
+        if not items:
+            return [], errors
+
+        plain_items = [item for _, item in items]
+        author_ids = self._author_ids(plain_items)
+        category_ids = self._category_ids(plain_items)
+        tag_ids = TagService(self.db).get_or_create_tag_ids(
+            name for item in plain_items for name in item.tags or []
+        )
+        # Tags are idempotent: keep them even if the posts below fail
+        self.db.commit()
+        now = datetime.now(timezone.utc)
+
+        accepted: List[Tuple[int, dict, List[int]]] = []
+        for index, item in items:
+            try:
+                row = self._post_row(item, author_ids, category_ids, now)
+            except ValueError as e:
+                errors.append(PostImportError(index=index, error=str(e)))
+                continue
+            names = {name.strip().lower() for name in item.tags or []}
+            accepted.append(
+                (index, row, sorted(tag_ids[n] for n in names if n in tag_ids))
+            )
+
+        try:
+            post_ids = self._insert(
+                [row for _, row, _ in accepted], [tags for _, _, tags in accepted]
+            )
+            self.db.commit()
+        except DBAPIError:
+            # Something in the chunk violates a constraint: find it one row at
+            # a time, each behind a savepoint, and keep the others
+            self.db.rollback()
+            logger.warning(
+                "Bulk insert failed, retrying %d rows one by one", len(accepted)
+            )
+            post_ids = []
+            for index, row, tags in accepted:
+                savepoint = self.db.begin_nested()
+                try:
+                    post_ids += self._insert([row], [tags])
+                    savepoint.commit()
+                except DBAPIError as e:
+                    savepoint.rollback()
+                    errors.append(PostImportError(index=index, error=_db_error(e)))
+            self.db.commit()
+
+        if post_ids:
+            count_cache.invalidate("posts")
+        return post_ids, errors
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.post import Post
+from app.services.markdown import RENDERER_VERSION, render_markdown
+from app.services.text_stats import content_hash, content_hash_sql
+
+
+class RenderedHtmlCache:
+    """LRU of rendered HTML keyed by (content hash, renderer version).
+
+    Only used for posts whose stored HTML is missing or was rendered by an
+    older renderer, until the re-render command catches up.
+    """
+
+    def __init__(self):
+        self._entries: OrderedDict[tuple[str, int], str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, content: str, digest: str) -> str:
+        key = (digest, RENDERER_VERSION)
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return rendered
+            self.misses += 1
+        rendered = render_markdown(content)
+        with self._lock:
+            self._entries[key] = rendered
+            while len(self._entries) > settings.POST_HTML_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+        return rendered
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "renderer_version": RENDERER_VERSION,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+html_cache = RenderedHtmlCache()
+
+
+def render_post_html(db: Session, post_id: int) -> bool:
+    """Job body: store the HTML of the post's current content.
+
+    Like the text stats, written only while the content is still the one
+    rendered. Returns whether the post was updated.
+    """
+    content = db.scalar(select(Post.content).where(Post.id == post_id))
+    if content is None:
+        return False
+    rendered = render_markdown(content)
+    table = Post.__table__
+    updated = db.execute(
+        update(table)
+        .where(
+            table.c.id == post_id,
+            content_hash_sql(table.c.content) == content_hash(content),
+        )
+        # Derived columns: not an edit of the post
+        .values(
+            content_html=rendered,
+            content_html_version=RENDERER_VERSION,
+            updated_at=table.c.updated_at,
+        )
+    ).rowcount
+    db.commit()
+    return updated > 0
+
+
+def post_content_html(post: Post) -> str:
+    """Sanitized HTML of the post: the stored copy when current, else cached."""
+    if post.content_html_version == RENDERER_VERSION and post.content_html is not None:
+        return post.content_html
+    return html_cache.get_or_render(
+        post.content, post.content_hash or content_hash(post.content)
+    )
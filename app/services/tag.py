@@ -1,10 +1,32 @@
 from datetime import datetime, timezone
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, lazyload
+from sqlalchemy import bindparam, func, select
 
+from app.core.config import settings
 from app.models.tag import Tag
 from app.models.post import Post
+from app.services.loader import Loader, loader_for
+from app.services.pagination import Page, count_cache, paginate
+
+# Built once; see the lookups in app/services/post.py
+_LIVE_TAG = Tag.deleted_at.is_(None)
+_TAG_BY_ID = select(Tag).where(Tag.id == bindparam("tag_id"), _LIVE_TAG).limit(1)
+_TAGS_BY_NAMES = (
+    select(Tag)
+    .options(lazyload(Tag.posts))
+    .where(Tag.name.in_(bindparam("names", expanding=True)), _LIVE_TAG)
+)
+
+
+def _fetch_tags(db: Session, names: List[str]) -> dict:
+    return {tag.name: tag for tag in db.scalars(_TAGS_BY_NAMES, {"names": names})}
+
+
+def tag_loader(db: Session) -> Loader[str, Tag]:
+    """Live tags by normalized name, shared by the request."""
+    return loader_for(db, _fetch_tags)
 
 
 class TagService:
@@ -21,11 +43,8 @@ class TagService:
         if len(normalized_name) > 50:
             raise ValueError("Tag name cannot exceed 50 characters")
 
-        existing_tag = (
-            self.db.query(Tag)
-            .filter(Tag.name == normalized_name, Tag.deleted_at.is_(None))
-            .first()
-        )
+        loader = tag_loader(self.db)
+        existing_tag = loader.load(normalized_name)
 
         if existing_tag:
             return existing_tag
@@ -33,10 +52,14 @@ class TagService:
         new_tag = Tag(name=normalized_name)
         self.db.add(new_tag)
         self.db.flush()  # Get ID without committing
+        loader.prime(normalized_name, new_tag)
+        count_cache.invalidate("tags")
         return new_tag
 
     def get_or_create_tags(self, tag_names: List[str]) -> List[Tag]:
         """Get or create multiple tags."""
+        # One query for all the existing tags; the loop then reads the loader
+        tag_loader(self.db).load_many(name.strip().lower() for name in tag_names)
         tags = []
         for name in tag_names:
             try:
@@ -46,22 +69,38 @@ class TagService:
                 continue
         return tags
 
+    def get_or_create_tag_ids(self, tag_names: Iterable[str]) -> Dict[str, int]:
+        """Bulk get-or-create: {normalized name: id} in two statements.
+
+        Invalid names and names of soft-deleted tags are left out, as
+        get_or_create_tags skips them.
+        """
+        names = {name.strip().lower() for name in tag_names}
+        names = sorted(name for name in names if 0 < len(name) <= 50)
+        if not names:
+            return {}
+        created = self.db.execute(
+            insert(Tag)
+            .values([{"name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=[Tag.name])
+        ).rowcount
+        if created:
+            count_cache.invalidate("tags")
+        rows = self.db.execute(
+            select(Tag.name, Tag.id).where(
+                Tag.name.in_(names), Tag.deleted_at.is_(None)
+            )
+        ).all()
+        return {name: tag_id for name, tag_id in rows}
+
     def get_tag_by_id(self, tag_id: int) -> Optional[Tag]:
         """Get a tag by ID."""
-        return (
-            self.db.query(Tag)
-            .filter(Tag.id == tag_id, Tag.deleted_at.is_(None))
-            .first()
-        )
+        return self.db.scalars(_TAG_BY_ID, {"tag_id": tag_id}).first()
 
     def get_tag_by_name(self, name: str) -> Optional[Tag]:
         """Get a tag by name."""
         normalized_name = name.strip().lower()
-        return (
-            self.db.query(Tag)
-            .filter(Tag.name == normalized_name, Tag.deleted_at.is_(None))
-            .first()
-        )
+        return tag_loader(self.db).load(normalized_name)
 
     def get_all_tags(self, skip: int = 0, limit: int = 100) -> List[Tag]:
         """Get all tags with pagination."""
@@ -74,6 +113,18 @@ class TagService:
             .all()
         )
 
+    def get_tags_page(self, skip: int = 0, limit: int = 100) -> Page:
+        """Get a page of tags and its total."""
+        query = self.db.query(Tag).filter(Tag.deleted_at.is_(None)).order_by(Tag.name)
+        return paginate(
+            query,
+            skip=skip,
+            limit=limit,
+            strategy=settings.TAGS_COUNT_STRATEGY,
+            options=(lazyload(Tag.posts),),
+            cache_key=("tags",),
+        )
+
     def count_tags(self) -> int:
         """Count total tags."""
         return self.db.query(Tag).filter(Tag.deleted_at.is_(None)).count()
@@ -146,6 +197,7 @@ class TagService:
 
         tag.deleted_at = datetime.now(timezone.utc)
         self.db.commit()
+        count_cache.invalidate("tags")
         return True
 
     def get_popular_tags(self, limit: int = 10) -> List[dict]:
@@ -0,0 +1,126 @@
+import hashlib
+import math
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.post import Post
+
+# Markdown reduced to its readable text, in this order
+_FENCED_CODE = re.compile(r"^(```|~~~).*?^\1[^\n]*$", re.MULTILINE | re.DOTALL)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_LINE_MARKUP = re.compile(r"^\s{0,3}(?:#{1,6}\s+|>\s?|[-*+]\s+|\d+[.)]\s+)", re.M)
+_INLINE_MARKUP = re.compile(r"`+|\*{1,3}|_{2,3}|~~")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class TextStats:
+    word_count: int
+    reading_time: int  # minutes, at least 1
+    excerpt: str
+
+
+def content_hash(content: str) -> str:
+    """Fingerprint stored with the stats; equal hashes mean nothing to recompute.
+
+    Same value as Postgres' encode(sha256(convert_to(content, 'UTF8')), 'hex').
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def content_hash_sql(content):
+    """content_hash() computed by Postgres, for `content` a SQL expression."""
+    return func.encode(func.sha256(func.convert_to(content, "UTF8")), "hex")
+
+
+def _strip_markup(content: str, keep_code: bool) -> str:
+    text = _FENCED_CODE.sub(
+        (lambda m: m.group(0).split("\n", 1)[-1].rsplit("\n", 1)[0])
+        if keep_code
+        else " ",
+        content,
+    )
+    text = _HTML_TAG.sub(" ", text)
+    text = _IMAGE.sub(r"\1", text)
+    text = _LINK.sub(r"\1", text)
+    text = _LINE_MARKUP.sub("", text)
+    text = _INLINE_MARKUP.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def plain_text(content: str) -> str:
+    """Markdown content as a single line of prose (code blocks dropped)."""
+    return _strip_markup(content, keep_code=False)
+
+
+def _excerpt(text: str, length: int) -> str:
+    if len(text) <= length:
+        return text
+    # One character is kept for the ellipsis: `length` is the column's size
+    cut = text[: length - 1]
+    cut = cut.rsplit(" ", 1)[0] or cut
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def analyze(content: str) -> TextStats:
+    """Word count and reading time (code blocks included) plus a prose excerpt."""
+    word_count = len(_strip_markup(content, keep_code=True).split())
+    return TextStats(
+        word_count=word_count,
+        reading_time=max(1, math.ceil(word_count / settings.READING_WORDS_PER_MINUTE)),
+        excerpt=_excerpt(plain_text(content), settings.POST_EXCERPT_LENGTH),
+    )
+
+
+def apply_text_stats(post: Post, content: str) -> bool:
+    """Refresh the post's stats for `content` unless its hash is unchanged.
+
+    Returns whether anything was recomputed.
+    """
+    digest = content_hash(content)
+    if post.content_hash == digest:
+        return False
+    stats = analyze(content)
+    post.word_count = stats.word_count
+    post.reading_time = stats.reading_time
+    post.excerpt = stats.excerpt
+    post.content_hash = digest
+    return True
+
+
+def refresh_post_text_stats(db: Session, post_id: int) -> bool:
+    """Job body: store the stats of the post's current content.
+
+    The row is only written while its content is still the one analyzed; an
+    edit in between queued a job of its own. Returns whether it was updated.
+    """
+    row = db.execute(
+        select(Post.content, Post.content_hash).where(Post.id == post_id)
+    ).first()
+    if row is None:
+        return False
+    digest = content_hash(row.content)
+    if row.content_hash == digest:
+        return False
+    stats = analyze(row.content)
+    table = Post.__table__
+    updated = db.execute(
+        update(table)
+        .where(table.c.id == post_id, content_hash_sql(table.c.content) == digest)
+        # Derived columns: not an edit of the post
+        .values(
+            word_count=stats.word_count,
+            reading_time=stats.reading_time,
+            excerpt=stats.excerpt,
+            content_hash=digest,
+            updated_at=table.c.updated_at,
+        )
+    ).rowcount
+    db.commit()
+    return updated > 0
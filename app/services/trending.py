@@ -0,0 +1,232 @@
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, desc, func, literal, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.background import PeriodicTask
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.comment import Comment
+from app.models.like import Like
+from app.models.post import Post
+from app.models.post_ranking import PostRanking
+from app.schemas.post import PostPublic, TrendingPostList
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.post import post_loader
+
+logger = logging.getLogger(__name__)
+
+TRENDING_WINDOWS = {"24h": timedelta(hours=24), "7d": timedelta(days=7)}
+_MAX_WINDOW = max(TRENDING_WINDOWS.values())
+# Arbitrary constant: only one worker refreshes the table at a time
+_REFRESH_LOCK_KEY = 0x7472656E
+
+
+def _decay_seconds() -> float:
+    # e-folding time of a half-life, so score differences are in ln units
+    return settings.TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+
+
+def _score_expression(likes, comments, views, published_at):
+    """ln(engagement) + publication time / decay.
+
+    Equivalent in ordering to engagement * exp(-age / decay), but it does
+    not change as time passes, so a stored score stays valid until the post
+    gets new likes, comments or views.
+    """
+    engagement = (
+        settings.TRENDING_LIKE_WEIGHT * likes
+        + settings.TRENDING_COMMENT_WEIGHT * comments
+        + settings.TRENDING_VIEW_WEIGHT * views
+    )
+    return func.ln(1 + engagement) + func.extract("epoch", published_at) / literal(
+        _decay_seconds()
+    )
+
+
+def refresh_rankings(db: Session) -> int:
+    """Bring post_rankings up to date. Returns the number of rows written or removed.
+
+    Candidates are the live posts published within the widest window; a row
+    is only rewritten when its like, comment or view count changed.
+    """
+    if not db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _REFRESH_LOCK_KEY}
+    ).scalar():
+        db.rollback()
+        return 0
+
+    cutoff = datetime.now(timezone.utc) - _MAX_WINDOW
+    # Counted for candidates only: joining the posts of the window first keeps
+    # the GROUP BYs to recent posts instead of every like and comment ever
+    in_window = (Post.deleted_at.is_(None), Post.created_at >= cutoff)
+    likes = (
+        select(Like.post_id, func.count().label("n"))
+        .join(Post, Post.id == Like.post_id)
+        .where(*in_window)
+        .group_by(Like.post_id)
+        .subquery()
+    )
+    comments = (
+        select(Comment.post_id, func.count().label("n"))
+        .join(Post, Post.id == Comment.post_id)
+        .where(Comment.deleted_at.is_(None), *in_window)
+        .group_by(Comment.post_id)
+        .subquery()
+    )
+    like_count = func.coalesce(likes.c.n, 0)
+    comment_count = func.coalesce(comments.c.n, 0)
+    candidates = (
+        select(
+            Post.id,
+            like_count,
+            comment_count,
+            Post.views,
+            Post.created_at,
+            _score_expression(like_count, comment_count, Post.views, Post.created_at),
+        )
+        .outerjoin(likes, likes.c.post_id == Post.id)
+        .outerjoin(comments, comments.c.post_id == Post.id)
+        .where(*in_window)
+    )
+    stmt = insert(PostRanking).from_select(
+        ["post_id", "likes", "comments", "views", "published_at", "score"],
+        candidates,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PostRanking.post_id],
+        set_={
+            "likes": stmt.excluded.likes,
+            "comments": stmt.excluded.comments,
+            "views": stmt.excluded.views,
+            "published_at": stmt.excluded.published_at,
+            "score": stmt.excluded.score,
+            "refreshed_at": func.now(),
+        },
+        where=or_(
+            PostRanking.likes != stmt.excluded.likes,
+            PostRanking.comments != stmt.excluded.comments,
+            PostRanking.views != stmt.excluded.views,
+            PostRanking.published_at != stmt.excluded.published_at,
+        ),
+    )
+    upserted = db.execute(stmt).rowcount
+
+    removed = db.execute(
+        delete(PostRanking).where(
+            or_(
+                PostRanking.published_at < cutoff,
+                PostRanking.post_id.in_(
+                    select(Post.id).where(Post.deleted_at.is_not(None))
+                ),
+            )
+        )
+    ).rowcount
+    db.commit()
+    return upserted + removed
+
+
+class TrendingPageCache:
+    """Short-lived cache of rendered trending pages.
+
+    Per process: the worker that refreshes the ranking drops its pages right
+    away, the others keep serving theirs until TRENDING_CACHE_TTL_SECONDS
+    runs out, so the TTL bounds how stale a page can be.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple, tuple[float, TrendingPostList]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[TrendingPostList]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: tuple, page: TrendingPostList) -> None:
+        with self._lock:
+            if len(self._entries) >= settings.TRENDING_CACHE_MAX_ENTRIES:
+                self._entries.clear()
+            self._entries[key] = (
+                time.monotonic() + settings.TRENDING_CACHE_TTL_SECONDS,
+                page,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+trending_cache = TrendingPageCache()
+
+
+def _refresh_job() -> None:
+    db = SessionLocal()
+    try:
+        if refresh_rankings(db):
+            trending_cache.clear()
+    except Exception:
+        db.rollback()
+        logger.exception("Trending refresh failed")
+    finally:
+        db.close()
+
+
+trending_refresher = PeriodicTask("trending-refresh", _refresh_job)
+
+
+class TrendingService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_trending_page(
+        self, window: str, limit: int, cursor: Optional[str] = None
+    ) -> TrendingPostList:
+        """One page of the precomputed ranking, served from cache when possible."""
+        key = (window, cursor, limit)
+        cached = trending_cache.get(key)
+        if cached is not None:
+            return cached
+
+        cutoff = datetime.now(timezone.utc) - TRENDING_WINDOWS[window]
+        query = self.db.query(PostRanking.post_id, PostRanking.score).filter(
+            PostRanking.published_at >= cutoff
+        )
+        if cursor is not None:
+            try:
+                score, post_id = decode_cursor(cursor, 2)
+                after = (float(score), int(post_id))
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            query = query.filter(tuple_(PostRanking.score, PostRanking.post_id) < after)
+        ranked = (
+            query.order_by(desc(PostRanking.score), desc(PostRanking.post_id))
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(ranked) > limit
+        ranked = ranked[:limit]
+
+        posts = post_loader(self.db).load_many(row.post_id for row in ranked)
+
+        page = TrendingPostList(
+            posts=[
+                PostPublic.model_validate(post) for post in posts if post is not None
+            ],
+            window=window,
+            next_cursor=(
+                encode_cursor(ranked[-1].score, ranked[-1].post_id)
+                if has_more
+                else None
+            ),
+        )
+        trending_cache.set(key, page)
+        return page
@@ -1,8 +1,29 @@
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session, lazyload
+from typing import List, Optional
 
 from app.models.user import User
 from app.models.auth_provider import AuthProvider, ProviderType
+from app.services.loader import Loader, loader_for
+
+# Built once; see the lookups in app/services/post.py
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email")).limit(1)
+# Callers serialize users as UserPublic, which has no relationships: skip the
+# selectin chains (posts -> comments -> ...) that loading a User runs otherwise
+_USERS_BY_IDS = (
+    select(User)
+    .options(lazyload("*"))
+    .where(User.id.in_(bindparam("user_ids", expanding=True)))
+)
+
+
+def _fetch_users(db: Session, user_ids: List[int]) -> dict:
+    return {user.id: user for user in db.scalars(_USERS_BY_IDS, {"user_ids": user_ids})}
+
+
+def user_loader(db: Session) -> Loader[int, User]:
+    """Users by id, shared by the request (the current user included)."""
+    return loader_for(db, _fetch_users)
 
 
 class UserService:
@@ -10,10 +31,10 @@ class UserService:
         self.db = db
 
     def get_user_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.scalars(_USER_BY_EMAIL, {"email": email}).first()
 
     def get_user_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+        return user_loader(self.db).load(user_id)
 
     def create_user(self, name: str, lastname: str, email: str, password: str) -> User:
         user = User.create_local(
@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Hashable, Optional
+
+from sqlalchemy import Integer, column, update, values
+
+from app.core.background import PeriodicTask
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.post import Post
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Per-worker post view counts, written to `posts.views` in bulk.
+
+    Recording a view is a dict update under a lock; the flusher adds the
+    accumulated deltas with one `UPDATE ... FROM (VALUES ...)` per interval
+    and at shutdown. Views recorded since the last flush are lost if the
+    process dies without a clean shutdown.
+    """
+
+    def __init__(self):
+        self._pending: Counter[int] = Counter()
+        # (post_id, viewer) -> expiry. The window is fixed from the first view,
+        # so insertion order is expiry order and pruning stops at the first
+        # live entry
+        self._seen: dict[tuple[int, Hashable], float] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task = PeriodicTask("view-counter-flusher", self.flush)
+        self.recorded = 0
+        self.deduplicated = 0
+        self.flushes = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+
+    def record(self, post_id: int, viewer: Optional[Hashable] = None) -> bool:
+        """Count a view unless `viewer` already viewed this post in the window."""
+        window = settings.VIEWS_DEDUPE_WINDOW_SECONDS
+        now = time.monotonic()
+        with self._lock:
+            if viewer is not None and window > 0:
+                key = (post_id, viewer)
+                expires_at = self._seen.get(key)
+                if expires_at is not None and expires_at > now:
+                    self.deduplicated += 1
+                    return False
+                self._seen.pop(key, None)
+                if len(self._seen) >= settings.VIEWS_DEDUPE_MAX_ENTRIES:
+                    self._seen.pop(next(iter(self._seen)))
+                self._seen[key] = now + window
+            self._pending[post_id] += 1
+            self.recorded += 1
+            return True
+
+    def pending(self, post_id: int) -> int:
+        """Views of this post recorded by this worker but not flushed yet."""
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    def _prune_seen(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            while self._seen:
+                key = next(iter(self._seen))
+                if self._seen[key] > now:
+                    break
+                del self._seen[key]
+
+    def flush(self) -> int:
+        """Add the pending deltas to `posts.views`. Returns the posts updated."""
+        with self._flush_lock:
+            self._prune_seen()
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            deltas = values(
+                column("id", Integer), column("n", Integer), name="view_deltas"
+            ).data(list(batch.items()))
+            table = Post.__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == deltas.c.id)
+                # Views are not an edit: keep updated_at out of the onupdate
+                .values(views=table.c.views + deltas.c.n, updated_at=table.c.updated_at)
+            )
+            db = SessionLocal()
+            try:
+                db.execute(stmt)
+                db.commit()
+            except Exception:
+                db.rollback()
+                self.failures += 1
+                with self._lock:
+                    self._pending.update(batch)
+                logger.exception("View counter flush failed, deltas re-queued")
+                return 0
+            finally:
+                db.close()
+            self.flushes += 1
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 3)
+            return len(batch)
+
+    def start(self) -> None:
+        self._task.start(settings.VIEWS_FLUSH_INTERVAL_MS / 1000)
+
+    def stop(self) -> None:
+        """Stop the flusher and write out whatever is still pending."""
+        self._task.stop()
+        self.flush()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            pending_posts = len(self._pending)
+            pending_views = sum(self._pending.values())
+            tracked_viewers = len(self._seen)
+        return {
+            "enabled": settings.VIEWS_ENABLED,
+            "pending_posts": pending_posts,
+            "pending_views": pending_views,
+            "tracked_viewers": tracked_viewers,
+            "recorded": self.recorded,
+            "deduplicated": self.deduplicated,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+view_counter = ViewCounter()
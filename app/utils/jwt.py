@@ -1,4 +1,6 @@
+import time
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, Any
 
 from jose import JWTError, jwt
@@ -17,11 +19,21 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+@lru_cache(maxsize=4096)
+def _verified_claims(token: str) -> dict[str, Any]:
+    # Checking the signature is most of the cost of a decode and a token is
+    # sent with every request of its session (and read by the rate limiter
+    # as well as the route): remember the tokens seen recently
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
 def decode_access_token(token: str) -> dict[str, Any]:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        return payload
+        payload = _verified_claims(token)
     except JWTError as e:
         raise ValueError("Invalid token") from e
+    # A cached token may have expired since it was verified
+    expires_at = payload.get("exp")
+    if expires_at is not None and expires_at <= time.time():
+        raise ValueError("Invalid token")
+    return dict(payload)
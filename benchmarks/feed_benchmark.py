@@ -0,0 +1,257 @@
+"""Home feed benchmark: fan-out cost on write and page latency on read.
+
+Creates synthetic users that each follow a number of tags, publishes posts
+tagged with some of those tags, fans them out, then times feed pages for a
+sample of users against the equivalent multi-way join. Everything it creates
+uses the `@bench.example.com` email domain / `bench-` tag prefix and is deleted
+at the end (unless --keep).
+
+    uv run python -m benchmarks.feed_benchmark --users 100000 --follows 20
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.db import SessionLocal  # noqa: E402
+from app.services.feed import FeedService, fan_out_post  # noqa: E402
+
+EMAIL_DOMAIN = "@bench.example.com"
+TAG_PREFIX = "bench-"
+
+MATERIALIZED_FEED = text(
+    """
+    SELECT post_id AS id, published_at
+    FROM feed_entries
+    WHERE user_id = :user_id
+    ORDER BY published_at DESC, post_id DESC
+    LIMIT :limit
+    """
+)
+
+NAIVE_FEED = text(
+    """
+    SELECT p.id, p.created_at
+    FROM posts p
+    WHERE p.deleted_at IS NULL AND EXISTS (
+        SELECT 1 FROM follows f
+        WHERE f.user_id = :user_id AND (
+            (f.target_type = 'AUTHOR' AND f.target_id = p.author_id)
+            OR (f.target_type = 'CATEGORY' AND f.target_id = p.category_id)
+            OR (f.target_type = 'TAG' AND f.target_id IN (
+                SELECT pt.tag_id FROM post_tags pt WHERE pt.post_id = p.id))
+        )
+    )
+    ORDER BY p.created_at DESC, p.id DESC
+    LIMIT :limit
+    """
+)
+
+
+def percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return (
+        f"p50={pick(0.50):.2f}ms p95={pick(0.95):.2f}ms "
+        f"p99={pick(0.99):.2f}ms mean={statistics.mean(ordered) * 1000:.2f}ms"
+    )
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label}: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def setup(db, users: int, tags: int, follows: int) -> None:
+    db.execute(
+        text(
+            """
+            INSERT INTO users (name, lastname, email, role, follower_count)
+            SELECT 'Bench', 'User ' || i, 'bench-user-' || i || :domain, 'USER', 0
+            FROM generate_series(1, :users) AS i
+            """
+        ),
+        {"users": users, "domain": EMAIL_DOMAIN},
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO tags (name)
+            SELECT :prefix || i FROM generate_series(1, :tags) AS i
+            """
+        ),
+        {"tags": tags, "prefix": TAG_PREFIX},
+    )
+    # User n follows tags (7n + 13k) mod T for k < F: distinct while
+    # 13 is coprime with T, and spread evenly over all tags
+    db.execute(
+        text(
+            """
+            WITH bench_users AS (
+                SELECT id, row_number() OVER (ORDER BY id) AS n
+                FROM users WHERE email LIKE '%' || :domain
+            ), bench_tags AS (
+                SELECT array_agg(id ORDER BY id) AS ids
+                FROM tags WHERE name LIKE :prefix || '%'
+            )
+            INSERT INTO follows (user_id, target_type, target_id)
+            SELECT DISTINCT u.id, 'TAG'::followtarget, t.ids[((u.n * 7 + k * 13) % :tags) + 1]
+            FROM bench_users u
+            CROSS JOIN bench_tags t
+            CROSS JOIN generate_series(0, :follows - 1) AS k
+            """
+        ),
+        {
+            "domain": EMAIL_DOMAIN,
+            "prefix": TAG_PREFIX,
+            "tags": tags,
+            "follows": follows,
+        },
+    )
+    db.commit()
+    db.execute(text("ANALYZE users, tags, follows"))
+    db.commit()
+
+
+def publish(db, posts: int, tags_per_post: int) -> list[int]:
+    author_id = db.execute(
+        text("SELECT min(id) FROM users WHERE email LIKE '%' || :domain"),
+        {"domain": EMAIL_DOMAIN},
+    ).scalar()
+    tag_ids = list(
+        db.execute(
+            text("SELECT id FROM tags WHERE name LIKE :prefix || '%'"),
+            {"prefix": TAG_PREFIX},
+        ).scalars()
+    )
+    post_ids = []
+    for i in range(posts):
+        post_id = db.execute(
+            text(
+                """
+                INSERT INTO posts (title, description, content, images,
+                                   reading_time, author_id, created_at)
+                VALUES (:title, 'bench', 'bench', '[]', 1, :author_id,
+                        now() - make_interval(mins => :age))
+                RETURNING id
+                """
+            ),
+            {"title": f"bench post {i}", "author_id": author_id, "age": posts - i},
+        ).scalar()
+        for tag_id in random.sample(tag_ids, tags_per_post):
+            db.execute(
+                text("INSERT INTO post_tags (post_id, tag_id) VALUES (:p, :t)"),
+                {"p": post_id, "t": tag_id},
+            )
+        post_ids.append(post_id)
+    db.commit()
+    return post_ids
+
+
+def cleanup(db) -> None:
+    params = {"domain": EMAIL_DOMAIN, "prefix": TAG_PREFIX}
+    bench_users = "SELECT id FROM users WHERE email LIKE '%' || :domain"
+    bench_posts = f"SELECT id FROM posts WHERE author_id IN ({bench_users})"
+    for stmt in (
+        f"DELETE FROM feed_entries WHERE post_id IN ({bench_posts})",
+        f"DELETE FROM feed_entries WHERE user_id IN ({bench_users})",
+        f"DELETE FROM post_rankings WHERE post_id IN ({bench_posts})",
+        f"DELETE FROM post_tags WHERE post_id IN ({bench_posts})",
+        f"DELETE FROM posts WHERE author_id IN ({bench_users})",
+        f"DELETE FROM follows WHERE user_id IN ({bench_users})",
+        "DELETE FROM tags WHERE name LIKE :prefix || '%'",
+        "DELETE FROM users WHERE email LIKE '%' || :domain",
+    ):
+        db.execute(text(stmt), params)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--follows", type=int, default=20, help="tags per user")
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--tags-per-post", type=int, default=3)
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep the bench data")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        cleanup(db)
+        timed(
+            f"setup: {args.users} users x {args.follows} of {args.tags} tags",
+            lambda: setup(db, args.users, args.tags, args.follows),
+        )
+        post_ids = timed(
+            f"publish: {args.posts} posts x {args.tags_per_post} tags",
+            lambda: publish(db, args.posts, args.tags_per_post),
+        )
+
+        fanout_times, entries = [], 0
+        for post_id in post_ids:
+            start = time.perf_counter()
+            entries += fan_out_post(db, post_id)
+            fanout_times.append(time.perf_counter() - start)
+        print(
+            f"fan-out: {entries} feed entries "
+            f"({entries // max(len(post_ids), 1)} per post), "
+            f"{percentiles(fanout_times)}"
+        )
+        db.execute(text("ANALYZE feed_entries"))
+        db.commit()
+
+        readers = list(
+            db.execute(
+                text(
+                    "SELECT id FROM users WHERE email LIKE '%' || :domain "
+                    "ORDER BY random() LIMIT :n"
+                ),
+                {"domain": EMAIL_DOMAIN, "n": args.reads},
+            ).scalars()
+        )
+        feed_service = FeedService(db)
+        feed_times, materialized_times, naive_times = [], [], []
+        for user_id in readers:
+            start = time.perf_counter()
+            page = feed_service.get_feed_page(user_id, args.limit)
+            feed_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            db.execute(MATERIALIZED_FEED, {"user_id": user_id, "limit": args.limit})
+            materialized_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            naive = db.execute(
+                NAIVE_FEED, {"user_id": user_id, "limit": args.limit}
+            ).all()
+            naive_times.append(time.perf_counter() - start)
+            assert [p.id for p in page.posts] == [row.id for row in naive]
+            db.rollback()
+
+        print(f"GET /api/feed page (service): {percentiles(feed_times)}")
+        print(f"ids, materialized entries:    {percentiles(materialized_times)}")
+        print(f"ids, multi-way join:          {percentiles(naive_times)}")
+    finally:
+        if not args.keep:
+            db.rollback()
+            timed("cleanup", lambda: cleanup(db))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
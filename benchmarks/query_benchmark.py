@@ -0,0 +1,189 @@
+"""Hot lookup benchmark: per-call Python cost of building the query each time
+against executing a statement built once at import.
+
+Times each service lookup (post, comment, like, tag and user by key) next to
+the `db.query(...)` chain it used to run, for a key that does not exist and
+for one that does (with --hits). A miss brings back no rows, so its time is
+almost only the Python work around the query: building it, generating its
+cache key, finding the compiled SQL and running the ORM result machinery.
+CPU time is measured with `time.process_time`, which leaves out the wait on
+Postgres. Read-only: it uses whatever rows the database already has (run
+`make seed` first).
+
+    uv run python -m benchmarks.query_benchmark --calls 2000 --rounds 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import and_, select  # noqa: E402
+from sqlalchemy.orm import undefer_group  # noqa: E402
+
+from app.db import SessionLocal  # noqa: E402
+from app.models.comment import Comment  # noqa: E402
+from app.models.like import Like  # noqa: E402
+from app.models.post import POST_HTML_GROUP, Post  # noqa: E402
+from app.models.tag import Tag  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.comment import CommentService  # noqa: E402
+from app.services.like import LikeService  # noqa: E402
+from app.services.post import PostService, post_load_options  # noqa: E402
+from app.services.tag import TagService  # noqa: E402
+from app.services.user import UserService  # noqa: E402
+
+MISSING_ID = -1
+
+
+def query_post(db, post_id):
+    options = post_load_options()
+    options.append(undefer_group(POST_HTML_GROUP))
+    return (
+        db.query(Post)
+        .options(*options)
+        .filter(Post.id == post_id, Post.deleted_at.is_(None))
+        .first()
+    )
+
+
+def query_comment(db, comment_id):
+    return (
+        db.query(Comment)
+        .filter(Comment.id == comment_id, Comment.deleted_at.is_(None))
+        .first()
+    )
+
+
+def query_like(db, key):
+    user_id, post_id = key
+    return (
+        db.query(Like)
+        .filter(and_(Like.user_id == user_id, Like.post_id == post_id))
+        .first()
+    )
+
+
+def query_tag(db, name):
+    return (
+        db.query(Tag)
+        .filter(Tag.name == name.strip().lower(), Tag.deleted_at.is_(None))
+        .first()
+    )
+
+
+def query_user(db, user_id):
+    return db.query(User).filter(User.id == user_id).first()
+
+
+def lookups(db) -> list:
+    """(name, before, after, existing key, missing key) per lookup."""
+    like = db.execute(select(Like.user_id, Like.post_id).limit(1)).first()
+    return [
+        (
+            "post by id",
+            query_post,
+            lambda db, key: PostService(db).get_post_by_id(key, with_html=True),
+            db.scalar(select(Post.id).where(Post.deleted_at.is_(None)).limit(1)),
+            MISSING_ID,
+        ),
+        (
+            "comment by id",
+            query_comment,
+            lambda db, key: CommentService(db).get_comment_by_id(key),
+            db.scalar(select(Comment.id).where(Comment.deleted_at.is_(None)).limit(1)),
+            MISSING_ID,
+        ),
+        (
+            "like by key",
+            query_like,
+            lambda db, key: LikeService(db).get_like(*key),
+            tuple(like) if like is not None else None,
+            (MISSING_ID, MISSING_ID),
+        ),
+        (
+            "tag by name",
+            query_tag,
+            lambda db, key: TagService(db).get_tag_by_name(key),
+            db.scalar(select(Tag.name).where(Tag.deleted_at.is_(None)).limit(1)),
+            "no-such-tag",
+        ),
+        (
+            "user by id",
+            query_user,
+            lambda db, key: UserService(db).get_user_by_id(key),
+            db.scalar(select(User.id).limit(1)),
+            MISSING_ID,
+        ),
+    ]
+
+
+def measure(db, lookup, key, calls: int) -> tuple[float, float]:
+    """Mean CPU and wall time per call over `calls` calls, in microseconds."""
+    cpu, wall = 0.0, 0.0
+    for _ in range(calls):
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        lookup(db, key)
+        cpu += time.process_time() - cpu_start
+        wall += time.perf_counter() - wall_start
+        # Start every call from a clean session, as each request has its own:
+        # the rollback drops the request loaders, expunge the identity map
+        db.rollback()
+        db.expunge_all()
+    return cpu / calls * 1e6, wall / calls * 1e6
+
+
+def compare(db, before, after, key, calls: int, rounds: int) -> tuple:
+    """Best round of each side; rounds alternate so drift hits both alike."""
+    measure(db, before, key, 20)  # compile and cache before timing
+    measure(db, after, key, 20)
+    before_rounds, after_rounds = [], []
+    for _ in range(rounds):
+        before_rounds.append(measure(db, before, key, calls))
+        after_rounds.append(measure(db, after, key, calls))
+    return min(before_rounds), min(after_rounds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--hits",
+        action="store_true",
+        help="also time existing keys (slow: dominated by eager loading)",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(
+            f"best of {args.rounds} rounds of {args.calls} calls, "
+            "mean per call (CPU / wall)"
+        )
+        for name, before, after, existing, missing in lookups(db):
+            keys = [("miss", missing)]
+            if args.hits:
+                keys.append(("hit", existing))
+            for label, key in keys:
+                if key is None:
+                    print(f"{name} ({label}): no rows to look up, skipped")
+                    continue
+                (cpu_before, wall_before), (cpu_after, wall_after) = compare(
+                    db, before, after, key, args.calls, args.rounds
+                )
+                print(
+                    f"{name} ({label}): "
+                    f"query chain {cpu_before:.0f}us / {wall_before:.0f}us, "
+                    f"prebuilt {cpu_after:.0f}us / {wall_after:.0f}us "
+                    f"({cpu_after / cpu_before - 1:+.0%} CPU)"
+                )
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
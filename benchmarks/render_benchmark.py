@@ -0,0 +1,152 @@
+"""Post HTML benchmark: render cost of long posts and what storing it saves.
+
+Generates Markdown posts of increasing length, times the renderer on each,
+then compares serving format=html from the stored column against rendering
+the raw content on every request. The posts belong to a synthetic
+`@bench.example.com` user and are deleted at the end (unless --keep).
+
+    uv run python -m benchmarks.render_benchmark --words 2000,20000,100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.db import SessionLocal  # noqa: E402
+from app.services.markdown import render_markdown  # noqa: E402
+from app.services.post import PostService  # noqa: E402
+
+from benchmarks.feed_benchmark import EMAIL_DOMAIN, percentiles  # noqa: E402
+
+WORDS = (
+    "fastapi postgres índice consulta latencia caché worker réplica python "
+    "rendimiento transacción conexión servidor cliente petición respuesta"
+).split()
+
+
+def markdown_post(words: int, seed: int) -> str:
+    """Markdown with the usual mix: headings, prose with inline markup,
+    lists, quotes and code blocks."""
+    rng = random.Random(seed)
+    blocks, written = [], 0
+    while written < words:
+        kind = rng.random()
+        if kind < 0.08:
+            blocks.append(f"## {' '.join(rng.choices(WORDS, k=4)).capitalize()}")
+            written += 4
+        elif kind < 0.18:
+            items = [" ".join(rng.choices(WORDS, k=8)) for _ in range(4)]
+            blocks.append("\n".join(f"- {item}" for item in items))
+            written += 32
+        elif kind < 0.24:
+            lines = [f"    result = query_{i}(session, limit={i})" for i in range(8)]
+            blocks.append("```python\n" + "\n".join(lines) + "\n```")
+            written += 32
+        elif kind < 0.28:
+            blocks.append("> " + " ".join(rng.choices(WORDS, k=30)))
+            written += 30
+        else:
+            sentence = rng.choices(WORDS, k=60)
+            sentence[5] = f"**{sentence[5]}**"
+            sentence[20] = f"`{sentence[20]}()`"
+            sentence[40] = f"[{sentence[40]}](https://example.com/{sentence[40]})"
+            blocks.append(" ".join(sentence).capitalize() + ".")
+            written += 60
+    return "\n\n".join(blocks)
+
+
+def cleanup(db) -> None:
+    params = {"domain": EMAIL_DOMAIN}
+    bench_users = "SELECT id FROM users WHERE email LIKE '%' || :domain"
+    db.execute(
+        text(
+            "DELETE FROM jobs WHERE name = 'feed.fan_out_post' AND "
+            "(payload->>'post_id')::int IN "
+            f"(SELECT id FROM posts WHERE author_id IN ({bench_users}))"
+        ),
+        params,
+    )
+    db.execute(text(f"DELETE FROM posts WHERE author_id IN ({bench_users})"), params)
+    db.execute(text("DELETE FROM users WHERE email LIKE '%' || :domain"), params)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--words", default="2000,20000,100000", help="post sizes, comma separated"
+    )
+    parser.add_argument("--reads", type=int, default=50, help="reads per size")
+    parser.add_argument("--keep", action="store_true", help="keep the bench data")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.words.split(",")]
+
+    db = SessionLocal()
+    try:
+        cleanup(db)
+        author_id = db.execute(
+            text(
+                "INSERT INTO users (name, lastname, email, role, follower_count) "
+                "VALUES ('Bench', 'Author', 'bench-author' || :domain, 'USER', 0) "
+                "RETURNING id"
+            ),
+            {"domain": EMAIL_DOMAIN},
+        ).scalar()
+        db.commit()
+        service = PostService(db)
+
+        for words in sizes:
+            content = markdown_post(words, seed=words)
+            render_times = []
+            for _ in range(5):
+                start = time.perf_counter()
+                html = render_markdown(content)
+                render_times.append(time.perf_counter() - start)
+
+            post_id = service.create_post(
+                title=f"bench {words}",
+                description="bench",
+                content=content,
+                author_id=author_id,
+            ).id
+            stored_times, per_request_times = [], []
+            for _ in range(args.reads):
+                # Keep connection checkout out of the timings
+                db.execute(text("SELECT 1"))
+                start = time.perf_counter()
+                db.execute(
+                    text("SELECT content_html FROM posts WHERE id = :id"),
+                    {"id": post_id},
+                ).scalar()
+                stored_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                raw = db.execute(
+                    text("SELECT content FROM posts WHERE id = :id"), {"id": post_id}
+                ).scalar()
+                render_markdown(raw)
+                per_request_times.append(time.perf_counter() - start)
+                db.rollback()
+
+            print(
+                f"{words} words ({len(content) // 1024} KiB markdown, "
+                f"{len(html) // 1024} KiB html)"
+            )
+            print(f"  render:                {percentiles(render_times)}")
+            print(f"  serve stored html:     {percentiles(stored_times)}")
+            print(f"  render every request:  {percentiles(per_request_times)}")
+    finally:
+        if not args.keep:
+            db.rollback()
+            cleanup(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
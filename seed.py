@@ -1,28 +1,48 @@
 #!/usr/bin/env python3
 """
 Script para poblar la base de datos con datos de ejemplo para desarrollo.
-Uso: python seed.py
+Uso: python seed.py [--scale N] [--seed S]
+
+Con --scale, además de los datos de ejemplo genera datos sintéticos a escala
+de producción (N x 10k usuarios, 50k posts, 250k comentarios y ~1M likes)
+y los carga con COPY.
 """
 
-from datetime import datetime, timedelta
+import argparse
+import io
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.db import SessionLocal, engine, Base
-from app.models.user import User, UserRole, UserPosition
+from app.models.user import User, UserRole, UserPosition, pwd_context
 from app.models.category import Category
 from app.models.tag import Tag
 from app.models.post import Post
-from app.models.comment import Comment
+from app.models.comment import NEXT_COMMENT_ID, Comment, path_segment
 from app.models.like import Like
 from app.models.auth_provider import AuthProvider, ProviderType
+from app.services.markdown import RENDERER_VERSION, render_markdown
+from app.services.text_stats import analyze, apply_text_stats, content_hash
 
 
 def clear_database():
-    """Limpia todas las tablas de la base de datos."""
+    """Aplica las migraciones pendientes y vacía todas las tablas."""
     print("🗑️  Limpiando base de datos...")
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    print("✅ Base de datos limpiada y recreada")
+    command.upgrade(Config(str(Path(__file__).with_name("alembic.ini"))), "head")
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    print("✅ Base de datos migrada y vaciada")
 
 
 def create_users(db: Session) -> dict[str, User]:
@@ -534,19 +554,16 @@ No hay una respuesta única. Depende de:
         # Calcular fecha
         created_at = datetime.now() - timedelta(days=post_data["days_ago"])
 
-        # Calcular tiempo de lectura estimado (palabras / 200 palabras por minuto)
-        word_count = len(post_data["content"].split())
-        reading_time = max(1, word_count // 200)  # Mínimo 1 minuto
-
         post = Post(
             title=post_data["title"],
             description=post_data["description"],
             content=post_data["content"],
-            reading_time=reading_time,
             author_id=users[post_data["author"]].id,
             category_id=categories[post_data["category"]].id,
             created_at=created_at,
         )
+        # Tiempo de lectura, número de palabras y extracto (como la API)
+        apply_text_stats(post, post_data["content"])
         db.add(post)
         db.flush()  # Para obtener el ID
 
@@ -615,6 +632,28 @@ def create_comments(db: Session, users: dict, posts: list) -> list[Comment]:
             "post_index": 4,
             "hours_ago": 7,
         },
+        # Respuestas: "reply_to" es el índice del comentario respondido
+        {
+            "content": "¡Buena idea! useContext es el siguiente de la lista.",
+            "author": "fernando",
+            "post_index": 0,
+            "hours_ago": 4,
+            "reply_to": 1,
+        },
+        {
+            "content": "¡Genial, lo espero!",
+            "author": "miguel",
+            "post_index": 0,
+            "hours_ago": 3,
+            "reply_to": 8,
+        },
+        {
+            "content": "Publiqué uno con wrk: en endpoints async FastAPI sale muy por delante.",
+            "author": "carlos",
+            "post_index": 1,
+            "hours_ago": 10,
+            "reply_to": 3,
+        },
     ]
 
     comments = []
@@ -627,9 +666,17 @@ def create_comments(db: Session, users: dict, posts: list) -> list[Comment]:
             post_id=posts[comment_data["post_index"]].id,
             created_at=created_at,
         )
+        parent = (
+            comments[comment_data["reply_to"]] if "reply_to" in comment_data else None
+        )
+        comment.place(db.scalar(NEXT_COMMENT_ID), parent)
         db.add(comment)
         comments.append(comment)
 
+    for comment in comments:
+        comment.reply_count = sum(
+            comment.id in other.ancestor_ids for other in comments
+        )
     db.commit()
     print(f"✅ Creados {len(comments)} comentarios")
     return comments
@@ -666,6 +713,352 @@ def create_likes(db: Session, users: dict, posts: list) -> list[Like]:
     return likes
 
 
+# ---------------------------------------------------------------------------
+# Seed a escala (--scale): datos sintéticos deterministas cargados con COPY
+# ---------------------------------------------------------------------------
+
+# Filas por unidad de --scale
+SCALE_USERS = 10_000
+SCALE_TAGS = 1_000
+SCALE_POSTS = 50_000
+SCALE_COMMENTS = 250_000
+SCALE_LIKES = 1_000_000
+# Parte de los comentarios que responden a otro anterior del mismo post
+SCALE_REPLY_RATIO = 0.6
+
+SCALE_EMAIL_DOMAIN = "@seed.example.com"
+SCALE_PASSWORD = "seed1234"
+# Filas por COPY: la memoria no crece con --scale
+COPY_BATCH_ROWS = 50_000
+# Cuerpos distintos; cada post usa uno, con sus estadísticas y HTML ya calculados
+CONTENT_POOL_SIZE = 500
+
+_FIRST_NAMES = (
+    "Ana Luis María Carlos Lucía Jorge Sofía Pablo Elena Diego Laura Andrés "
+    "Paula Javier Valeria Mateo"
+).split()
+_LAST_NAMES = (
+    "García Martínez López Sánchez Pérez Gómez Díaz Torres Ramírez Flores "
+    "Rojas Castro Vargas Morales"
+).split()
+_TOPICS = (
+    "python javascript typescript react vue angular node fastapi django flask "
+    "postgres redis docker kubernetes aws terraform rust go java kotlin swift "
+    "flutter graphql rest testing security performance css html linux git ci "
+    "ml data sql nosql websockets cache"
+).split()
+_WORDS = (
+    "aplicación servidor cliente función componente estado consulta índice "
+    "memoria latencia despliegue contenedor módulo prueba error rendimiento "
+    "datos usuario sistema código patrón diseño arquitectura servicio "
+    "petición respuesta caché proceso hilo evento mensaje cola tabla columna "
+    "esquema migración versión librería api el la de en con para que un una "
+    "por sin rápido simple nuevo mejor grande pequeño seguro"
+).split()
+
+
+def _zipf_cum_weights(n: int, exponent: float) -> list[float]:
+    """Pesos acumulados de una distribución de Zipf sobre n rangos."""
+    return list(accumulate(1 / (rank**exponent) for rank in range(1, n + 1)))
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    sentence = " ".join(rng.choices(_WORDS, k=words))
+    return sentence[0].upper() + sentence[1:] + "."
+
+
+def _content_pool(rng: random.Random) -> list[dict]:
+    """Cuerpos Markdown de largo variable con sus columnas derivadas."""
+    pool = []
+    for _ in range(CONTENT_POOL_SIZE):
+        blocks = []
+        for _ in range(max(2, int(rng.lognormvariate(1.8, 0.6)))):
+            kind = rng.random()
+            if kind < 0.15:
+                blocks.append("## " + _sentence(rng, rng.randint(2, 6))[:-1])
+            elif kind < 0.25:
+                blocks.append(
+                    "\n".join(
+                        f"- {_sentence(rng, rng.randint(3, 8))}"
+                        for _ in range(rng.randint(2, 5))
+                    )
+                )
+            elif kind < 0.32:
+                blocks.append(f"```python\nresult = {rng.choice(_TOPICS)}(data)\n```")
+            else:
+                blocks.append(
+                    " ".join(
+                        _sentence(rng, rng.randint(6, 16))
+                        for _ in range(rng.randint(2, 6))
+                    )
+                )
+        content = "\n\n".join(blocks)
+        stats = analyze(content)
+        pool.append(
+            {
+                "content": content,
+                "description": stats.excerpt,
+                "word_count": stats.word_count,
+                "reading_time": stats.reading_time,
+                "excerpt": stats.excerpt,
+                "content_hash": content_hash(content),
+                "content_html": render_markdown(content),
+            }
+        )
+    return pool
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        # Escapes del formato de texto de COPY
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _copy(db: Session, table: str, columns: tuple[str, ...], rows) -> int:
+    """Carga `rows` con COPY FROM STDIN, de a COPY_BATCH_ROWS filas."""
+    cursor = db.connection().connection.cursor()
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    buffer = io.StringIO()
+    total = pending = 0
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        buffer.write("\t".join(map(_copy_value, row)) + "\n")
+        pending += 1
+        if pending == COPY_BATCH_ROWS:
+            flush()
+            total += pending
+            pending = 0
+    if pending:
+        flush()
+        total += pending
+    cursor.close()
+    return total
+
+
+def _next_id(db: Session, table: str) -> int:
+    return db.execute(text(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")).scalar()
+
+
+def seed_scale(db: Session, scale: float, seed: int) -> dict[str, int]:
+    """Genera y carga datos sintéticos con distribuciones realistas.
+
+    Los posts más populares concentran likes y comentarios (Zipf), pocos
+    autores escriben la mayoría de los posts y unos pocos tags se usan mucho
+    más que el resto (cola larga). Con la misma semilla se generan las mismas
+    filas; las fechas son relativas al día de la carga.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    n_users = max(2, int(SCALE_USERS * scale))
+    n_tags = max(1, int(SCALE_TAGS * scale))
+    n_posts = max(1, int(SCALE_POSTS * scale))
+    n_comments = int(SCALE_COMMENTS * scale)
+    n_likes = int(SCALE_LIKES * scale)
+    counts = {}
+
+    # Un solo bcrypt para todos: hashear millones de contraseñas tomaría horas
+    password_hash = pwd_context.hash(SCALE_PASSWORD)
+    first_user = _next_id(db, "users")
+    user_ids = range(first_user, first_user + n_users)
+    positions = [position.name for position in UserPosition]
+
+    def users():
+        for i, user_id in enumerate(user_ids):
+            joined = now - timedelta(days=730 + rng.random() * 365)
+            yield (
+                user_id,
+                rng.choice(_FIRST_NAMES),
+                rng.choice(_LAST_NAMES),
+                f"user{i}{SCALE_EMAIL_DOMAIN}",
+                password_hash,
+                rng.choice(positions),
+                UserRole.USER.name,
+                joined,
+                joined,
+            )
+
+    counts["users"] = _copy(
+        db,
+        "users",
+        tuple(
+            "id name lastname email hashed_password position role created_at "
+            "updated_at".split()
+        ),
+        users(),
+    )
+
+    first_tag = _next_id(db, "tags")
+    tag_ids = range(first_tag, first_tag + n_tags)
+    counts["tags"] = _copy(
+        db,
+        "tags",
+        ("id", "name"),
+        (
+            (tag_id, f"{_TOPICS[i % len(_TOPICS)]}-{i}")
+            for i, tag_id in enumerate(tag_ids)
+        ),
+    )
+    category_ids = list(db.execute(text("SELECT id FROM categories")).scalars())
+
+    # Posts: autores y tags con cola larga, fechas en los últimos dos años
+    print("   Generando contenido...")
+    pool = _content_pool(rng)
+    first_post = _next_id(db, "posts")
+    post_ids = range(first_post, first_post + n_posts)
+    authors = rng.choices(
+        user_ids, cum_weights=_zipf_cum_weights(n_users, 1.0), k=n_posts
+    )
+    published = sorted(now - timedelta(days=rng.random() * 730) for _ in post_ids)
+    # Rango de popularidad de cada post: decide sus likes, comentarios y visitas
+    popularity = list(range(1, n_posts + 1))
+    rng.shuffle(popularity)
+    like_weights = [1 / rank**0.8 for rank in popularity]
+    like_scale = n_likes / sum(like_weights)
+    likes_per_post = [min(n_users - 1, int(w * like_scale)) for w in like_weights]
+    tag_weights = _zipf_cum_weights(n_tags, 1.1)
+    post_tags_rows = []
+
+    def posts():
+        for i, post_id in enumerate(post_ids):
+            body = rng.choice(pool)
+            for tag_id in set(
+                rng.choices(tag_ids, cum_weights=tag_weights, k=rng.randint(1, 5))
+            ):
+                post_tags_rows.append((post_id, tag_id))
+            yield (
+                post_id,
+                _sentence(rng, rng.randint(3, 9))[:-1],
+                body["description"],
+                body["content"],
+                "[]",
+                body["reading_time"],
+                body["word_count"],
+                body["excerpt"],
+                body["content_hash"],
+                body["content_html"],
+                RENDERER_VERSION,
+                likes_per_post[i] * rng.randint(5, 40) + rng.randint(0, 50),
+                authors[i],
+                rng.choice(category_ids)
+                if category_ids and rng.random() < 0.9
+                else None,
+                published[i],
+                published[i],
+            )
+
+    counts["posts"] = _copy(
+        db,
+        "posts",
+        tuple(
+            "id title description content images reading_time word_count excerpt "
+            "content_hash content_html content_html_version views author_id "
+            "category_id created_at updated_at".split()
+        ),
+        posts(),
+    )
+    counts["post_tags"] = _copy(db, "post_tags", ("post_id", "tag_id"), post_tags_rows)
+    post_tags_rows.clear()
+
+    # Likes: cada post recibe los de su rango, de usuarios distintos
+    def likes():
+        for i, post_id in enumerate(post_ids):
+            for user_id in rng.sample(user_ids, likes_per_post[i]):
+                if user_id != authors[i]:
+                    yield (user_id, post_id)
+
+    counts["likes"] = _copy(db, "likes", ("user_id", "post_id"), likes())
+
+    # Comentarios: concentrados en los posts populares, de usuarios activos;
+    # la mayoría responde a un comentario anterior del mismo post (hilos)
+    commenter_weights = _zipf_cum_weights(n_users, 0.7)
+    post_weights = list(accumulate(like_weights))
+    comment_phrases = [_sentence(rng, rng.randint(4, 20)) for _ in range(2_000)]
+
+    first_comment = _next_id(db, "comments")
+    reply_counts = Counter()
+
+    def comments():
+        targets = rng.choices(range(n_posts), cum_weights=post_weights, k=n_comments)
+        commenters = rng.choices(user_ids, cum_weights=commenter_weights, k=n_comments)
+        # Comentarios de cada post que todavía admiten respuestas
+        answerable = {}
+        for offset, (i, author_id) in enumerate(zip(targets, commenters)):
+            comment_id = first_comment + offset
+            earlier = answerable.setdefault(i, [])
+            if earlier and rng.random() < SCALE_REPLY_RATIO:
+                parent_id, parent_path, parent_depth, parent_created = rng.choice(
+                    earlier
+                )
+                created = min(now, parent_created + timedelta(hours=rng.random() * 48))
+                path = f"{parent_path}.{path_segment(comment_id)}"
+                depth = parent_depth + 1
+                ancestors = [int(segment) for segment in parent_path.split(".")]
+                reply_counts.update(ancestors)
+                thread_id = ancestors[0]
+            else:
+                created = min(now, published[i] + timedelta(hours=rng.random() * 720))
+                parent_id, path, depth = None, path_segment(comment_id), 0
+                thread_id = comment_id
+            if depth < settings.COMMENTS_MAX_DEPTH:
+                earlier.append((comment_id, path, depth, created))
+            yield (
+                comment_id,
+                rng.choice(comment_phrases),
+                author_id,
+                post_ids[i],
+                parent_id,
+                thread_id,
+                path,
+                depth,
+                created,
+                created,
+            )
+
+    counts["comments"] = _copy(
+        db,
+        "comments",
+        tuple(
+            "id content author_id post_id parent_id thread_id path depth created_at "
+            "updated_at".split()
+        ),
+        comments(),
+    )
+    db.execute(text("CREATE TEMP TABLE reply_counts (id int, n int) ON COMMIT DROP"))
+    _copy(db, "reply_counts", ("id", "n"), reply_counts.items())
+    db.execute(
+        text(
+            "UPDATE comments SET reply_count = reply_counts.n "
+            "FROM reply_counts WHERE comments.id = reply_counts.id"
+        )
+    )
+
+    for table in ("users", "tags", "posts", "comments"):
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT max(id) FROM {table}))"
+            )
+        )
+    db.commit()
+    return counts
+
+
 def print_summary(
     users: dict, categories: dict, tags: dict, posts: list, comments: list, likes: list
 ):
@@ -692,6 +1085,17 @@ def print_summary(
 
 def main():
     """Función principal del seed."""
+    parser = argparse.ArgumentParser(description="Pobla la base de datos")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=0,
+        help="unidades de datos sintéticos a cargar con COPY "
+        f"(1 = {SCALE_USERS} usuarios, {SCALE_POSTS} posts, {SCALE_LIKES} likes)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="semilla aleatoria")
+    args = parser.parse_args()
+
     print("🌱 INICIANDO SEED DE BASE DE DATOS")
     print("=" * 40)
 
@@ -713,6 +1117,19 @@ def main():
         # Mostrar resumen
         print_summary(users, categories, tags, posts, comments, likes)
 
+        if args.scale > 0:
+            print(f"\n📦 Cargando datos sintéticos (--scale {args.scale:g})...")
+            start = time.perf_counter()
+            counts = seed_scale(db, args.scale, args.seed)
+            db.execute(text("ANALYZE"))
+            db.commit()
+            for table, count in counts.items():
+                print(f"   {table}: {count:,}")
+            print(
+                f"✅ {sum(counts.values()):,} filas en {time.perf_counter() - start:.1f}s"
+            )
+            print(f"   Usuarios: user<N>{SCALE_EMAIL_DOMAIN} / {SCALE_PASSWORD}")
+
     except Exception as e:
         print(f"❌ Error durante el seed: {e}")
         db.rollback()
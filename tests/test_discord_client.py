@@ -0,0 +1,210 @@
+"""DiscordClient and the token exchange against a local mock Discord server."""
+
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.config import settings
+from app.services import discord_auth
+from app.services.discord_client import DiscordClient, DiscordUnavailableError
+
+
+async def _drip():
+    # Keeps its connection busy for a second without ever going quiet long
+    # enough to hit the read timeout
+    for _ in range(10):
+        yield b" "
+        await asyncio.sleep(0.1)
+
+
+class MockDiscord:
+    """Answers each path from a script of replies (the last one repeats) and
+    records every request it receives."""
+
+    def __init__(self):
+        self.url = ""
+        self.replies: dict[str, list[tuple]] = {}
+        self.requests: list[tuple[str, str, bytes]] = []
+        self.app = FastAPI()
+        self.app.add_api_route("/drip", lambda: StreamingResponse(_drip()))
+        self.app.add_api_route("/{path:path}", self._handle, methods=["GET", "POST"])
+
+    def script(self, path: str, *replies: tuple) -> None:
+        """Replies are (status, body[, headers[, delay in seconds]])."""
+        self.replies[path] = list(replies)
+
+    def hits(self, path: str) -> int:
+        return sum(1 for _, hit, _ in self.requests if hit == path)
+
+    async def _handle(self, path: str, request: Request):
+        path = "/" + path
+        self.requests.append((request.method, path, await request.body()))
+        replies = self.replies.get(path) or [(404, {"message": "404: Not Found"})]
+        reply = replies.pop(0) if len(replies) > 1 else replies[0]
+        status, body, *rest = reply
+        headers = rest[0] if rest else None
+        delay = rest[1] if len(rest) > 1 else 0.0
+        if delay:
+            await asyncio.sleep(delay)
+        return JSONResponse(body, status_code=status, headers=headers)
+
+
+@pytest.fixture(scope="module")
+def discord_server():
+    mock = MockDiscord()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(mock.app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]})
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    mock.url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    yield mock
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.fixture
+def discord(discord_server, monkeypatch):
+    discord_server.replies.clear()
+    discord_server.requests.clear()
+    monkeypatch.setattr(settings, "DISCORD_API_BASE_URL", discord_server.url)
+    monkeypatch.setattr(settings, "DISCORD_HTTP_TIMEOUT_SECONDS", 0.3)
+    monkeypatch.setattr(settings, "DISCORD_HTTP_MAX_RETRIES", 2)
+    monkeypatch.setattr(settings, "DISCORD_HTTP_RETRY_BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "DISCORD_HTTP_MAX_RETRY_AFTER_SECONDS", 1.0)
+    return discord_server
+
+
+def _run(calls):
+    """Run `calls(client)` with a fresh client, closed afterwards."""
+
+    async def main():
+        client = DiscordClient()
+        try:
+            return await calls(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_token_exchange(discord, monkeypatch):
+    discord.script(
+        "/oauth2/token", (200, {"access_token": "at", "refresh_token": "rt"})
+    )
+
+    async def exchange(client):
+        monkeypatch.setattr(discord_auth, "discord_client", client)
+        return await discord_auth.DiscordAuthService(None).exchange_code_for_token(
+            "the-code"
+        )
+
+    assert _run(exchange) == {"access_token": "at", "refresh_token": "rt"}
+    [(method, _, body)] = discord.requests
+    assert method == "POST"
+    assert b"grant_type=authorization_code" in body
+    assert b"code=the-code" in body
+
+
+def test_rejected_code_is_not_an_outage(discord, monkeypatch):
+    discord.script("/oauth2/token", (400, {"error": "invalid_grant"}))
+
+    async def exchange(client):
+        monkeypatch.setattr(discord_auth, "discord_client", client)
+        return await discord_auth.DiscordAuthService(None).exchange_code_for_token(
+            "bad"
+        )
+
+    assert _run(exchange) is None
+    assert discord.hits("/oauth2/token") == 1
+
+
+def test_get_retries_server_errors(discord):
+    discord.script("/v10/users/@me", (503, {}), (502, {}), (200, {"id": "1"}))
+    response = _run(lambda client: client.request("GET", "/v10/users/@me"))
+    assert response.status_code == 200
+    assert discord.hits("/v10/users/@me") == 3
+
+
+def test_get_gives_up_after_max_retries(discord):
+    discord.script("/v10/users/@me", (500, {}))
+    response = _run(lambda client: client.request("GET", "/v10/users/@me"))
+    assert response.status_code == 500
+    assert discord.hits("/v10/users/@me") == 3
+
+
+def test_post_is_not_retried_after_server_error(discord):
+    discord.script("/oauth2/token", (503, {}), (200, {}))
+    response = _run(lambda client: client.request("POST", "/oauth2/token"))
+    assert response.status_code == 503
+    assert discord.hits("/oauth2/token") == 1
+
+
+def test_429_waits_for_retry_after(discord):
+    discord.script(
+        "/oauth2/token",
+        (429, {"retry_after": 0.2}, {"Retry-After": "0.2"}),
+        (200, {"access_token": "at"}),
+    )
+    start = time.monotonic()
+    response = _run(lambda client: client.request("POST", "/oauth2/token"))
+    assert response.status_code == 200
+    assert time.monotonic() - start >= 0.2
+    assert discord.hits("/oauth2/token") == 2
+
+
+def test_429_with_a_long_wait_is_returned(discord):
+    discord.script("/oauth2/token", (429, {"retry_after": 30}, {"Retry-After": "30"}))
+    response = _run(lambda client: client.request("POST", "/oauth2/token"))
+    assert response.status_code == 429
+    assert discord.hits("/oauth2/token") == 1
+
+
+def test_get_timeout_is_retried_then_raised(discord):
+    discord.script("/v10/users/@me", (200, {}, None, 1.0))
+    with pytest.raises(DiscordUnavailableError):
+        _run(lambda client: client.request("GET", "/v10/users/@me"))
+    assert discord.hits("/v10/users/@me") == 3
+
+
+def test_post_timeout_is_not_retried(discord):
+    # The token may have been issued: sending the code again would fail anyway
+    discord.script("/oauth2/token", (200, {}, None, 1.0))
+    with pytest.raises(DiscordUnavailableError):
+        _run(lambda client: client.request("POST", "/oauth2/token"))
+    assert discord.hits("/oauth2/token") == 1
+
+
+def test_unreachable_server(discord, monkeypatch):
+    with socket.socket() as closed:
+        closed.bind(("127.0.0.1", 0))
+        port = closed.getsockname()[1]
+    monkeypatch.setattr(settings, "DISCORD_API_BASE_URL", f"http://127.0.0.1:{port}")
+    with pytest.raises(DiscordUnavailableError):
+        _run(lambda client: client.request("POST", "/oauth2/token"))
+
+
+def test_pool_exhaustion_is_raised(discord, monkeypatch):
+    monkeypatch.setattr(settings, "DISCORD_HTTP_MAX_CONNECTIONS", 1)
+    monkeypatch.setattr(settings, "DISCORD_HTTP_MAX_RETRIES", 0)
+    discord.script("/oauth2/token", (200, {}))
+
+    async def calls(client):
+        busy = asyncio.create_task(client.request("GET", "/drip"))
+        await asyncio.sleep(0.1)
+        try:
+            with pytest.raises(DiscordUnavailableError):
+                await client.request("POST", "/oauth2/token")
+        finally:
+            assert (await busy).status_code == 200
+
+    _run(calls)
+    assert discord.hits("/oauth2/token") == 0
@@ -0,0 +1,39 @@
+from app.services.markdown import render_markdown
+
+
+def test_raw_html_is_escaped():
+    html = render_markdown("<script>alert(1)</script>")
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_code_span_cannot_break_out_of_image_alt():
+    html = render_markdown('![`" onerror="alert(1)`](http://x/a.png)')
+    assert "onerror" not in html
+    assert '<img src="http://x/a.png"' in html
+
+
+def test_code_span_cannot_break_out_of_link_href():
+    html = render_markdown('[a](http://x/`"onmouseover="alert(1)`)')
+    assert '"onmouseover' not in html
+    assert '<a href="http://x/%60%22onmouseover=%22alert(1)%60"' in html
+
+
+def test_unsafe_schemes_are_dropped():
+    html = render_markdown("[x](javascript:alert(1)) ![i](data:image/png;base64,AA)")
+    assert "href" not in html
+    assert 'src="data:' not in html
+
+
+def test_links_get_rel_and_images_lazy_loading():
+    html = render_markdown("[a](https://e.com) ![b](/b.png)")
+    assert 'rel="nofollow noopener"' in html
+    assert 'loading="lazy"' in html
+
+
+def test_supported_markup():
+    html = render_markdown("# T\n\n**b** *i* ~~s~~\n\n```py\nx\n```\n\n3. a\n4. b")
+    assert "<h1>T</h1>" in html
+    assert "<strong>b</strong> <em>i</em> <s>s</s>" in html
+    assert '<pre><code class="language-py">x\n</code></pre>' in html
+    assert '<ol start="3">' in html
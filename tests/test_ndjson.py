@@ -0,0 +1,31 @@
+import asyncio
+
+from app.routers.post import _ndjson_items
+
+
+class _Request:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def stream(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _items(chunks):
+    async def collect():
+        return [item async for item in _ndjson_items(_Request(chunks))]
+
+    return asyncio.run(collect())
+
+
+def test_lines_split_across_chunks():
+    chunks = [b'{"a":1}\n\n{"b"', b":2}\n", b'  \n{"c":3}']
+    assert _items(chunks) == [(0, b'{"a":1}'), (1, b'{"b":2}'), (2, b'{"c":3}')]
+
+
+def test_long_line_over_many_chunks():
+    line = b'{"x":"' + b"a" * 100_000 + b'"}'
+    body = line + b"\n" + line
+    chunks = [body[i : i + 1000] for i in range(0, len(body), 1000)]
+    assert _items(chunks) == [(0, line), (1, line)]
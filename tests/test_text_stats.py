@@ -0,0 +1,25 @@
+from app.core.config import settings
+from app.services.text_stats import _excerpt, analyze
+
+
+def test_short_text_is_kept_whole():
+    assert _excerpt("Hola mundo", 300) == "Hola mundo"
+
+
+def test_excerpt_cuts_at_a_word_boundary():
+    excerpt = _excerpt("uno dos tres cuatro", 12)
+    assert excerpt == "uno dos…"
+    assert len(excerpt) <= 12
+
+
+def test_long_single_word_fits_the_column():
+    excerpt = _excerpt("a" * 400, 300)
+    assert len(excerpt) == 300
+    assert excerpt.endswith("…")
+
+
+def test_analyze_excerpt_fits_the_column():
+    stats = analyze("x" * 1000)
+    assert len(stats.excerpt) <= settings.POST_EXCERPT_LENGTH
+    assert stats.word_count == 1
+    assert stats.reading_time == 1